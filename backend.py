@@ -1,16 +1,281 @@
 # backend.py
+import ast
+import bisect
 import copy
+import heapq
+import math
+import mmap
+import os
+import warnings
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from fractions import Fraction
+from functools import lru_cache
+from multiprocessing import shared_memory
+from operator import index as _as_index, mul
 import numpy as np
+try: from gmpy2 import mpz as _bigint   # optional: faster big-integer arithmetic for exact elimination
+except ImportError: _bigint = int
+try: from scipy.linalg import lu_factor as _lu_factor, lu_solve as _lu_solve, solve_triangular as _solve_triangular
+except ImportError: _lu_factor = _lu_solve = _solve_triangular = None # optional: LAPACK LU kept between solves
+
+# ==========================================
+# MATRIX MULTIPLY / POWER ENGINE
+# ==========================================
+_MUL_BLOCK = 64           # columns / rows of the right operand kept hot per tile
+_BLAS_MIN_FLOPS = 32**3   # below this, list->ndarray conversion costs more than it saves
+_SPARSE_DENSITY = 0.4     # below this fraction of non-zeros the zero-skipping kernel wins
+_EXACT_TYPES = (int, bool, Fraction)
+_INT64_MAX = int(np.iinfo(np.int64).max)
+
+def _is_exact(rows):
+    return all(isinstance(x, _EXACT_TYPES) for row in rows for x in row)
+
+def _density(rows, size):
+    return sum(1 for row in rows for x in row if x) / size if size else 0.0
+
+def _row_lists(m):
+    return m.row_lists() if isinstance(m, MatrixView) else m.data
+
+def _col_lists(m):
+    if isinstance(m, MatrixView): return m.col_lists()
+    return list(zip(*m.data)) if m.data else [()] * m.cols
+
+def _mul_dot_tiled(a, cols, p, block=_MUL_BLOCK):
+    """Dense pure-Python kernel: dot products against tiles of B's columns."""
+    res = [[] for _ in a]
+    for j0 in range(0, p, block):
+        tile = cols[j0:j0 + block]
+        for a_row, res_row in zip(a, res):
+            res_row.extend([sum(map(mul, a_row, col)) for col in tile])
+    return res
+
+def _mul_axpy_tiled(a, b, p, block=_MUL_BLOCK):
+    """Sparse-friendly pure-Python kernel: C[i] += a[i][k] * B[k], tiled over k, skipping zeros."""
+    res = [[0] * p for _ in a]
+    for k0 in range(0, len(b), block):
+        b_tile = b[k0:k0 + block]
+        for i, a_row in enumerate(a):
+            acc = res[i]
+            for aik, b_row in zip(a_row[k0:k0 + block], b_tile):
+                if aik:
+                    acc = [c + aik * y for c, y in zip(acc, b_row)]
+            res[i] = acc
+    return res
+
+def _abs_max(arr):
+    return max(abs(int(arr.max())), abs(int(arr.min()))) if arr.size else 0
+
+def _overflow_safe(a, b):
+    """Integer arrays whose product could exceed int64 switch to Python-int (object) entries instead of wrapping"""
+    if a.dtype.kind not in "iu" or b.dtype.kind not in "iu": return a, b
+    if _abs_max(a) * _abs_max(b) * a.shape[1] <= _INT64_MAX: return a, b
+    return a.astype(object), b.astype(object)
+
+def _matmul(left, right, out=None):
+    """Pick a kernel from storage, size and dtype: BLAS for float data, tiled Python for exact data."""
+    n, m, p = left.rows, left.cols, right.cols
+    if left.storage == "numpy" or right.storage == "numpy":
+        a, b = _overflow_safe(left.to_numpy(), right.to_numpy())
+        if out is None: return Matrix.from_numpy(a @ b)
+        if out.storage == "numpy":
+            _check_out(out, np.result_type(a, b))
+            np.matmul(a, b, out=out.data)
+        else: out.data[:] = (a @ b).tolist()
+        out.invalidate()
+        return out
+
+    # Views hand over their base rows (or columns) directly, so no operand is copied here
+    a = _row_lists(left)
+    res = None
+    if n * m * p >= _BLAS_MIN_FLOPS and not (_is_exact(a) and _is_exact(_row_lists(right))):
+        fa, fb = np.array(a).reshape(n, m), right.to_numpy()
+        dtype = np.result_type(fa, fb) # int x float promotes to float and still goes to BLAS
+        if dtype.kind in "fc": res = (fa.astype(dtype, copy=False) @ fb.astype(dtype, copy=False)).tolist()
+    if res is None:
+        if _density(a, n * m) > _SPARSE_DENSITY: res = _mul_dot_tiled(a, _col_lists(right), p)
+        else: res = _mul_axpy_tiled(a, _row_lists(right), p)
+
+    if out is None: return Matrix._trusted(res, (n, p))
+    if out.storage == "numpy":
+        res = np.array(res).reshape(n, p)
+        _check_out(out, res.dtype)
+        out.data[...] = res
+    else: out.data[:] = res
+    out.invalidate()
+    return out
+
+def _check_out(out, dtype):
+    """A numpy `out` must hold the product without a lossy cast (e.g. float results into an int array)"""
+    if not np.can_cast(dtype, out.data.dtype):
+        raise TypeError(f"4-6: out has dtype {out.data.dtype}, the product needs {dtype}")
+
+def _semiring_reducer(mod=None, boolean=False):
+    """Entry-wise reduction applied after each product by the power engine."""
+    if mod is not None and boolean: raise ValueError("11-3: Choose either mod or boolean")
+    if boolean:
+        def reduce(m):
+            if m.storage == "numpy": return Matrix.from_numpy((m.data != 0).astype(np.int64))
+            return Matrix._trusted([[1 if x else 0 for x in row] for row in m.data], m.dim)
+    elif mod is not None:
+        def reduce(m):
+            if m.storage == "numpy":
+                res = m.data % mod
+                # products that left int64 come back down once reduced
+                if res.dtype == object and abs(mod) <= _INT64_MAX: res = res.astype(np.int64)
+                return Matrix.from_numpy(res)
+            return Matrix._trusted([[x % mod for x in row] for row in m.data], m.dim)
+    else:
+        def reduce(m): return m
+    return reduce
+
+# ==========================================
+# EXACT ELIMINATION ENGINE (Bareiss, no sympy)
+# ==========================================
+def _to_exact(x):
+    if isinstance(x, (int, Fraction)): return x
+    if isinstance(x, np.integer): return int(x)
+    if isinstance(x, (float, np.floating)):
+        if not np.isfinite(x): raise ValueError("14-1: Exact elimination needs finite entries")
+        return Fraction(repr(float(x))) # shortest decimal, i.e. what the user typed
+    raise TypeError(f"14-2: Cannot convert {type(x).__name__} to an exact number")
+
+def _integer_rows(rows):
+    """Scale every row to integers. Returns (int rows, product of the row scales)."""
+    res, scale = [], 1
+    for row in rows:
+        row = [_to_exact(x) for x in row]
+        lcm = 1
+        for x in row:
+            if isinstance(x, Fraction): lcm = lcm * x.denominator // math.gcd(lcm, x.denominator)
+        res.append([_bigint(int(x * lcm)) for x in row])
+        scale *= lcm
+    return res, scale
+
+_RANK_PRIME = 2**31 - 1 # residues below 2^31, so a product of two still fits in int64
+
+def _rank_mod_p(ints):
+    """
+    Rank of integer rows modulo _RANK_PRIME by NumPy elimination. It never exceeds the rational rank,
+    so reaching min(rows, cols) proves full rank without any big-integer arithmetic.
+    """
+    p = _RANK_PRIME
+    a = np.array([[int(x % p) for x in row] for row in ints], dtype=np.int64).reshape(len(ints), -1)
+    r = 0
+    for c in range(a.shape[1]):
+        if r == a.shape[0]: break
+        nz = np.flatnonzero(a[r:, c])
+        if not len(nz): continue
+        if nz[0]: a[[r, r + nz[0]]] = a[[r + nz[0], r]]
+        a[r, c:] = a[r, c:] * pow(int(a[r, c]), p - 2, p) % p
+        a[r + 1:, c:] = (a[r + 1:, c:] - a[r + 1:, c, None] * a[r, c:]) % p
+        r += 1
+    return r
+
+def bareiss(rows):
+    """
+    Fraction-free (Bareiss) forward elimination on integer rows; every division is exact.
+    Returns (echelon rows, pivot columns, last pivot value, permutation sign).
+    For a square non-singular input the last pivot value is the determinant (up to sign).
+    """
+    m = [row[:] for row in rows]
+    n_rows, n_cols = len(m), len(m[0]) if m else 0
+    prev, sign, r, pivots = 1, 1, 0, []
+    for c in range(n_cols):
+        if r == n_rows: break
+        p = next((i for i in range(r, n_rows) if m[i][c]), None)
+        if p is None: continue
+        if p != r:
+            m[r], m[p] = m[p], m[r]
+            sign = -sign
+        pivot_tail, piv = m[r][c:], m[r][c]
+        for i in range(r + 1, n_rows):
+            row = m[i]
+            f = row[c]
+            # entries left of c are already zero below the pivot
+            if f:
+                row[c:] = [(piv * x - f * y) // prev for x, y in zip(row[c:], pivot_tail)]
+            elif piv != prev:
+                row[c:] = [piv * x // prev for x in row[c:]]
+        prev = piv
+        pivots.append(c)
+        r += 1
+    return m, pivots, prev, sign
+
+def exact_rref(rows):
+    """Reduced row echelon form with Fraction entries, plus the pivot columns."""
+    ints, _ = _integer_rows(rows)
+    if not ints: return [], []
+    n_cols = len(ints[0])
+    zero, one = Fraction(0), Fraction(1)
+    if _rank_mod_p(ints) == n_cols: # full column rank: the identity over zero rows, no elimination needed
+        return [[one if i == j else zero for j in range(n_cols)] for i in range(len(ints))], list(range(n_cols))
+    echelon, pivots, d, _ = bareiss(ints)
+    rank = len(pivots)
+    free = [c for c in range(n_cols) if c not in set(pivots)]
+    # Fraction-free back substitution: x[i] = d * (pivot block^-1 * free block)[i] stays integral
+    x = [None] * rank
+    for i in range(rank - 1, -1, -1):
+        row = echelon[i]
+        x[i] = [(d * row[f] - sum(row[pivots[j]] * x[j][k] for j in range(i + 1, rank))) // row[pivots[i]]
+                for k, f in enumerate(free)]
+    res = [[zero] * n_cols for _ in ints]
+    for i, pc in enumerate(pivots):
+        res[i][pc] = one
+        for k, f in enumerate(free):
+            res[i][f] = Fraction(int(x[i][k]), int(d))
+    return res, pivots
+
+def exact_det(rows):
+    ints, scale = _integer_rows(rows)
+    if not ints: return Fraction(1)
+    m, pivots, d, sign = bareiss(ints)
+    if len(pivots) < len(ints): return Fraction(0)
+    return Fraction(int(sign * d), scale)
+
+def exact_rank(rows):
+    ints, _ = _integer_rows(rows)
+    if not ints: return 0
+    rank = _rank_mod_p(ints)
+    if rank == min(len(ints), len(ints[0])): return rank
+    return len(bareiss(ints)[1])
+
+def exact_nullspace(rows):
+    """Basis of {x : A x = 0} as lists of Fractions, one vector per free column."""
+    reduced, pivots = exact_rref(rows)
+    n_cols = len(rows[0]) if rows else 0
+    basis = []
+    for free in (c for c in range(n_cols) if c not in set(pivots)):
+        vec = [Fraction(0)] * n_cols
+        vec[free] = Fraction(1)
+        for row, pc in zip(reduced, pivots):
+            vec[pc] = -row[free]
+        basis.append(vec)
+    return basis
 
 # ==========================================
 # CUSTOM MATRIX CLASS (From User Provided graph.py)
 # ==========================================
 class Matrix:
-    def __init__(self, data=None, dim=None, init_value=0):
+    def __init__(self, data=None, dim=None, init_value=0, storage=None):
+        """
+        storage: None keeps the type of `data` (nested list or 2-D ndarray),
+                 "list" / "numpy" force nested-list or contiguous ndarray storage.
+        """
+        if storage not in (None, "list", "numpy"):
+            raise ValueError("1-7: storage must be 'list' or 'numpy'")
         if data is None and dim is None:
             # Fallback for empty init to avoid crash, though user logic raises error
-            self.data = []
+            self.data = np.zeros((0, 0)) if storage == "numpy" else []
             self.dim = (0, 0)
+            self.init_value = init_value
+            return
+
+        if isinstance(data, np.ndarray):
+            if data.ndim != 2: raise TypeError("1-5: ndarray data must be 2-D")
+            self.data = data.tolist() if storage == "list" else np.array(data) # Deep copy
+            self.dim = tuple(data.shape)
+            self.init_value = init_value
             return
 
         if data is not None:
@@ -39,9 +304,70 @@ class Matrix:
             m, n = dim
             self.data = [[init_value for _ in range(n)] for _ in range(m)]
             self.dim = dim
-        
+
+        if storage == "numpy":
+            self.data = np.array(self.data).reshape(self.dim)
         self.init_value = init_value
 
+    @classmethod
+    def from_numpy(cls, arr, copy=False):
+        """Wrap a 2-D ndarray as a numpy-backed Matrix (no copy unless asked or non-contiguous)."""
+        if not isinstance(arr, np.ndarray) or arr.ndim != 2:
+            raise TypeError("1-5: ndarray data must be 2-D")
+        return cls._trusted(np.array(arr) if copy else np.ascontiguousarray(arr))
+
+    @classmethod
+    def _trusted(cls, data, dim=None):
+        """Internal constructor for data the class built itself: no validation, no copy."""
+        m = cls.__new__(cls)
+        m.data = data
+        if dim is None:
+            dim = tuple(data.shape) if isinstance(data, np.ndarray) else (len(data), len(data[0]) if data else 0)
+        m.dim = dim
+        m.init_value = 0
+        return m
+
+    def to_numpy(self, copy=False):
+        """ndarray view of the data; zero-copy for numpy storage."""
+        if isinstance(self.data, np.ndarray):
+            return self.data.copy() if copy else self.data
+        return np.array(self.data).reshape(self.dim)
+
+    @property
+    def storage(self):
+        return "numpy" if isinstance(self.data, np.ndarray) else "list"
+
+    @property
+    def data(self): return self._data
+    @data.setter
+    def data(self, value):
+        self._data = value
+        self._factors = {}
+
+    def invalidate(self):
+        """
+        Drop cached factorizations. m[i, j] = v, assigning .data and out= products do this already;
+        call it after writing into .data (or a numpy view of it) directly.
+        """
+        self._factors = {}
+
+    def _factor(self, kind, cls):
+        hit = self._factors.get(kind)
+        if hit is None: hit = self._factors[kind] = cls(self._as_float_array())
+        return hit
+
+    def lu(self):
+        """LU factorization, computed once and cached until the entries change"""
+        return self._factor("lu", LUFactorization)
+
+    def qr(self):
+        """QR factorization, computed once and cached until the entries change"""
+        return self._factor("qr", QRFactorization)
+
+    def solve(self, b):
+        """Solve A x = b through the cached LU factorization"""
+        return self.lu().solve(b)
+
     @property
     def rows(self): return self.dim[0]
     @property
@@ -49,269 +375,2067 @@ class Matrix:
 
     def to_float(self):
         """Helper for UI display"""
+        if self.storage == "numpy": return self.data.astype(float).tolist()
         return [[float(x) for x in row] for row in self.data]
 
-    def T(self):
-        """Transpose"""
+    def T(self, copy=True):
+        """Transpose; copy=False returns a view sharing this matrix's storage"""
         if not isinstance(self, Matrix):
             raise TypeError("5-1: Only Matrix objects can be transposed")
-        res = []
-        if self.rows == 0: return Matrix(data=[])
-        for i in range(len(self.data[0])):
-            new_row = []
-            for j in range(len(self.data)):
-                new_row.append(self.data[j][i])
-            res.append(new_row)
-        return Matrix(res)
+        if not copy: return self.view(transpose=True)
+        if self.storage == "numpy":
+            return Matrix.from_numpy(np.ascontiguousarray(self.data.T))
+        res = [list(col) for col in zip(*self.data)] if self.rows else [[] for _ in range(self.cols)]
+        return Matrix._trusted(res, (self.cols, self.rows))
+
+    def lazy(self):
+        """Start a lazy expression: ops are recorded and planned on evaluate()"""
+        return LazyMatrix.wrap(self)
+
+    # --- Views: share storage instead of copying ---
+    def view(self, rows=slice(None), cols=slice(None), transpose=False):
+        """
+        Block view selected by two slices (optionally transposed) that shares storage.
+        numpy storage gives a Matrix over an ndarray view; list storage gives a read-only MatrixView.
+        """
+        if self.storage == "numpy":
+            block = self.data[rows, cols]
+            return Matrix._trusted(block.T if transpose else block)
+        return MatrixView(self, range(*rows.indices(self.rows)), range(*cols.indices(self.cols)), transpose)
+
+    def row(self, i):
+        return self.view(rows=slice(i, i + 1))
+
+    def col(self, j):
+        return self.view(cols=slice(j, j + 1))
+
+    def __setitem__(self, key, value):
+        """m[i, j] = v"""
+        i, j = (_as_index(k) for k in key)
+        if self.storage == "numpy": self.data[i, j] = value
+        else: self.data[i][j] = value
+        self._factors = {}
+
+    def __getitem__(self, key):
+        """m[i, j] -> entry, m[i] -> row view, m[r0:r1, c0:c1] -> block view"""
+        if not isinstance(key, tuple): return self.row(_as_index(key))
+        # any integer-like index (np.int64 included) selects a single row / column
+        i, j = (k if isinstance(k, slice) else _as_index(k) for k in key)
+        if isinstance(i, int) and isinstance(j, int): return self.data[i][j]
+        if isinstance(i, int): i = slice(i, i + 1)
+        if isinstance(j, int): j = slice(j, j + 1)
+        return self.view(i, j)
+
+    @classmethod
+    def identity(cls, n, storage=None):
+        if storage == "numpy": return cls.from_numpy(np.eye(n, dtype=np.int64))
+        return cls._trusted([[int(i == j) for j in range(n)] for i in range(n)], (n, n))
 
     def __pow__(self, n):
         """Matrix Power"""
+        return self.power(n)
+
+    def power(self, n, mod=None, boolean=False):
+        """A**n by binary exponentiation (O(log n) products).
+        mod: reduce entries modulo `mod` after every product.
+        boolean: work in the (OR, AND) semiring, entries are 0/1 (reachability instead of walk counts).
+        """
+        self._check_power(n)
+        if n < 0: raise ValueError("11-2: Exponent must be non-negative")
+        reduce = _semiring_reducer(mod, boolean)
+        result, base = None, reduce(self)
+        while n:
+            if n & 1: result = base if result is None else reduce(result * base)
+            n >>= 1
+            if n: base = reduce(base * base)
+        if result is None: return Matrix.identity(self.rows, self.storage)
+        if result is self: return Matrix(data=self.data)
+        return result
+
+    def powers(self, k, mod=None, boolean=False):
+        """Yield A^1 ... A^k, each built from the previous one with a single product."""
+        self._check_power(k)
+        reduce = _semiring_reducer(mod, boolean)
+        base = reduce(self)
+        curr = base
+        for i in range(k):
+            if i: curr = reduce(curr * base)
+            yield curr
+
+    def _check_power(self, n):
         if not isinstance(n, int): raise TypeError("11-1: Exponent must be integer")
         if self.rows != self.cols: raise ValueError("11-4: Only square matrix can be exponentiated")
-        
-        res = Matrix(data=self.data)
-        for _ in range(n-1):
-            res = res * self
-            res = Matrix(data=res.data)
-        return res
 
     def __add__(self, other):
         """Matrix Addition"""
+        if isinstance(other, SparseMatrix): return other + self
+        if isinstance(other, LazyMatrix): return self.lazy() + other
+        if isinstance(other, MatrixView): other = other.to_matrix()
         if not isinstance(other, Matrix): raise TypeError("12-1: Only Matrix objects can be added")
         if self.dim != other.dim: raise ValueError("12-3: Dimensions do not match")
+        if self.storage == "numpy" or other.storage == "numpy":
+            return Matrix.from_numpy(self.to_numpy() + other.to_numpy())
         
-        res = []
-        for i in range(self.rows):
-            row = []
-            for j in range(self.cols):
-                row.append(self.data[i][j] + other.data[i][j])
-            res.append(row)
-        return Matrix(data=res)
+        res = [[x + y for x, y in zip(r1, r2)] for r1, r2 in zip(self.data, other.data)]
+        return Matrix._trusted(res, self.dim)
 
     def __mul__(self, other):
         """Matrix Multiplication"""
-        if not isinstance(other, Matrix): raise TypeError("4-1: Both must be Matrix objects")
+        return self.matmul(other)
+
+    def matmul(self, other, out=None):
+        """Matrix product; `out` (a Matrix of the result shape) receives the result in place."""
+        if isinstance(other, SparseMatrix) and out is None: return other.__rmul__(self)
+        if isinstance(other, LazyMatrix) and out is None: return self.lazy() * other
+        if not isinstance(other, (Matrix, MatrixView)): raise TypeError("4-1: Both must be Matrix objects")
         if self.cols != other.rows: raise TypeError("4-3: Matrix dimensions incompatible for multiplication")
-        
-        new_self = self.data
-        new_other = (other.T()).data
-        width = len(new_self[0])
-        
-        res = []
-        for i in range(len(new_self)):
-            new_row = []
-            for j in range(len(new_other)):
-                new_ele = 0
-                for k in range(width):
-                    new_ele += new_self[i][k] * new_other[j][k]
-                new_row.append(new_ele)
-            res.append(new_row)
-        return Matrix(data=res)
+        if out is not None:
+            if not isinstance(out, Matrix) or out.dim != (self.rows, other.cols):
+                raise ValueError("4-4: out must be a Matrix of the result dimensions")
+            if out is self or out is other: raise ValueError("4-5: out must not alias an operand")
+        return _matmul(self, other, out)
     
     # --- Added Helper methods for Linear Algebra Tab ---
-    def det(self):
-        import numpy as np
+    def _as_float_array(self):
+        # Zero-copy when the storage is already a float64 ndarray
+        return np.asarray(self.data, dtype=float).reshape(self.dim)
+
+    def _exact_rows(self):
+        return self.data.tolist() if self.storage == "numpy" else self.data
+
+    def det(self, exact=False):
+        """exact=True: Fraction determinant by Bareiss elimination"""
         if self.rows != self.cols: return "Undefined (Not Square)"
-        try: return float(np.linalg.det(np.array(self.data, dtype=float)))
+        try:
+            if exact: return exact_det(self._exact_rows())
+            return float(self.lu().det())
         except: return "Error"
 
-    def rank(self):
-        import numpy as np
-        try: return np.linalg.matrix_rank(np.array(self.data, dtype=float))
+    def rank(self, exact=False):
+        try:
+            if exact: return exact_rank(self._exact_rows())
+            return np.linalg.matrix_rank(self._as_float_array())
         except: return 0
 
     def inverse(self):
-        import numpy as np
         try:
-            inv = np.linalg.inv(np.array(self.data, dtype=float))
-            return Matrix(data=inv.tolist())
+            inv = self.lu().inverse()
+            if self.storage == "numpy": return Matrix.from_numpy(inv)
+            return Matrix._trusted(inv.tolist(), self.dim)
         except: return None
         
-    def rref(self):
-        import sympy
+    def rref(self, exact=False):
+        """Exact fraction-free elimination; exact=True keeps Fraction entries instead of casting to float"""
         try:
-            m = sympy.Matrix(self.data)
-            rref_mat, pivots = m.rref()
-            return Matrix(data=np.array(rref_mat).astype(float).tolist())
+            reduced, _ = exact_rref(self._exact_rows())
+            if exact: return Matrix._trusted(reduced, self.dim)
+            res = np.array(reduced, dtype=float).reshape(self.dim)
+            if self.storage == "numpy": return Matrix.from_numpy(res)
+            return Matrix._trusted(res.tolist(), self.dim)
         except: return self
 
+    def nullspace(self, exact=False):
+        """Basis of the null space as a list of column Matrix objects"""
+        basis = exact_nullspace(self._exact_rows())
+        if not exact: basis = [[float(x) for x in vec] for vec in basis]
+        return [Matrix._trusted([[x] for x in vec], (len(vec), 1)) for vec in basis]
+
+
+# ==========================================
+# MATRIX VIEWS
+# ==========================================
+class MatrixView:
+    """
+    Read-only window onto a list-backed Matrix that shares its storage.
+    row_range / col_range select base rows and columns; `transposed` swaps the two roles.
+    Anything not defined here (det, rref, ...) runs on a materialized copy.
+    """
+    storage = "list"
+
+    def __init__(self, base, row_range, col_range, transposed=False):
+        self.base = base
+        self.row_range = row_range
+        self.col_range = col_range
+        self.transposed = transposed
+
+    @property
+    def dim(self):
+        dim = (len(self.row_range), len(self.col_range))
+        return dim[::-1] if self.transposed else dim
+    @property
+    def rows(self): return self.dim[0]
+    @property
+    def cols(self): return self.dim[1]
+
+    def _base_rows(self):
+        # Selected base rows; shared, not copied, when every column is selected
+        data, cr = self.base.data, self.col_range
+        if cr == range(self.base.cols): return [data[r] for r in self.row_range]
+        return [[data[r][c] for c in cr] for r in self.row_range]
+
+    def row_lists(self):
+        if not self.transposed: return self._base_rows()
+        return [list(c) for c in zip(*self._base_rows())] if self.row_range else [[] for _ in self.col_range]
+
+    def col_lists(self):
+        if self.transposed: return self._base_rows()
+        return list(zip(*self._base_rows())) if self.row_range else [()] * len(self.col_range)
+
+    def __getitem__(self, key):
+        # single entries are read straight from the base; rows and blocks behave like Matrix indexing
+        if not isinstance(key, tuple) or any(isinstance(k, slice) for k in key): return self.to_matrix()[key]
+        i, j = (_as_index(k) for k in key)
+        if self.transposed: i, j = j, i
+        return self.base.data[self.row_range[i]][self.col_range[j]]
+
+    @property
+    def data(self):
+        """Materialized nested-list copy"""
+        return [list(row) for row in self.row_lists()]
+
+    def to_matrix(self):
+        return Matrix._trusted(self.data, self.dim)
+
+    def to_numpy(self, copy=False):
+        return np.array(self.row_lists()).reshape(self.dim)
+
+    def T(self, copy=False):
+        """Transpose of a view is another view"""
+        res = MatrixView(self.base, self.row_range, self.col_range, not self.transposed)
+        return res.to_matrix() if copy else res
+
+    def __mul__(self, other):
+        if isinstance(other, SparseMatrix): return self.to_matrix() * other
+        return Matrix.matmul(self, other)
+
+    def __add__(self, other):
+        return self.to_matrix() + other
+
+    def __pow__(self, n):
+        return self.to_matrix().power(n)
+
+    def __getattr__(self, name):
+        if name.startswith("_"): raise AttributeError(name)
+        return getattr(self.to_matrix(), name)
+
+
+# ==========================================
+# LAZY MATRIX EXPRESSIONS
+# ==========================================
+class LazyMatrix:
+    """
+    Node of a recorded matrix expression; build one with Matrix.lazy().
+    `+`, `*`, `**` and T() only record the DAG. evaluate() then
+      - flattens products into chains and multiplies them in the cheapest order (matrix-chain DP),
+      - flattens sums and adds all terms in one fused pass,
+      - pushes transposes down to the leaves as views,
+      - evaluates structurally equal subexpressions once.
+    """
+    def __init__(self, op, args=(), dim=None, value=None, exponent=None):
+        self.op = op
+        self.args = args
+        self.value = value
+        self.exponent = exponent
+        self.dim = value.dim if value is not None else dim
+        self.key = ("leaf", id(value)) if op == "leaf" else (op, tuple(a.key for a in args), exponent)
+
+    @property
+    def rows(self): return self.dim[0]
+    @property
+    def cols(self): return self.dim[1]
+
+    @staticmethod
+    def wrap(x):
+        if isinstance(x, LazyMatrix): return x
+        if isinstance(x, (Matrix, MatrixView)): return LazyMatrix("leaf", value=x)
+        raise TypeError("17-1: Lazy expressions only combine Matrix and LazyMatrix operands")
+
+    def __add__(self, other):
+        other = LazyMatrix.wrap(other)
+        if self.dim != other.dim: raise ValueError("12-3: Dimensions do not match")
+        return LazyMatrix("add", (self, other), self.dim)
+
+    def __radd__(self, other):
+        return LazyMatrix.wrap(other) + self
+
+    def __mul__(self, other):
+        other = LazyMatrix.wrap(other)
+        if self.cols != other.rows: raise TypeError("4-3: Matrix dimensions incompatible for multiplication")
+        return LazyMatrix("mul", (self, other), (self.rows, other.cols))
+
+    def __rmul__(self, other):
+        return LazyMatrix.wrap(other) * self
+
+    def __pow__(self, n):
+        if not isinstance(n, int): raise TypeError("11-1: Exponent must be integer")
+        if self.rows != self.cols: raise ValueError("11-4: Only square matrix can be exponentiated")
+        if n < 0: raise ValueError("11-2: Exponent must be non-negative")
+        return self if n == 1 else LazyMatrix("pow", (self,), self.dim, exponent=n)
+
+    def T(self):
+        return LazyMatrix("T", (self,), self.dim[::-1])
+
+    def evaluate(self):
+        res = _LazyEvaluator().run(self)
+        if isinstance(res, MatrixView): return res.to_matrix()
+        # never hand back (or alias) a leaf operand
+        return Matrix(data=res.data) if self.op in ("leaf", "T") else res
+
+    def cost(self):
+        """Scalar multiplications of the planned evaluation vs. plain left-to-right evaluation"""
+        return {"planned": _chain_flops(self, False, True), "left_to_right": _chain_flops(self, False, False)}
+
+def _flatten(node, op, t):
+    """Operands of a chain of `op` as (node, transposed) pairs, looking through transposes."""
+    if node.op == "T": return _flatten(node.args[0], op, not t)
+    if node.op != op: return [(node, t)]
+    args = reversed(node.args) if (t and op == "mul") else node.args # (AB)^T = B^T A^T
+    return [item for a in args for item in _flatten(a, op, t)]
+
+def _factor_dim(item):
+    node, t = item
+    return node.dim[::-1] if t else node.dim
+
+def _chain_order(factors):
+    """Matrix-chain dynamic programming. Returns (cost table, split table)."""
+    k = len(factors)
+    p = [_factor_dim(factors[0])[0]] + [_factor_dim(f)[1] for f in factors]
+    cost = [[0] * k for _ in range(k)]
+    split = [[0] * k for _ in range(k)]
+    for length in range(2, k + 1):
+        for i in range(k - length + 1):
+            j = i + length - 1
+            cost[i][j], split[i][j] = min(
+                (cost[i][s] + cost[s + 1][j] + p[i] * p[s + 1] * p[j + 1], s) for s in range(i, j))
+    return cost, split
+
+def _chain_flops(node, t, optimized):
+    if node.op == "leaf": return 0
+    if node.op == "T": return _chain_flops(node.args[0], not t, optimized)
+    if node.op == "pow":
+        # binary exponentiation: one squaring per bit after the first, one product per extra set bit;
+        # e = 0 (identity) and e = 1 need no products at all
+        e = node.exponent
+        products = 0 if e < 2 else e.bit_length() - 1 + bin(e).count("1") - 1
+        return _chain_flops(node.args[0], t, optimized) + max(0, products) * node.rows ** 3
+    factors = _flatten(node, node.op, t)
+    inner = sum(_chain_flops(f, ft, optimized) for f, ft in factors)
+    if node.op == "add": return inner
+    if optimized: return inner + _chain_order(factors)[0][0][-1]
+    rows, total = _factor_dim(factors[0])[0], 0
+    for f in factors:
+        shared, cols = _factor_dim(f)
+        total += rows * shared * cols
+    return inner + total
+
+def _fused_sum(values):
+    """Add every term in one pass instead of materializing each partial sum."""
+    if any(v.storage == "numpy" for v in values):
+        arrays = [v.to_numpy() for v in values]
+        total = np.array(arrays[0], dtype=np.result_type(*arrays))
+        for arr in arrays[1:]: total += arr
+        return Matrix.from_numpy(total)
+    rows = [_row_lists(v) for v in values]
+    return Matrix._trusted([[sum(col) for col in zip(*group)] for group in zip(*rows)], values[0].dim)
+
+class _LazyEvaluator:
+    def __init__(self):
+        self.memo = {} # structural key -> result, shared by equal subexpressions
+
+    def run(self, node, t=False):
+        key = (node.key, t)
+        if key not in self.memo: self.memo[key] = self._compute(node, t)
+        return self.memo[key]
+
+    def _compute(self, node, t):
+        if node.op == "T": return self.run(node.args[0], not t)
+        if node.op == "leaf": return node.value.T(copy=False) if t else node.value
+        if node.op == "pow": return self.run(node.args[0], t).power(node.exponent) # (A^k)^T = (A^T)^k
+        items = _flatten(node, node.op, t)
+        if node.op == "add": return _fused_sum([self.run(n, nt) for n, nt in items])
+        return self._chain(items)
+
+    def _chain(self, factors):
+        _, split = _chain_order(factors)
+        keys = [(n.key, nt) for n, nt in factors]
+        def build(i, j):
+            if i == j: return self.run(*factors[i])
+            key = ("chain", tuple(keys[i:j + 1]))
+            if key not in self.memo:
+                s = split[i][j]
+                self.memo[key] = Matrix.matmul(build(i, s), build(s + 1, j))
+            return self.memo[key]
+        return build(0, len(factors) - 1)
+
+
+# ==========================================
+# FACTORIZATIONS (LU / QR)
+# ==========================================
+def _rhs_array(b, n):
+    arr = b.to_numpy() if isinstance(b, Matrix) else np.asarray(b)
+    arr = np.array(arr, dtype=np.result_type(arr, float))
+    if arr.shape[0] != n: raise ValueError("15-3: Right-hand side has the wrong number of rows")
+    return arr
+
+def _back_substitute(r, y):
+    """Solve R x = y for upper-triangular R; y may hold many right-hand sides as columns."""
+    if _solve_triangular is not None: return _solve_triangular(r, y, check_finite=False)
+    n = r.shape[0]
+    x = np.empty_like(y)
+    for i in range(n - 1, -1, -1):
+        x[i] = (y[i] - r[i, i + 1:] @ x[i + 1:]) / r[i, i]
+    return x
+
+class LUFactorization:
+    """
+    PA = LU with partial pivoting (LAPACK getrf via scipy). Factor once in O(n^3), then each solve is O(n^2).
+    Without scipy, solves fall back to np.linalg.solve on the stored matrix.
+    """
+    def __init__(self, a):
+        a = np.asarray(a)
+        a = np.array(a, dtype=np.result_type(a, float))
+        if a.ndim != 2 or a.shape[0] != a.shape[1]: raise ValueError("15-1: LU needs a square matrix")
+        self.a = a
+        self.lu = self.piv = None # L below the diagonal (unit diagonal implied), U on and above it
+        if _lu_factor is not None:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore") # a singular matrix is reported by solve(), not warned about here
+                self.lu, self.piv = _lu_factor(a, check_finite=False)
+
+    @property
+    def n(self): return self.a.shape[0]
+
+    def det(self):
+        if self.lu is None: return np.linalg.det(self.a)
+        swaps = np.count_nonzero(self.piv != np.arange(self.n))
+        return (-1) ** int(swaps) * np.prod(np.diag(self.lu))
+
+    def rank(self, tol=None):
+        """Rank estimate from the pivots of U"""
+        if self.lu is None: return int(np.linalg.matrix_rank(self.a, tol))
+        diag = np.abs(np.diag(self.lu))
+        if tol is None: tol = (diag.max() if len(diag) else 0) * self.n * np.finfo(float).eps
+        return int(np.sum(diag > tol))
+
+    def is_singular(self):
+        if self.lu is None: return self.rank() < self.n
+        return bool(np.any(np.diag(self.lu) == 0))
+
+    def solve(self, b):
+        """Solve A x = b; b may be a vector or an (n, k) block of right-hand sides."""
+        y = _rhs_array(b, self.n)
+        if self.lu is None:
+            try: x = np.linalg.solve(self.a, y)
+            except np.linalg.LinAlgError: raise ValueError("15-2: Matrix is singular") from None
+        else:
+            if self.is_singular(): raise ValueError("15-2: Matrix is singular")
+            x = _lu_solve((self.lu, self.piv), y, check_finite=False)
+        return Matrix.from_numpy(x) if isinstance(b, Matrix) else x
+
+    def inverse(self):
+        return self.solve(np.eye(self.n))
+
+class QRFactorization:
+    """A = QR by Householder reflections (m >= n). solve() gives least squares for tall A."""
+    def __init__(self, a):
+        a = np.asarray(a, dtype=float)
+        if a.ndim != 2 or a.shape[0] < a.shape[1]: raise ValueError("15-4: QR needs rows >= cols")
+        h, self.tau = np.linalg.qr(a, mode="raw")
+        self.reflectors = h.T # column j below the diagonal holds reflector j
+        self.r = np.triu(self.reflectors[:a.shape[1]])
+        self.shape = a.shape
+
+    def apply_qt(self, b):
+        """Q^T b without forming Q"""
+        y = _rhs_array(b, self.shape[0])
+        for j, tau in enumerate(self.tau):
+            if tau == 0: continue
+            v = self.reflectors[j:, j].copy()
+            v[0] = 1.0
+            y[j:] -= tau * np.multiply.outer(v, v @ y[j:]) if y.ndim > 1 else tau * v * (v @ y[j:])
+        return y
+
+    def det(self):
+        if self.shape[0] != self.shape[1]: raise ValueError("15-1: Determinant needs a square matrix")
+        # every non-trivial Householder reflector has determinant -1
+        return (-1) ** int(np.count_nonzero(self.tau)) * np.prod(np.diag(self.r))
+
+    def rank(self, tol=None):
+        """Rank estimate from |R_ii| (no column pivoting, so this is an estimate)"""
+        diag = np.abs(np.diag(self.r))
+        if tol is None: tol = (diag.max() if len(diag) else 0) * max(self.shape) * np.finfo(float).eps
+        return int(np.sum(diag > tol))
+
+    def solve(self, b):
+        """Least-squares solution of A x = b (exact solve for square non-singular A)"""
+        if np.any(np.diag(self.r) == 0): raise ValueError("15-2: Matrix is singular")
+        x = _back_substitute(self.r, self.apply_qt(b)[:self.shape[1]])
+        return Matrix.from_numpy(x) if isinstance(b, Matrix) else x
+
+    def inverse(self):
+        if self.shape[0] != self.shape[1]: raise ValueError("15-1: Inverse needs a square matrix")
+        return self.solve(np.eye(self.shape[0]))
+
+
+# ==========================================
+# BATCHED MATRICES
+# ==========================================
+class MatrixBatch:
+    """
+    A stack of equally sized matrices held as one (count, rows, cols) ndarray.
+    Every operation runs once over the whole stack instead of once per Matrix.
+    """
+    def __init__(self, data):
+        arr = np.array(data) # Deep copy
+        if arr.ndim != 3: raise ValueError("16-1: Batch data must be 3-D (count, rows, cols)")
+        self.data = arr
+
+    @classmethod
+    def from_numpy(cls, arr):
+        """Wrap a 3-D ndarray without copying"""
+        if not isinstance(arr, np.ndarray) or arr.ndim != 3:
+            raise ValueError("16-1: Batch data must be 3-D (count, rows, cols)")
+        batch = cls.__new__(cls)
+        batch.data = arr
+        return batch
+
+    @classmethod
+    def from_matrices(cls, matrices):
+        matrices = list(matrices)
+        if not matrices: raise ValueError("16-2: Cannot build a batch from no matrices")
+        if any(m.dim != matrices[0].dim for m in matrices): raise ValueError("12-3: Dimensions do not match")
+        return cls.from_numpy(np.stack([m.to_numpy() for m in matrices]))
+
+    def to_matrices(self, storage=None):
+        if storage == "numpy": return [Matrix.from_numpy(a.copy()) for a in self.data]
+        return [Matrix._trusted(a, self.dim) for a in self.data.tolist()]
+
+    @property
+    def count(self): return self.data.shape[0]
+    @property
+    def dim(self): return tuple(self.data.shape[1:])
+
+    def __len__(self): return self.count
+
+    def __getitem__(self, i):
+        return Matrix.from_numpy(self.data[i].copy())
+
+    def _operand(self, other, code):
+        if isinstance(other, MatrixBatch): return other.data
+        if isinstance(other, Matrix): return other.to_numpy()
+        raise TypeError(f"{code}: Operand must be a Matrix or MatrixBatch")
+
+    def det(self):
+        if self.dim[0] != self.dim[1]: raise ValueError("16-3: Determinant needs square matrices")
+        return np.linalg.det(self.data.astype(float))
+
+    def rank(self):
+        return np.linalg.matrix_rank(self.data.astype(float))
+
+    def inverse(self):
+        """Inverse of every member; singular members come back filled with NaN"""
+        if self.dim[0] != self.dim[1]: raise ValueError("16-3: Inverse needs square matrices")
+        arr = self.data.astype(float)
+        try: return MatrixBatch.from_numpy(np.linalg.inv(arr))
+        except np.linalg.LinAlgError: pass
+        res = np.full_like(arr, np.nan)
+        ok = np.linalg.matrix_rank(arr) == self.dim[0]
+        for i in np.flatnonzero(ok):
+            try: res[i] = np.linalg.inv(arr[i])
+            except np.linalg.LinAlgError: pass
+        return MatrixBatch.from_numpy(res)
+
+    def T(self):
+        """Transpose of every member"""
+        return MatrixBatch.from_numpy(np.ascontiguousarray(self.data.swapaxes(1, 2)))
+
+    def __add__(self, other):
+        b = self._operand(other, "12-1")
+        if b.shape[-2:] != self.data.shape[-2:]: raise ValueError("12-3: Dimensions do not match")
+        return MatrixBatch.from_numpy(self.data + b)
+
+    def __matmul__(self, other):
+        """Batch @ Batch multiplies member-wise; Batch @ Matrix applies the same right factor to all"""
+        b = self._operand(other, "4-1")
+        if self.dim[1] != b.shape[-2]: raise TypeError("4-3: Matrix dimensions incompatible for multiplication")
+        if b.ndim == 3 and len(b) != self.count: raise ValueError("16-4: Batches must have the same count")
+        return MatrixBatch.from_numpy(np.matmul(self.data, b))
+
+    __mul__ = __matmul__ # match Matrix, where * is the matrix product
+
+
+# ==========================================
+# SPARSE MATRIX (CSR)
+# ==========================================
+class SparseMatrix:
+    """
+    Compressed sparse row matrix.
+    indptr: row offsets (rows + 1), indices: column of each stored entry, values: the entries.
+    Only non-zeros are stored, so memory and row scans are O(nnz) instead of O(rows * cols).
+    """
+    def __init__(self, indptr, indices, values, dim):
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.values = np.asarray(values)
+        self.dim = (int(dim[0]), int(dim[1]))
+        if len(self.indptr) != self.dim[0] + 1: raise ValueError("13-1: indptr must have rows + 1 entries")
+        if len(self.indices) != len(self.values): raise ValueError("13-2: indices and values differ in length")
+
+    @property
+    def rows(self): return self.dim[0]
+    @property
+    def cols(self): return self.dim[1]
+    @property
+    def nnz(self): return len(self.values)
+
+    @classmethod
+    def from_coo(cls, rows, cols, values, dim):
+        """Build from coordinate triplets; duplicates are summed and zeros dropped."""
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        values = np.asarray(values)
+        n, m = int(dim[0]), int(dim[1])
+        if len(rows) and (rows.min() < 0 or rows.max() >= n or cols.min() < 0 or cols.max() >= m):
+            raise ValueError("13-3: Coordinates out of range")
+        keys = rows * m + cols
+        order = np.argsort(keys, kind="stable")
+        keys, values = keys[order], values[order]
+        if len(keys):
+            starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+            keys, values = keys[starts], np.add.reduceat(values, starts)
+            keep = values != 0
+            keys, values = keys[keep], values[keep]
+        rows, cols = np.divmod(keys, max(m, 1))
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+        return cls(indptr, cols, values, (n, m))
+
+    @classmethod
+    def from_dense(cls, data):
+        """Compress a Matrix, nested list or 2-D ndarray."""
+        arr = data.to_numpy() if isinstance(data, Matrix) else np.asarray(data)
+        if arr.ndim != 2: raise TypeError("13-4: Dense data must be 2-D")
+        rows, cols = np.nonzero(arr)
+        return cls.from_coo(rows, cols, arr[rows, cols], arr.shape)
+
+    def to_coo(self):
+        rows = np.repeat(np.arange(self.rows, dtype=np.int64), np.diff(self.indptr))
+        return rows, self.indices.copy(), self.values.copy()
+
+    def to_dense(self, storage=None):
+        arr = np.zeros(self.dim, dtype=self.values.dtype)
+        rows, cols, values = self.to_coo()
+        arr[rows, cols] = values
+        return Matrix.from_numpy(arr) if storage == "numpy" else Matrix._trusted(arr.tolist(), self.dim)
+
+    def row(self, i):
+        """(column indices, values) of the stored entries in row i."""
+        a, b = self.indptr[i], self.indptr[i + 1]
+        return self.indices[a:b], self.values[a:b]
+
+    def __getitem__(self, key):
+        i, j = key
+        cols, values = self.row(i)
+        k = np.searchsorted(cols, j)
+        return values[k] if k < len(cols) and cols[k] == j else 0
+
+    def T(self):
+        """Transpose"""
+        rows, cols, values = self.to_coo()
+        return SparseMatrix.from_coo(cols, rows, values, (self.cols, self.rows))
+
+    def __add__(self, other):
+        """Sparse + Sparse stays sparse; Sparse + Matrix gives a dense Matrix"""
+        if isinstance(other, MatrixView): other = other.to_matrix()
+        if isinstance(other, Matrix):
+            if self.dim != other.dim: raise ValueError("12-3: Dimensions do not match")
+            return Matrix.from_numpy(self.to_dense("numpy").data + other.to_numpy())
+        if not isinstance(other, SparseMatrix): raise TypeError("12-1: Only Matrix objects can be added")
+        if self.dim != other.dim: raise ValueError("12-3: Dimensions do not match")
+        r1, c1, v1 = self.to_coo()
+        r2, c2, v2 = other.to_coo()
+        return SparseMatrix.from_coo(np.r_[r1, r2], np.r_[c1, c2], np.r_[v1, v2], self.dim)
+
+    def __mul__(self, other):
+        """Sparse * Sparse stays sparse; Sparse * Matrix gives a dense Matrix"""
+        if isinstance(other, MatrixView): other = other.to_matrix()
+        if isinstance(other, Matrix):
+            if self.cols != other.rows: raise TypeError("4-3: Matrix dimensions incompatible for multiplication")
+            dense = other.to_numpy()
+            res = np.zeros((self.rows, other.cols), dtype=np.result_type(self.values, dense))
+            rows, cols, values = self.to_coo()
+            np.add.at(res, rows, values[:, None] * dense[cols])
+            return Matrix.from_numpy(res)
+        if not isinstance(other, SparseMatrix): raise TypeError("4-1: Both must be Matrix objects")
+        if self.cols != other.rows: raise TypeError("4-3: Matrix dimensions incompatible for multiplication")
+        # Expand every a_ik against row k of B, then let from_coo sum the partial products
+        a_rows, a_cols, a_vals = self.to_coo()
+        counts = other.indptr[a_cols + 1] - other.indptr[a_cols]
+        total = int(counts.sum())
+        offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        gather = np.repeat(other.indptr[a_cols], counts) + offsets
+        return SparseMatrix.from_coo(np.repeat(a_rows, counts), other.indices[gather],
+                                     np.repeat(a_vals, counts) * other.values[gather],
+                                     (self.rows, other.cols))
+
+    def __rmul__(self, other):
+        """Matrix * Sparse, computed as (Sparse^T * Matrix^T)^T"""
+        return (self.T() * other.T()).T()
+
+# ==========================================
+# GRAPH CORE (CSR adjacency shared by every GraphAlgo algorithm)
+# ==========================================
+class GraphCore:
+    """
+    Compressed adjacency built once per graph: indptr (n + 1 offsets), nbrs and weights arrays.
+    Row u's out-edges are nbrs[indptr[u]:indptr[u + 1]], sorted by target.
+    Built from a dense matrix, a SparseMatrix or a plain edge list (no n x n matrix needed).
+    """
+    def __init__(self, n, src, dst, weights):
+        src = np.asarray(src, dtype=np.int64)
+        dst = np.asarray(dst, dtype=np.int64)
+        weights = np.asarray(weights)
+        order = np.lexsort((dst, src))
+        self.n = int(n)
+        self.nbrs = dst[order]
+        self.weights = weights[order]
+        self.indptr = np.zeros(self.n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=self.n), out=self.indptr[1:])
+        self._offsets = self.indptr.tolist() # plain ints: cheap to index inside Python loops
+        self._reverse = None
+        self._symmetric = None
+
+    @classmethod
+    def from_dense(cls, adj):
+        arr = np.asarray(adj)
+        if arr.size == 0: return cls(len(adj), [], [], [])
+        src, dst = np.nonzero(arr)
+        return cls(arr.shape[0], src, dst, arr[src, dst])
+
+    @classmethod
+    def from_sparse(cls, mat):
+        src, dst, w = mat.to_coo()
+        keep = w != 0
+        return cls(mat.rows, src[keep], dst[keep], w[keep])
+
+    @classmethod
+    def from_edges(cls, n, edges, directed=False):
+        """edges: iterable of (u, v) or (u, v, weight); undirected edges are stored both ways"""
+        arr = np.array([tuple(e) if len(e) == 3 else (e[0], e[1], 1) for e in edges], dtype=float).reshape(-1, 3)
+        return cls.from_arrays(n, arr[:, 0].astype(np.int64), arr[:, 1].astype(np.int64), arr[:, 2], directed)
+
+    @classmethod
+    def from_arrays(cls, n, src, dst, w, directed=False):
+        """Edge arrays with endpoints in [0, n); integral float weights become ints"""
+        if w.dtype.kind == "f" and len(w) and np.all(w == np.round(w)): w = w.astype(np.int64)
+        if not directed:
+            loop = src == dst
+            src, dst, w = np.r_[src, dst[~loop]], np.r_[dst, src[~loop]], np.r_[w, w[~loop]]
+        if len(src) and (src.min() < 0 or max(src.max(), dst.max()) >= n): raise ValueError("Edge endpoint out of range")
+        return cls(n, src, dst, w)
+
+    @property
+    def edge_count(self): return len(self.nbrs)
+
+    def neighbors(self, u):
+        """(targets, weights) of u's out-edges as Python lists"""
+        a, b = self._offsets[u], self._offsets[u + 1]
+        return self.nbrs[a:b].tolist(), self.weights[a:b].tolist()
+
+    def targets(self, u):
+        return self.nbrs[self._offsets[u]:self._offsets[u + 1]].tolist()
+
+    def edge_arrays(self):
+        """(src, dst, weight) arrays of every stored edge"""
+        return np.repeat(np.arange(self.n, dtype=np.int64), np.diff(self.indptr)), self.nbrs, self.weights
+
+    def reverse(self):
+        """Core of the transposed graph, built on first use"""
+        if self._reverse is None:
+            src, dst, w = self.edge_arrays()
+            self._reverse = GraphCore(self.n, dst, src, w)
+        return self._reverse
+
+    def is_symmetric(self):
+        if self._symmetric is None:
+            r = self.reverse()
+            self._symmetric = (np.array_equal(self.indptr, r.indptr) and np.array_equal(self.nbrs, r.nbrs)
+                               and np.array_equal(self.weights, r.weights))
+        return self._symmetric
+
+
+def dijkstra_tree(core, source):
+    """
+    Single-source Dijkstra over a GraphCore (binary heap, O(E log V)); edges with weight <= 0 are ignored.
+    Returns (dist, parent) lists: dist[v] is inf and parent[v] is -1 when v is unreachable.
+    """
+    INF = float('inf')
+    dist, parent = [INF] * core.n, [-1] * core.n
+    done = [False] * core.n
+    dist[source] = 0
+    heap = [(0, source)]
+    while heap:
+        d, u = heapq.heappop(heap)
+        if done[u]: continue
+        done[u] = True
+        for v, w in zip(*core.neighbors(u)):
+            if w > 0 and d + w < dist[v]:
+                dist[v] = d + w
+                parent[v] = u
+                heapq.heappush(heap, (d + w, v))
+    return dist, parent
+
+def tree_path(parent, source, target):
+    """Walk a shortest-path tree back from target; None when target is not in the tree"""
+    if target != source and parent[target] == -1: return None
+    path = [target]
+    while path[-1] != source:
+        path.append(parent[path[-1]])
+    return path[::-1]
+
+
+# ==========================================
+# ALL-PAIRS SHORTEST PATHS
+# ==========================================
+# Every stored edge counts here, negative ones included (Johnson reweighting); results are n x n float arrays.
+_FW_RATIO = 16          # Floyd-Warshall while n^2 < _FW_RATIO * (E + n) * log2(n)
+_APSP_PARALLEL_MIN = 512 # fewer sources than this are not worth starting worker processes
+
+def floyd_warshall(core):
+    """Vectorized Floyd-Warshall: one O(n^2) NumPy relaxation per intermediate vertex"""
+    n = core.n
+    dist = np.full((n, n), np.inf)
+    src, dst, w = core.edge_arrays()
+    np.minimum.at(dist, (src, dst), w.astype(float))
+    np.fill_diagonal(dist, np.minimum(dist.diagonal(), 0))
+    for k in range(n):
+        np.minimum(dist, dist[:, k, None] + dist[None, k, :], out=dist)
+    if n and dist.diagonal().min() < 0: raise ValueError("18-1: Graph contains a negative cycle")
+    return dist
+
+def bellman_ford_potential(core):
+    """Johnson potentials h (shortest distance from a virtual source joined to every vertex), vectorized"""
+    src, dst, w = core.edge_arrays()
+    w = w.astype(float)
+    h = np.zeros(core.n)
+    for _ in range(core.n + 1):
+        relaxed = h.copy()
+        np.minimum.at(relaxed, dst, h[src] + w)
+        if np.array_equal(relaxed, h): return h
+        h = relaxed
+    raise ValueError("18-1: Graph contains a negative cycle")
+
+def _adjacency_lists(indptr, nbrs, weights):
+    offsets, nbrs, weights = list(indptr), nbrs.tolist(), weights.tolist()
+    return [list(zip(nbrs[offsets[u]:offsets[u + 1]], weights[offsets[u]:offsets[u + 1]]))
+            for u in range(len(offsets) - 1)]
+
+def _dijkstra_row(adj, source, out):
+    """Distances from source written into out (pre-filled with inf); weights must be >= 0"""
+    done = [False] * len(adj)
+    dist = {source: 0.0}
+    heap = [(0.0, source)]
+    while heap:
+        d, u = heapq.heappop(heap)
+        if done[u]: continue
+        done[u] = True
+        out[u] = d
+        for v, w in adj[u]:
+            if not done[v] and d + w < dist.get(v, math.inf):
+                dist[v] = d + w
+                heapq.heappush(heap, (d + w, v))
+
+_apsp_worker_state = None
+
+def _apsp_worker_init(shm_name, n, indptr, nbrs, weights):
+    global _apsp_worker_state
+    try: shm = shared_memory.SharedMemory(name=shm_name, track=False) # the parent owns the block
+    except TypeError: shm = shared_memory.SharedMemory(name=shm_name)
+    _apsp_worker_state = (shm, np.ndarray((n, n), dtype=float, buffer=shm.buf), _adjacency_lists(indptr, nbrs, weights))
+
+def _apsp_worker_run(sources):
+    _, out, adj = _apsp_worker_state
+    for s in sources:
+        _dijkstra_row(adj, s, out[s])
+    return len(sources)
+
+def multi_source_dijkstra(core, sources=None, workers=None):
+    """
+    Dijkstra from every source (all vertices by default) on a core with non-negative weights.
+    Large jobs are spread over a process pool that writes rows straight into a shared-memory result.
+    Returns a len(sources) x n float array.
+    """
+    n = core.n
+    sources = list(range(n)) if sources is None else list(sources)
+    workers = min(workers or os.cpu_count() or 1, max(1, len(sources) // 64))
+    if workers <= 1 or len(sources) < _APSP_PARALLEL_MIN:
+        adj = _adjacency_lists(core.indptr, core.nbrs, core.weights)
+        res = np.full((len(sources), n), np.inf)
+        for i, s in enumerate(sources):
+            _dijkstra_row(adj, s, res[i])
+        return res
+    shm = shared_memory.SharedMemory(create=True, size=max(1, n * n * 8))
+    try:
+        full = np.ndarray((n, n), dtype=float, buffer=shm.buf)
+        full.fill(np.inf)
+        step = max(1, len(sources) // (workers * 4))
+        chunks = [sources[i:i + step] for i in range(0, len(sources), step)]
+        with ProcessPoolExecutor(workers, initializer=_apsp_worker_init,
+                                 initargs=(shm.name, n, core.indptr, core.nbrs, core.weights)) as pool:
+            for _ in pool.map(_apsp_worker_run, chunks): pass
+        res = full[sources]
+        del full
+    finally:
+        shm.close()
+        shm.unlink()
+    return res
+
+def johnson(core, workers=None):
+    """All-pairs distances for sparse graphs; reweights with Bellman-Ford potentials when any edge is negative"""
+    src, dst, w = core.edge_arrays()
+    if len(w) == 0 or w.min() >= 0: return multi_source_dijkstra(core, workers=workers)
+    h = bellman_ford_potential(core)
+    reweighted = np.maximum(w + h[src] - h[dst], 0) # >= 0 up to rounding
+    dist = multi_source_dijkstra(GraphCore(core.n, src, dst, reweighted), workers=workers)
+    dist += h[None, :] - h[:, None]
+    return dist
+
+
+# ==========================================
+# MINIMUM SPANNING FOREST
+# ==========================================
+# Edges are taken as undirected and only weights > 0 count (0 means "no edge" in an adjacency matrix).
+# Every engine returns (edges, total weight) with edges as (u, v) pairs; ties break on (weight, u, v).
+_BORUVKA_CHUNK = 1 << 18 # edges per thread in the cheapest-edge search
+
+def _undirected_edges(core):
+    """(u, v, w) arrays with u < v, one entry per undirected edge, sorted by (w, u, v)"""
+    src, dst, w = core.edge_arrays()
+    keep = (w > 0) & (src != dst)
+    src, dst, w = src[keep], dst[keep], w[keep]
+    u, v = np.minimum(src, dst), np.maximum(src, dst)
+    order = np.lexsort((v, u, w))
+    u, v, w = u[order], v[order], w[order]
+    if not core.is_symmetric(): # a pair stored both ways keeps its cheaper copy (first after sorting)
+        first = np.unique(u * core.n + v, return_index=True)[1]
+        first.sort()
+        u, v, w = u[first], v[first], w[first]
+    elif len(u): u, v, w = u[::2], v[::2], w[::2] # symmetric: every edge appears twice, adjacent
+    return u, v, w
+
+def _forest_result(u, v, w):
+    return list(zip(u.tolist(), v.tolist())), sum(w.tolist())
+
+def kruskal_forest(core):
+    """Kruskal over NumPy-sorted edges; union by rank, iterative path compression, stops at n - 1 edges"""
+    n = core.n
+    u, v, w = _undirected_edges(core)
+    parent, rank = list(range(n)), [0] * n
+    def find(x):
+        root = x
+        while parent[root] != root: root = parent[root]
+        while parent[x] != root: parent[x], x = root, parent[x]
+        return root
+
+    chosen = []
+    for i, (a, b) in enumerate(zip(u.tolist(), v.tolist())):
+        ra, rb = find(a), find(b)
+        if ra == rb: continue
+        if rank[ra] < rank[rb]: ra, rb = rb, ra
+        parent[rb] = ra
+        if rank[ra] == rank[rb]: rank[ra] += 1
+        chosen.append(i)
+        if len(chosen) == n - 1: break
+    chosen = np.array(chosen, dtype=np.int64)
+    return _forest_result(u[chosen], v[chosen], w[chosen])
+
+def prim_forest(core):
+    """Heap-based Prim restarted from every vertex not yet reached, so disconnected graphs give a forest"""
+    n = core.n
+    u, v, w = _undirected_edges(core)
+    und = GraphCore(n, np.r_[u, v], np.r_[v, u], np.r_[w, w])
+    INF = float('inf')
+    key, parent, done = [INF] * n, [-1] * n, [False] * n
+    edges, total = [], 0
+    for root in range(n):
+        if done[root]: continue
+        key[root] = 0
+        heap = [(0, root)]
+        while heap:
+            k, x = heapq.heappop(heap)
+            if done[x]: continue
+            done[x] = True
+            if parent[x] != -1:
+                edges.append((parent[x], x))
+                total += k
+            for y, wy in zip(*und.neighbors(x)):
+                if not done[y] and wy < key[y]:
+                    key[y] = wy
+                    parent[y] = x
+                    heapq.heappush(heap, (wy, y))
+    return edges, total
+
+def _cheapest_edges(cu, cv, k, workers):
+    """best[c] = index of the lightest edge leaving component c (edges are pre-sorted, so index = rank)"""
+    m = len(cu)
+    def scan(lo, hi):
+        best = np.full(k, m, dtype=np.int64)
+        idx = np.arange(lo, hi, dtype=np.int64)
+        np.minimum.at(best, cu[lo:hi], idx)
+        np.minimum.at(best, cv[lo:hi], idx)
+        return best
+    if workers <= 1 or m <= _BORUVKA_CHUNK: return scan(0, m)
+    step = max(_BORUVKA_CHUNK, -(-m // workers))
+    with ThreadPoolExecutor(workers) as pool:
+        parts = list(pool.map(lambda lo: scan(lo, min(lo + step, m)), range(0, m, step)))
+    return np.minimum.reduce(parts)
+
+def boruvka_forest(core, workers=None):
+    """
+    Boruvka: each round every component picks its lightest outgoing edge (vectorized, thread-chunked search),
+    then components are merged by pointer jumping. O(E log V) work in O(log V) NumPy rounds.
+    """
+    workers = workers or os.cpu_count() or 1
+    u, v, w = _undirected_edges(core)
+    comp = np.arange(core.n, dtype=np.int64)
+    live = np.arange(len(u), dtype=np.int64) # edges still joining two different components
+    k = core.n
+    chosen = []
+    while len(live):
+        cu, cv = comp[u[live]], comp[v[live]]
+        cross = cu != cv
+        live, cu, cv = live[cross], cu[cross], cv[cross]
+        if not len(live): break
+        best = _cheapest_edges(cu, cv, k, workers)
+        has = best < len(live)
+        picked = np.unique(best[has])
+        chosen.append(live[picked])
+        # each component points at the component across its cheapest edge; mutual pairs become roots
+        succ = np.arange(k, dtype=np.int64)
+        comps = np.nonzero(has)[0]
+        e = best[comps]
+        succ[comps] = np.where(cu[e] == comps, cv[e], cu[e])
+        mutual = (succ[succ] == np.arange(k)) & (np.arange(k) < succ)
+        succ[mutual] = np.nonzero(mutual)[0]
+        while True:
+            nxt = succ[succ]
+            if np.array_equal(nxt, succ): break
+            succ = nxt
+        labels, succ = np.unique(succ, return_inverse=True)
+        comp = succ[comp]
+        k = len(labels)
+    chosen = np.sort(np.concatenate(chosen)) if chosen else np.zeros(0, dtype=np.int64)
+    return _forest_result(u[chosen], v[chosen], w[chosen])
+
+
+# ==========================================
+# GRAPH IMPORT (streaming edge lists)
+# ==========================================
+# Text: one "u v [weight]" edge per line (CSV, TSV or whitespace); '#' / '%' comment lines and a header row are skipped.
+# Node ids may be any integers or strings; they are remapped to 0..n-1 and the originals returned as `labels`.
+# Binary: 32-byte header (magic, flags, n, m) followed by m packed (int64 u, int64 v[, float64 w]) records.
+EDGE_MAGIC = b"SCEDGES1"
+_EDGE_HEADER = np.dtype([("magic", "S8"), ("flags", "<u4"), ("reserved", "<u4"), ("n", "<u8"), ("m", "<u8")])
+_FLAG_WEIGHTED, _FLAG_DIRECTED = 1, 2
+_LOAD_CHUNK = 1 << 22 # bytes read (or records copied out of the map) per progress step
+
+def _edge_record(weighted):
+    return np.dtype([("u", "<i8"), ("v", "<i8")] + ([("w", "<f8")] if weighted else []))
+
+def _text_delimiter(path):
+    ext = os.path.splitext(path)[1].lower()
+    return {".csv": ",", ".tsv": "\t"}.get(ext)
+
+def _is_number(text):
+    try: float(text)
+    except ValueError: return False
+    return True
+
+def _edge_rows(lines, delimiter):
+    """Split text lines into fields, dropping blank and comment lines"""
+    rows = [l.split(delimiter) for l in lines if l.strip() and l.lstrip()[0] not in "#%"]
+    if rows and any(len(r) < 2 or len(r) != len(rows[0]) for r in rows): raise ValueError("19-2: Malformed edge list line")
+    return rows
+
+def _read_text_edges(path, delimiter, header, chunk_size, progress):
+    """(ids (m, 2) array of int64 or str, weights float array); reads chunk_size bytes at a time"""
+    total = os.path.getsize(path)
+    ids_parts, w_parts = [], []
+    numeric, done, tail = True, 0, b""
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(chunk_size)
+            data = tail + block
+            cut = data.rfind(b"\n") + 1 if block else len(data)
+            data, tail = data[:cut], data[cut:]
+            rows = _edge_rows(data.decode("utf-8").splitlines(), delimiter)
+            if rows and header is not False and not ids_parts:
+                # header row: text in a weight column, or a text line followed by numeric ids
+                first = rows[0]
+                if header or (not _is_number(first[0]) and ((len(first) > 2 and not _is_number(first[2]))
+                                                             or (len(rows) > 1 and _is_number(rows[1][0])))):
+                    rows = rows[1:]
+                header = False
+            if rows:
+                cols = np.char.strip(np.array(rows, dtype=str))
+                ids = cols[:, :2]
+                if numeric:
+                    try: ids = ids.astype(np.float64)
+                    except ValueError: # string ids: keep every id as text from here on
+                        numeric = False
+                        ids_parts = [(p.astype(np.int64) if np.all(p == np.round(p)) else p).astype(str) for p in ids_parts]
+                if cols.shape[1] > 2:
+                    try: w = cols[:, 2].astype(np.float64)
+                    except ValueError: raise ValueError("19-2: Malformed edge list line") from None
+                else: w = np.ones(len(ids))
+                ids_parts.append(ids if numeric else ids.astype(str))
+                w_parts.append(w)
+            done += len(block)
+            if progress: progress(done, total)
+            if not block: break
+    if not ids_parts: return np.zeros((0, 2), dtype=np.int64), np.zeros(0)
+    ids = np.concatenate(ids_parts)
+    if numeric and np.all(ids == np.round(ids)): ids = ids.astype(np.int64)
+    return ids, np.concatenate(w_parts)
+
+def _read_binary_edges(path, chunk_size, progress):
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < _EDGE_HEADER.itemsize: raise ValueError("19-3: Not a binary edge list")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            head = np.frombuffer(mm, dtype=_EDGE_HEADER, count=1)[0]
+            magic, flags, n, m = bytes(head["magic"]), int(head["flags"]), int(head["n"]), int(head["m"])
+            del head
+            rec = _edge_record(flags & _FLAG_WEIGHTED)
+            if magic != EDGE_MAGIC or size < _EDGE_HEADER.itemsize + m * rec.itemsize:
+                raise ValueError("19-3: Not a binary edge list")
+            if m == 0:
+                empty = np.empty(0, dtype=np.int64)
+                return n, empty, empty.copy(), empty.copy(), bool(flags & _FLAG_DIRECTED)
+            records = np.frombuffer(mm, dtype=rec, count=m, offset=_EDGE_HEADER.itemsize)
+            src, dst = np.empty(m, dtype=np.int64), np.empty(m, dtype=np.int64)
+            w = np.empty(m) if flags & _FLAG_WEIGHTED else None
+            step = max(1, chunk_size // rec.itemsize)
+            for a in range(0, m, step): # copy out of the map chunk by chunk so progress can be reported
+                part = records[a:a + step]
+                src[a:a + step], dst[a:a + step] = part["u"], part["v"]
+                if w is not None: w[a:a + step] = part["w"]
+                if progress: progress(_EDGE_HEADER.itemsize + (a + len(part)) * rec.itemsize, size)
+            del records, part
+    return n, src, dst, (w if w is not None else np.ones(m, dtype=np.int64)), bool(flags & _FLAG_DIRECTED)
+
+def load_edge_list(path, fmt="auto", directed=False, header=None, chunk_size=_LOAD_CHUNK, progress=None):
+    """
+    Stream an edge-list file into a GraphCore without building an n x n matrix (memory ~ edge count).
+    fmt: "auto" (by magic / extension), "binary", "csv", "tsv" or "text" (whitespace).
+    header: True / False forces a header row; None detects it.
+    progress(bytes_done, bytes_total) is called after every chunk.
+    Returns (core, labels): labels[i] is the original id of vertex i.
+    """
+    if fmt == "auto":
+        with open(path, "rb") as f: fmt = "binary" if f.read(len(EDGE_MAGIC)) == EDGE_MAGIC else "text"
+    if fmt == "binary":
+        n, src, dst, w, stored_directed = _read_binary_edges(path, chunk_size, progress)
+        return GraphCore.from_arrays(n, src, dst, w, stored_directed or directed), np.arange(n)
+    if fmt not in ("csv", "tsv", "text"): raise ValueError("19-1: Unknown edge list format")
+    delimiter = {"csv": ",", "tsv": "\t"}.get(fmt) or _text_delimiter(path)
+    ids, w = _read_text_edges(path, delimiter, header, chunk_size, progress)
+    labels, compact = np.unique(ids, return_inverse=True)
+    compact = compact.reshape(-1, 2).astype(np.int64)
+    return GraphCore.from_arrays(len(labels), compact[:, 0], compact[:, 1], w, directed), labels
+
+def save_edge_list(path, core, directed=None):
+    """
+    Write a core in the binary edge-list format (mmap-friendly, read back by load_edge_list).
+    Symmetric cores are stored once per undirected edge unless directed=True.
+    """
+    src, dst, w = core.edge_arrays()
+    if directed is None: directed = not core.is_symmetric()
+    if not directed:
+        keep = src <= dst
+        src, dst, w = src[keep], dst[keep], w[keep]
+    weighted = not np.all(w == 1)
+    head = np.zeros(1, dtype=_EDGE_HEADER)
+    head[0] = (EDGE_MAGIC, (_FLAG_WEIGHTED if weighted else 0) | (_FLAG_DIRECTED if directed else 0), 0, core.n, len(src))
+    rec = np.empty(len(src), dtype=_edge_record(weighted))
+    rec["u"], rec["v"] = src, dst
+    if weighted: rec["w"] = w
+    with open(path, "wb") as f:
+        f.write(head.tobytes())
+        f.write(rec.tobytes())
+
+
+# ==========================================
+# FORCE-DIRECTED LAYOUT
+# ==========================================
+_LAYOUT_EXACT_MAX = 1500 # up to this many nodes repulsion is summed over every pair
+_LAYOUT_LEAF = 8         # quadtree cells holding more nodes than this are split
+_LAYOUT_DEPTH = 40       # deepest split; nodes still sharing a cell there are (near) coincident
+_LAYOUT_THETA = 0.7      # Barnes-Hut opening angle; below 1/sqrt(2) a node is never far from its own cell
+_LAYOUT_BATCH = 4096     # nodes walked down the tree together
+
+class ForceLayout:
+    """
+    Fruchterman-Reingold layout on NumPy arrays: pos is an (n, 2) array updated in place.
+    Repulsion is exact for small graphs; larger ones use Barnes-Hut on an adaptive quadtree: each node
+    sums nearby leaves exactly and far cells through their centre of mass, so a step is ~O(n log n)
+    however the nodes are clustered.
+    """
+    def __init__(self, n, src, dst, pos=None, size=None, seed=0):
+        self.n = int(n)
+        src, dst = np.asarray(src, dtype=np.int64), np.asarray(dst, dtype=np.int64)
+        keep = src != dst
+        self.src, self.dst = src[keep], dst[keep]
+        self.size = float(size or max(1.0, 60.0 * math.sqrt(self.n)))
+        self.k = self.size / math.sqrt(max(self.n, 1)) # ideal edge length
+        rng = np.random.default_rng(seed)
+        self.pos = rng.random((self.n, 2)) * self.size if pos is None else np.array(pos, dtype=float).reshape(self.n, 2)
+        self.temperature = self.size / 10
+        self.iteration = 0
+        self.snapshot = self.pos.copy() # last published positions (read by other threads)
+
+    @classmethod
+    def from_core(cls, core, pos=None, size=None, seed=0):
+        src, dst, _ = core.edge_arrays()
+        keep = src < dst if core.is_symmetric() else np.ones(len(src), dtype=bool)
+        return cls(core.n, src[keep], dst[keep], pos, size, seed)
+
+    # --- repulsion ---
+    def _repulsion_exact(self, pos):
+        disp = np.zeros_like(pos)
+        k2 = self.k * self.k
+        for a in range(0, self.n, 512): # row blocks keep the pairwise temporaries small
+            delta = pos[a:a + 512, None, :] - pos[None, :, :]
+            d2 = np.maximum((delta ** 2).sum(-1), 1e-9)
+            d2[np.arange(len(delta)), np.arange(a, a + len(delta))] = np.inf # no self force
+            disp[a:a + 512] = (delta * (k2 / d2)[..., None]).sum(1)
+        return disp
+
+    def _quadtree(self, pos):
+        """
+        Adaptive quadtree over pos: a cell is split while it holds more than _LAYOUT_LEAF nodes, so
+        dense clusters get deep subtrees and empty space costs nothing. Returns flat per-cell arrays.
+        """
+        n = self.n
+        lo = pos.min(0)
+        side = max(float((pos.max(0) - lo).max()), 1e-9) * (1 + 1e-9)
+        ids, local, corner = np.arange(n), np.zeros(n, dtype=np.int64), lo[None, :]
+        mass, com, size, level = [np.array([float(n)])], [pos.mean(0)[None, :]], [np.array([side])], [np.zeros(1, np.int64)]
+        child_first, child_count, leaf_first, leaf_count, members = [], [], [], [], []
+        offset, placed = 0, 0
+        for depth in range(_LAYOUT_DEPTH + 1):
+            cells = len(corner)
+            count = np.bincount(local, minlength=cells)
+            split = count > _LAYOUT_LEAF if depth < _LAYOUT_DEPTH else np.zeros(cells, dtype=bool)
+            stay = ~split[local] # nodes whose cell is a leaf at this depth
+            order = np.argsort(local[stay], kind="stable")
+            members.append(ids[stay][order])
+            leaf_count.append(np.where(split, 0, count))
+            leaf_first.append(placed + np.cumsum(leaf_count[-1]) - leaf_count[-1])
+            placed += int(stay.sum())
+            ids, local = ids[~stay], local[~stay]
+            if not len(ids):
+                child_first.append(np.zeros(cells, dtype=np.int64)); child_count.append(np.zeros(cells, dtype=np.int64))
+                break
+            side /= 2
+            mid = corner[local] + side
+            quad = (pos[ids, 0] >= mid[:, 0]) * 2 + (pos[ids, 1] >= mid[:, 1])
+            keys, local = np.unique(local * 4 + quad, return_inverse=True)
+            parent, quad = keys // 4, keys % 4
+            offset += cells
+            child_first.append(offset + np.searchsorted(parent, np.arange(cells)))
+            child_count.append(np.bincount(parent, minlength=cells))
+            corner = corner[parent] + np.stack([quad // 2, quad % 2], 1) * side
+            m = np.bincount(local, minlength=len(keys)).astype(float)
+            mass.append(m)
+            com.append(np.stack([np.bincount(local, pos[ids, 0], len(keys)), np.bincount(local, pos[ids, 1], len(keys))], 1) / m[:, None])
+            size.append(np.full(len(keys), side))
+            level.append(np.full(len(keys), depth + 1))
+        cat = np.concatenate
+        return (cat(mass), cat(com), cat(size), cat(level), cat(child_first), cat(child_count),
+                cat(leaf_first), cat(leaf_count), cat(members))
+
+    def _repulsion_tree(self, pos):
+        """Barnes-Hut: walk every node down the quadtree, summing far cells through their centre of mass"""
+        n, k2, theta2 = self.n, self.k * self.k, _LAYOUT_THETA ** 2
+        mass, com, size, level, child_first, child_count, leaf_first, leaf_count, members = self._quadtree(pos)
+        disp = np.zeros_like(pos)
+        def expand(i, first, counts):
+            """Pairs (i[r], first[r] + t) for t < counts[r]"""
+            i = np.repeat(i, counts)
+            return i, np.repeat(first - np.cumsum(counts) + counts, counts) + np.arange(len(i))
+        for b in range(0, n, _LAYOUT_BATCH): # bounded batches keep the (node, cell) frontier small
+            i = np.arange(b, min(b + _LAYOUT_BATCH, n))
+            c = np.zeros(len(i), dtype=np.int64)
+            out = disp[b:b + _LAYOUT_BATCH]
+            while len(i):
+                delta = pos[i] - com[c]
+                d2 = np.maximum((delta ** 2).sum(1), 1e-9)
+                leaf = child_count[c] == 0
+                # far enough (or too deep to split coincident nodes): the whole cell acts through its centre of mass
+                far = (size[c] ** 2 < theta2 * d2) | (leaf & (level[c] == _LAYOUT_DEPTH))
+                f = delta * (mass[c] * k2 / d2)[:, None]
+                near = leaf & ~far
+                pi, pj = expand(i[near], leaf_first[c[near]], leaf_count[c[near]])
+                pj = members[pj]
+                keep = pi != pj
+                pi, pj = pi[keep], pj[keep]
+                delta = pos[pi] - pos[pj]
+                g = delta * (k2 / np.maximum((delta ** 2).sum(1), 1e-9))[:, None]
+                for axis in (0, 1):
+                    out[:, axis] += np.bincount(i[far] - b, f[far, axis], len(out)) + np.bincount(pi - b, g[:, axis], len(out))
+                inner = ~leaf & ~far
+                i, c = expand(i[inner], child_first[c[inner]], child_count[c[inner]])
+        return disp
+
+    # --- iteration ---
+    def step(self, iterations=1):
+        """Advance the layout; returns the (n, 2) position array"""
+        pos = self.pos
+        for _ in range(iterations):
+            if self.n < 2: break
+            disp = self._repulsion_exact(pos) if self.n <= _LAYOUT_EXACT_MAX else self._repulsion_tree(pos)
+            if len(self.src): # attraction d^2 / k along every edge
+                delta = pos[self.src] - pos[self.dst]
+                f = delta * (np.sqrt((delta ** 2).sum(1)) / self.k)[:, None]
+                for axis in (0, 1):
+                    pull = np.bincount(self.src, f[:, axis], self.n) - np.bincount(self.dst, f[:, axis], self.n)
+                    disp[:, axis] -= pull
+            length = np.maximum(np.sqrt((disp ** 2).sum(1)), 1e-9)
+            pos += disp * (np.minimum(length, self.temperature) / length)[:, None]
+            self.temperature = max(self.temperature * 0.95, self.k * 0.01)
+            self.iteration += 1
+        return pos
+
+    def run(self, iterations=200, every=5, token=None, progress=None):
+        """
+        Step `iterations` times; every `every` steps publish a copy in self.snapshot and call progress(pct, msg).
+        token (anything with .cancelled) stops early. Returns the final positions.
+        """
+        for done in range(0, iterations, every):
+            if token is not None and token.cancelled: break
+            self.step(min(every, iterations - done))
+            self.snapshot = self.pos.copy()
+            if progress: progress(int(100 * min(done + every, iterations) / iterations), f"Layout {self.iteration}")
+        return self.pos
+
 
 # ==========================================
 # CUSTOM GRAPH LOGIC (From User Provided graph.py)
 # ==========================================
 class GraphAlgo:
+    SPT_CACHE_SIZE = 64 # shortest-path trees kept per instance (LRU)
+
     def __init__(self, data):
         """
-        data: adjacency matrix (nested list)
+        data: adjacency matrix (nested list or SparseMatrix)
         """
         self.data = data
         self.validate()
+        self._set_core(GraphCore.from_sparse(data) if isinstance(data, SparseMatrix) else GraphCore.from_dense(data))
+
+    def _set_core(self, core):
+        self.core = core
+        self.version = getattr(self, "version", -1) + 1
+        self._closure = None
+        self._sp_cache = OrderedDict() # (version, source) -> (dist, parent)
+        self._sp_sources = set() # sources already queried once at this version
+
+    def update(self, data):
+        """Replace the adjacency data; bumps `version` so cached results are not reused"""
+        self.data = data
+        self.validate()
+        self._set_core(GraphCore.from_sparse(data) if isinstance(data, SparseMatrix) else GraphCore.from_dense(data))
+
+    @classmethod
+    def from_edges(cls, n, edges, directed=False):
+        """Build from an edge list [(u, v, weight), ...] without a dense matrix"""
+        return cls.from_core(GraphCore.from_edges(n, edges, directed))
+
+    @classmethod
+    def from_file(cls, path, fmt="auto", directed=False, header=None, progress=None):
+        """Load an edge-list file (see load_edge_list); original node ids are kept in `labels`"""
+        core, labels = load_edge_list(path, fmt, directed, header, progress=progress)
+        algo = cls.from_core(core)
+        algo.labels = labels
+        return algo
+
+    @classmethod
+    def from_core(cls, core):
+        algo = cls.__new__(cls)
+        algo.data = None
+        algo._set_core(core)
+        return algo
         
     def validate(self):
+        if isinstance(self.data, SparseMatrix):
+            if self.data.rows != self.data.cols: raise ValueError("Adjacency matrix must be square")
+            return
         if not isinstance(self.data, list): raise TypeError("Graph data must be list")
         if len(self.data) == 0: return # Allow empty graph for UI init
         lenth = len(self.data[0])
         if len(self.data) != lenth: raise ValueError("Adjacency matrix must be square")
 
+    @property
+    def vertices_count(self):
+        return self.core.n
+
+    def neighbors(self, u):
+        """(v, weight) pairs for every non-zero entry in row u"""
+        return list(zip(*self.core.neighbors(u)))
+
+    def is_directed(self):
+        """True when the adjacency matrix is not symmetric"""
+        return not self.core.is_symmetric()
+
+    # --- Connectivity engine: O(V + E) ---
+    def weak_components(self):
+        """Components ignoring edge direction (union-find), each sorted, ordered by smallest vertex"""
+        n = self.vertices_count
+        parent, size = list(range(n)), [1] * n
+        def find(x):
+            while parent[x] != x:
+                parent[x] = parent[parent[x]] # path halving
+                x = parent[x]
+            return x
+        src, dst, _ = self.core.edge_arrays()
+        for u, v in zip(src.tolist(), dst.tolist()):
+            ru, rv = find(u), find(v)
+            if ru != rv:
+                if size[ru] < size[rv]: ru, rv = rv, ru
+                parent[rv] = ru
+                size[ru] += size[rv]
+        groups = {}
+        for v in range(n):
+            groups.setdefault(find(v), []).append(v)
+        return list(groups.values())
+
+    def strong_components(self):
+        """Strongly connected components (iterative Tarjan), each sorted, sinks of the condensation first"""
+        core = self.core
+        n = core.n
+        index, low = [-1] * n, [0] * n
+        on_stack, stack, comps, counter = [False] * n, [], [], 0
+        for root in range(n):
+            if index[root] != -1: continue
+            index[root] = low[root] = counter; counter += 1
+            stack.append(root); on_stack[root] = True
+            work = [(root, iter(core.targets(root)))]
+            while work:
+                u, it = work[-1]
+                v = next(it, None)
+                if v is not None:
+                    if index[v] == -1:
+                        index[v] = low[v] = counter; counter += 1
+                        stack.append(v); on_stack[v] = True
+                        work.append((v, iter(core.targets(v))))
+                    elif on_stack[v] and index[v] < low[u]:
+                        low[u] = index[v]
+                    continue
+                work.pop()
+                if work and low[u] < low[work[-1][0]]: low[work[-1][0]] = low[u]
+                if low[u] == index[u]:
+                    comp = []
+                    while True:
+                        v = stack.pop()
+                        on_stack[v] = False
+                        comp.append(v)
+                        if v == u: break
+                    comps.append(sorted(comp))
+        return comps
+
+    def transitive_closure(self):
+        """
+        reach[u] is a Python-int bitset: bit v is set iff v is reachable from u (u reaches itself).
+        Built over the SCC condensation, so each component's set is computed once.
+        Needs O(V^2 / 64) words, so it is meant for reachability queries on moderate graphs.
+        """
+        if self._closure is None:
+            comps = self.strong_components()
+            comp_of = [0] * self.vertices_count
+            for c, comp in enumerate(comps):
+                for v in comp: comp_of[v] = c
+            comp_reach = []
+            for c, comp in enumerate(comps): # Tarjan order: every successor component comes earlier
+                bits = 0
+                for v in comp: bits |= 1 << v
+                for u in comp:
+                    for v in self.core.targets(u):
+                        if comp_of[v] != c: bits |= comp_reach[comp_of[v]]
+                comp_reach.append(bits)
+            self._closure = [comp_reach[comp_of[v]] for v in range(self.vertices_count)]
+        return self._closure
+
+    def reachable(self, u, v):
+        return bool(self.transitive_closure()[u] >> v & 1)
+
+    def connectivity(self, closure=False):
+        """
+        Report with weak and strong components in O(V + E).
+        closure=True also attaches the O(V^2)-bit reachability sets; otherwise "reach" is None and
+        reachable(u, v) builds (and caches) them only when a pair query actually needs them.
+        """
+        weak = self.weak_components()
+        strong = self.strong_components() if self.is_directed() else weak
+        n = self.vertices_count
+        return {
+            "directed": self.is_directed(),
+            "connected": n > 0 and len(strong) == 1,
+            "weakly_connected": n > 0 and len(weak) == 1,
+            "weak": weak,
+            "strong": strong,
+            "reach": self.transitive_closure() if closure else None,
+        }
+
     def connectness(self):
-        """Check if graph is connected using Matrix powers"""
-        try:
-            mat = Matrix(self.data)
-            vertices_count = len(mat.data)
-            if vertices_count == 0: return False
-            res = Matrix(dim=mat.dim, init_value=0)
-            # Sum of powers A^1 + ... + A^n
-            for i in range(1, vertices_count + 1):
-                res += mat**i # This uses the custom __pow__ and __add__
-            
-            for j in range(vertices_count):
-                for k in range(vertices_count):
-                    if j != k and res.data[j][k] == 0:
-                        return False
-            return True
-        except Exception as e:
-            return False
+        """Every vertex reaches every other: one component (undirected) or one SCC (directed)"""
+        if self.vertices_count == 0: return False
+        if self.is_directed(): return len(self.strong_components()) == 1
+        return len(self.weak_components()) == 1
 
     def connect_components(self):
-        """Return list of components [ [0,1], [2] ]"""
-        mat = self.data
-        vertices_count = len(mat)
-        check = [False] * vertices_count
-        res = []
-        
-        for index in range(vertices_count):
-            if not check[index]:
-                component = []
-                queue = [index]
-                check[index] = True
-                while queue:
-                    curr = queue.pop(0)
-                    component.append(curr)
-                    for neighbor in range(vertices_count):
-                        # Treat non-zero as connected
-                        if mat[curr][neighbor] != 0 and not check[neighbor]:
-                            check[neighbor] = True
-                            queue.append(neighbor)
-                res.append(component)
-        return res
+        """Return list of components [ [0,1], [2] ] (direction ignored)"""
+        return self.weak_components()
 
     def is_bipartite_BFS(self):
-        mat = self.data
-        vertices_count = len(mat)
-        color = {}
+        vertices_count = self.vertices_count
+        color = [-1] * vertices_count
         for start in range(vertices_count):
-            if start not in color:
+            if color[start] == -1:
                 color[start] = 0
-                queue = [start]
+                queue = deque([start])
                 while queue:
-                    u = queue.pop(0)
-                    for v in range(vertices_count):
-                        if mat[u][v] != 0:
-                            if v not in color:
-                                color[v] = 1 - color[u]
-                                queue.append(v)
-                            elif color[v] == color[u]:
-                                return False
+                    u = queue.popleft()
+                    for v in self.core.targets(u):
+                        if color[v] == -1:
+                            color[v] = 1 - color[u]
+                            queue.append(v)
+                        elif color[v] == color[u]:
+                            return False
         return True
 
+    # --- Shortest paths ---
+    def shortest_path_tree(self, source):
+        """(dist, parent) lists of the full shortest-path tree from source, cached per graph version"""
+        key = (self.version, source)
+        if key in self._sp_cache:
+            self._sp_cache.move_to_end(key)
+            return self._sp_cache[key]
+        tree = dijkstra_tree(self.core, source)
+        self._sp_cache[key] = tree
+        if len(self._sp_cache) > self.SPT_CACHE_SIZE: self._sp_cache.popitem(last=False)
+        return tree
+
+    def shortest_paths(self, source, targets=None):
+        """{target: (distance, path)} for many targets from a single Dijkstra run"""
+        dist, parent = self.shortest_path_tree(source)
+        if targets is None: targets = range(self.vertices_count)
+        return {t: (dist[t], tree_path(parent, source, t)) for t in targets}
+
+    def bidirectional_dijkstra(self, start, end):
+        """Single-pair query searching from both ends; returns (distance, path) or (inf, None)"""
+        INF = float('inf')
+        if start == end: return 0, [start]
+        cores = (self.core, self.core.reverse())
+        dist = ({start: 0}, {end: 0})
+        parent = ({start: None}, {end: None})
+        done = (set(), set())
+        heaps = ([(0, start)], [(0, end)])
+        best, meet = INF, None
+        while heaps[0] and heaps[1]:
+            if heaps[0][0][0] + heaps[1][0][0] >= best: break
+            side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1 # expand the smaller frontier
+            d, u = heapq.heappop(heaps[side])
+            if u in done[side]: continue
+            done[side].add(u)
+            for v, w in zip(*cores[side].neighbors(u)):
+                if w <= 0 or d + w >= dist[side].get(v, INF): continue
+                dist[side][v] = d + w
+                parent[side][v] = u
+                heapq.heappush(heaps[side], (d + w, v))
+                if v in dist[1 - side] and d + w + dist[1 - side][v] < best:
+                    best, meet = d + w + dist[1 - side][v], v
+        if meet is None: return INF, None
+        path, node = [], meet
+        while node is not None:
+            path.append(node)
+            node = parent[0][node]
+        path.reverse()
+        node = parent[1][meet]
+        while node is not None:
+            path.append(node)
+            node = parent[1][node]
+        return best, path
+
+    def all_pairs_shortest_paths(self, method="auto", workers=None):
+        """
+        n x n array of shortest distances (inf when unreachable); every stored edge counts, negative ones included.
+        method: "floyd" (dense), "johnson" (sparse, process-parallel Dijkstra) or "auto".
+        """
+        n, e = self.vertices_count, self.core.edge_count
+        if method == "auto": method = "floyd" if n * n < _FW_RATIO * (e + n) * max(1, math.log2(n or 1)) else "johnson"
+        if method == "floyd": return floyd_warshall(self.core)
+        if method == "johnson": return johnson(self.core, workers)
+        raise ValueError("18-2: Unknown all-pairs method")
+
     def find_shortest_path_weight(self, start, end):
-        """Dijkstra's Algorithm"""
-        vertices_count = len(self.data)
-        distances = {i: float('inf') for i in range(vertices_count)}
-        distances[start] = 0
-        visited = [False] * vertices_count
-        parent = {start: None}
-
-        for _ in range(vertices_count):
-            min_dist = float('inf')
-            curr = -1
-            for i in range(vertices_count):
-                if not visited[i] and distances[i] < min_dist:
-                    min_dist = distances[i]
-                    curr = i
-            
-            if curr == -1 or distances[curr] == float('inf'): break
-            if curr == end: break
-
-            visited[curr] = True
-            for i in range(vertices_count):
-                weight = self.data[curr][i]
-                if weight > 0 and not visited[i]:
-                    new_dist = distances[curr] + weight
-                    if new_dist < distances[i]:
-                        distances[i] = new_dist
-                        parent[i] = curr
-        
-        if end not in parent: return None
-        path = []
-        curr_node = end
-        while curr_node is not None:
-            path.append(curr_node)
-            curr_node = parent[curr_node]
-        return path[::-1]
+        """
+        Dijkstra's Algorithm: a first query from `start` searches bidirectionally; a repeated one
+        builds (or reuses) the cached full tree from `start`, so later targets cost only a walk.
+        """
+        if (self.version, start) not in self._sp_cache and start not in self._sp_sources:
+            self._sp_sources.add(start)
+            return self.bidirectional_dijkstra(start, end)[1]
+        return tree_path(self.shortest_path_tree(start)[1], start, end)
+
+    def minimum_spanning_forest(self, method="kruskal", workers=None):
+        """(edges, total weight) of a minimum spanning forest; method: "kruskal", "prim" or "boruvka" """
+        if method == "kruskal": return kruskal_forest(self.core)
+        if method == "prim": return prim_forest(self.core)
+        if method == "boruvka": return boruvka_forest(self.core, workers)
+        raise ValueError("18-3: Unknown MST method")
 
     def mst_prim(self):
-        """Prim's Algo -> Returns Adjacency Matrix of MST"""
-        weights = self.data
-        n = len(weights)
-        if n == 0: return []
-        INF = float('inf')
-        key = [INF] * n
-        parent = [None] * n
-        mst_set = [False] * n
-        key[0] = 0
-        parent[0] = -1
-
-        for _ in range(n):
-            min_val = INF
-            u = -1
-            for v in range(n):
-                if not mst_set[v] and key[v] < min_val:
-                    min_val = key[v]
-                    u = v
-            if u == -1: break
-            mst_set[u] = True
-            
-            for v in range(n):
-                w = weights[u][v]
-                if w > 0 and not mst_set[v] and w < key[v]:
-                    key[v] = w
-                    parent[v] = u
-        
-        mst_edges = []
-        for i in range(1, n):
-            if parent[i] is not None:
-                # Store as tuple (u, v)
-                mst_edges.append((parent[i], i))
-        return mst_edges
+        """Prim's Algo (binary heap) -> Returns list of MST edges (a forest when disconnected)"""
+        return prim_forest(self.core)[0]
 
     def mst_kruskal(self):
         """Kruskal's Algo -> Returns list of edges"""
-        weights = self.data
-        n = len(weights)
-        edges = []
-        for i in range(n):
-            for j in range(i + 1, n): # Upper triangle
-                if weights[i][j] > 0:
-                    edges.append((weights[i][j], i, j))
-        edges.sort()
-        
-        parent = list(range(n))
-        def find(i):
-            if parent[i] == i: return i
-            parent[i] = find(parent[i])
-            return parent[i]
-        
-        def union(i, j):
-            root_i = find(i)
-            root_j = find(j)
-            if root_i != root_j:
-                parent[root_i] = root_j
-                return True
-            return False
-        
-        mst_edges = []
-        for w, u, v in edges:
-            if union(u, v):
-                mst_edges.append((u, v))
-        return mst_edges
\ No newline at end of file
+        return kruskal_forest(self.core)[0]
+
+
+# ==========================================
+# GRAPH MODEL (editable graph behind the drawing canvas)
+# ==========================================
+class DynamicConnectivity:
+    """
+    Undirected connectivity and bipartiteness over node ids, maintained while edges are added.
+    Insertions are near O(1) (union-find with edge parity); a deletion only marks the structure stale
+    and the next query rebuilds it from the remaining edges in O(V + E).
+    """
+    def __init__(self):
+        self._incident = {} # node id -> {pair: multiplicity}, pair = (min id, max id)
+        self._stale = False
+        self._reset()
+
+    def _reset(self):
+        self._parent, self._parity, self._size = {}, {}, {}
+        self._odd = set() # roots whose component holds an odd cycle
+        self.count = 0
+
+    def _find(self, x):
+        """(root, parity of x relative to root) with path compression"""
+        path = []
+        while self._parent[x] != x:
+            path.append(x)
+            x = self._parent[x]
+        root = x
+        for node in reversed(path): # nearest to the root first, so the parent's parity is already final
+            parent = self._parent[node]
+            if parent != root: self._parity[node] ^= self._parity[parent]
+            self._parent[node] = root
+        return root, (self._parity[path[0]] if path else 0)
+
+    def _make(self, x):
+        self._parent[x], self._parity[x], self._size[x] = x, 0, 1
+        self.count += 1
+
+    def _union(self, u, v):
+        ru, pu = self._find(u)
+        rv, pv = self._find(v)
+        if ru == rv:
+            if pu == pv: self._odd.add(ru)
+            return
+        if self._size[ru] < self._size[rv]: ru, rv = rv, ru
+        self._parent[rv], self._parity[rv] = ru, pu ^ pv ^ 1
+        self._size[ru] += self._size[rv]
+        self.count -= 1
+        if rv in self._odd:
+            self._odd.discard(rv)
+            self._odd.add(ru)
+
+    def _refresh(self):
+        if not self._stale: return
+        self._reset()
+        for x in self._incident: self._make(x)
+        for x, pairs in self._incident.items():
+            for u, v in pairs:
+                if u == x: self._union(u, v)
+        self._stale = False
+
+    def add_node(self, x):
+        if x in self._incident: return
+        self._incident[x] = {}
+        if not self._stale: self._make(x)
+
+    def remove_node(self, x):
+        for u, v in list(self._incident[x]):
+            other = v if u == x else u
+            self._incident[other].pop((u, v), None)
+        del self._incident[x]
+        self._stale = True
+
+    def add_edge(self, u, v):
+        pair = (min(u, v), max(u, v))
+        for x in {u, v}: self._incident[x][pair] = self._incident[x].get(pair, 0) + 1
+        if not self._stale: self._union(u, v)
+
+    def remove_edge(self, u, v):
+        pair = (min(u, v), max(u, v))
+        for x in {u, v}:
+            left = self._incident[x][pair] - 1
+            if left: self._incident[x][pair] = left
+            else: del self._incident[x][pair]
+        if pair not in self._incident[u]: self._stale = True # the last copy of this edge is gone
+
+    @property
+    def component_count(self):
+        self._refresh()
+        return self.count
+
+    @property
+    def is_bipartite(self):
+        self._refresh()
+        return not self._odd
+
+    def connected(self, u, v):
+        self._refresh()
+        return self._find(u)[0] == self._find(v)[0]
+
+    def components(self):
+        """Components as sorted id lists, ordered by smallest id"""
+        self._refresh()
+        groups = {}
+        for x in sorted(self._incident): groups.setdefault(self._find(x)[0], []).append(x)
+        return list(groups.values())
+
+class GraphModel:
+    """
+    Node ids and weighted edges kept up to date one edit at a time.
+    Matrix index i is the i-th smallest node id; edges are stored as drawn, keyed by (u_id, v_id).
+    The GraphAlgo for the current state is built from the edge list on first use and dropped on every change.
+    """
+    def __init__(self, directed=False):
+        self.directed = directed
+        self.ids = []        # sorted node ids; position = matrix index
+        self.index = {}      # node id -> matrix index
+        self.edges = {}      # (u_id, v_id) -> weight
+        self._incident = {}  # node id -> set of edge keys touching it
+        self.version = 0
+        self._algo = None
+        self.connectivity = DynamicConnectivity() # live, undirected view; zero-weight edges do not connect
+
+    def _changed(self):
+        self.version += 1
+        self._algo = None
+
+    def _reindex(self, start=0):
+        for i in range(start, len(self.ids)): self.index[self.ids[i]] = i
+
+    def __len__(self): return len(self.ids)
+
+    def add_node(self, node_id):
+        if node_id in self.index: return
+        pos = bisect.bisect(self.ids, node_id)
+        self.ids.insert(pos, node_id)
+        self._reindex(pos)
+        self._incident[node_id] = set()
+        self.connectivity.add_node(node_id)
+        self._changed()
+
+    def remove_node(self, node_id):
+        """Drops the node and its edges; returns the removed edge keys"""
+        removed = list(self._incident[node_id])
+        for key in removed: self.remove_edge(*key)
+        pos = self.index.pop(node_id)
+        del self.ids[pos]
+        del self._incident[node_id]
+        self.connectivity.remove_node(node_id)
+        self._reindex(pos)
+        self._changed()
+        return removed
+
+    def edge_key(self, u, v):
+        """Key of the stored edge joining u -> v (either direction when undirected), or None"""
+        if (u, v) in self.edges: return (u, v)
+        if not self.directed and (v, u) in self.edges: return (v, u)
+        return None
+
+    def add_edge(self, u, v, weight=1):
+        """Adds u -> v or re-weights the existing edge; returns (key, created)"""
+        key = self.edge_key(u, v)
+        created = key is None
+        if created:
+            key = (u, v)
+            self._incident[u].add(key)
+            self._incident[v].add(key)
+        old = self.edges.get(key, 0)
+        if old == 0 and weight != 0: self.connectivity.add_edge(*key)
+        elif old != 0 and weight == 0: self.connectivity.remove_edge(*key)
+        self.edges[key] = weight
+        self._changed()
+        return key, created
+
+    def remove_edge(self, u, v):
+        if self.edges.pop((u, v)) != 0: self.connectivity.remove_edge(u, v)
+        self._incident[u].discard((u, v))
+        self._incident[v].discard((u, v))
+        self._changed()
+
+    def set_directed(self, directed):
+        if directed == self.directed: return
+        self.directed = directed
+        self._changed()
+
+    def clear(self):
+        self.ids, self.index, self.edges, self._incident = [], {}, {}, {}
+        self.connectivity = DynamicConnectivity()
+        self._changed()
+
+    def edge_list(self):
+        """[(u_index, v_index, weight)] of every non-zero edge (zero weight means no edge, as in the matrix)"""
+        idx = self.index
+        return [(idx[u], idx[v], w) for (u, v), w in self.edges.items() if w != 0]
+
+    def algo(self):
+        if self._algo is None: self._algo = GraphAlgo.from_edges(len(self.ids), self.edge_list(), self.directed)
+        return self._algo
+
+    def adjacency(self):
+        """Dense n x n list, same layout the canvas export has always used"""
+        n = len(self.ids)
+        adj = [[0] * n for _ in range(n)]
+        for (u, v), w in self.edges.items():
+            adj[self.index[u]][self.index[v]] = w
+            if not self.directed: adj[self.index[v]][self.index[u]] = w
+        return adj
+
+
+# ==========================================
+# EXPRESSION COMPILER (calculus plots)
+# ==========================================
+# Functions a plot expression may call, as np.<name> or bare <name>; everything else is rejected.
+_EXPR_FUNCS = {name: getattr(np, name) for name in (
+    "sin", "cos", "tan", "arcsin", "arccos", "arctan", "arctan2", "sinh", "cosh", "tanh",
+    "arcsinh", "arccosh", "arctanh", "exp", "exp2", "expm1", "log", "log2", "log10", "log1p",
+    "sqrt", "cbrt", "square", "abs", "absolute", "sign", "floor", "ceil", "round", "trunc",
+    "maximum", "minimum", "hypot", "power", "mod", "where", "clip", "heaviside", "sinc", "deg2rad", "rad2deg", "roll")}
+_EXPR_CONSTS = {"pi": math.pi, "e": math.e, "inf": math.inf}
+_EXPR_BINOPS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow)
+_EXPR_CMPOPS = (ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.Eq, ast.NotEq)
+
+class ExpressionError(ValueError):
+    pass
+
+class _ExprChecker(ast.NodeTransformer):
+    """Validates the tree, resolves np.<f> / constants to plain names and folds constant sub-expressions"""
+    def __init__(self, variables):
+        self.variables = variables
+        self.used = set()
+
+    def generic_visit(self, node):
+        raise ExpressionError(f"20-3: Unsupported syntax: {type(node).__name__}")
+
+    def visit_Expression(self, node):
+        node.body = self.visit(node.body)
+        return node
+
+    def visit_Constant(self, node):
+        if isinstance(node.value, bool) or not isinstance(node.value, (int, float, complex)):
+            raise ExpressionError(f"20-3: Unsupported constant {node.value!r}")
+        return node
+
+    def _name(self, name, node):
+        if name in _EXPR_CONSTS: return ast.copy_location(ast.Constant(_EXPR_CONSTS[name]), node)
+        if name in _EXPR_FUNCS or name in self.variables:
+            if name in self.variables: self.used.add(name)
+            return ast.copy_location(ast.Name(id=name, ctx=ast.Load()), node)
+        raise ExpressionError(f"20-2: '{name}' is not allowed")
+
+    def visit_Name(self, node):
+        return self._name(node.id, node)
+
+    def visit_Attribute(self, node):
+        if not (isinstance(node.value, ast.Name) and node.value.id in ("np", "numpy")):
+            raise ExpressionError("20-2: Only np.<function> attributes are allowed")
+        if node.attr in self.variables: raise ExpressionError(f"20-2: 'np.{node.attr}' is not allowed")
+        return self._name(node.attr, node)
+
+    def visit_UnaryOp(self, node):
+        if not isinstance(node.op, (ast.UAdd, ast.USub)): raise ExpressionError("20-3: Unsupported operator")
+        node.operand = self.visit(node.operand)
+        return self._fold(node)
+
+    def visit_BinOp(self, node):
+        if not isinstance(node.op, _EXPR_BINOPS): raise ExpressionError("20-3: Unsupported operator")
+        node.left, node.right = self.visit(node.left), self.visit(node.right)
+        if isinstance(node.op, ast.Pow): # float powers only: 9**9**9 must not become a bigint power
+            node.left, node.right = self._as_float(node.left), self._as_float(node.right)
+        return self._fold(node)
+
+    @staticmethod
+    def _as_float(node):
+        if isinstance(node, ast.Constant) and isinstance(node.value, int):
+            try: node.value = float(node.value)
+            except OverflowError: raise ExpressionError("20-5: Number too large") from None
+        return node
+
+    def visit_Compare(self, node):
+        if len(node.ops) != 1 or not isinstance(node.ops[0], _EXPR_CMPOPS):
+            raise ExpressionError("20-3: Only single comparisons are allowed")
+        node.left, node.comparators = self.visit(node.left), [self.visit(node.comparators[0])]
+        return node
+
+    def visit_Call(self, node):
+        if node.keywords: raise ExpressionError("20-3: Keyword arguments are not allowed")
+        node.func = self.visit(node.func)
+        if not (isinstance(node.func, ast.Name) and node.func.id in _EXPR_FUNCS):
+            raise ExpressionError("20-2: Only allowed functions can be called")
+        node.args = [self.visit(a) for a in node.args]
+        return self._fold(node)
+
+    def _fold(self, node):
+        """Replace a sub-expression whose operands are all constants by its value"""
+        children = [c for c in ast.iter_child_nodes(node) if not isinstance(c, (ast.operator, ast.unaryop))]
+        if isinstance(node, ast.Call): children = node.args
+        if not all(isinstance(c, ast.Constant) for c in children): return node
+        try:
+            with np.errstate(all="ignore"):
+                value = eval(compile(ast.fix_missing_locations(ast.Expression(node)), "<fold>", "eval"),
+                             {"__builtins__": {}}, _EXPR_FUNCS)
+        except OverflowError:
+            raise ExpressionError("20-5: Number too large") from None # e.g. 9**9**9
+        except Exception:
+            return node # e.g. 1/0: keep it and let evaluation report it
+        if isinstance(value, np.generic): value = value.item()
+        if isinstance(value, bool) or not isinstance(value, (int, float)): return node
+        try:
+            if not math.isfinite(value): return node
+        except ArithmeticError as e:
+            raise ExpressionError(f"20-5: {type(e).__name__}: {e}") from None
+        return ast.copy_location(ast.Constant(value), node)
+
+class CompiledExpression:
+    """A validated, constant-folded plot expression; call it with x (and parameters) to get a float array"""
+    def __init__(self, source, code, params):
+        self.source, self.code, self.params = source, code, params
+
+    def __call__(self, x, **params):
+        x = np.asarray(x, dtype=float)
+        env = dict(_EXPR_FUNCS)
+        for name, value in params.items():
+            value = np.asarray(value)
+            env[name] = value.astype(float) if value.dtype.kind in "biu" else value # no Python-int powers here either
+        env["x"] = x
+        try:
+            with np.errstate(all="ignore"):
+                y = np.asarray(eval(self.code, {"__builtins__": {}}, env))
+                if np.iscomplexobj(y): y = np.where(np.abs(y.imag) < 1e-12, y.real, np.nan)
+                y = y.astype(float)
+        except Exception as e:
+            raise ExpressionError(f"20-4: {type(e).__name__}: {e}") from None
+        if y.shape == x.shape: return y
+        # constant expressions and parameter arrays broadcast against x (e.g. a=values[:, None] sweeps a)
+        try: return np.broadcast_to(y, np.broadcast_shapes(x.shape, y.shape))
+        except ValueError: raise ExpressionError(f"20-6: Result of shape {y.shape} does not match x") from None
+
+@lru_cache(maxsize=256)
+def compile_expression(source, params=()):
+    """
+    Parse once with ast, validate against the allowed functions, fold constants and compile.
+    Cached by (source text, parameter names), so repeated plots skip parsing entirely.
+    Raises ExpressionError with a readable message for anything invalid.
+    """
+    text = source.strip()
+    if not text: raise ExpressionError("20-1: Empty expression")
+    try: tree = ast.parse(text, mode="eval")
+    except SyntaxError as e: raise ExpressionError(f"20-1: Syntax error at column {e.offset}") from None
+    except (MemoryError, RecursionError, ValueError): raise ExpressionError("20-1: Expression too complex") from None
+    checker = _ExprChecker({"x", *params})
+    try: tree = ast.fix_missing_locations(checker.visit(tree))
+    except RecursionError: raise ExpressionError("20-1: Expression too complex") from None
+    return CompiledExpression(text, compile(tree, "<expr>", "eval"), tuple(sorted(checker.used - {"x"})))
+
+def adaptive_sample(f, x_min, x_max, pixels=800, per_pixel=4, rel_tol=1e-3):
+    """
+    Sample a vectorized f on [x_min, x_max] for plotting: start from a coarse uniform grid and
+    halve, one batched f call per round, every interval whose midpoint strays from the chord by
+    more than rel_tol of the y range. Intervals stop shrinking at 1/per_pixel of a pixel.
+    Jumps and sign-changing poles still unresolved at that width get a NaN break, so
+    matplotlib draws no false vertical line. Returns (x, y).
+    """
+    xs = np.linspace(x_min, x_max, max(17, pixels // 16) + 1)
+    ys = np.asarray(f(xs), dtype=float)
+    finite = ys[np.isfinite(ys)]
+    scale = float(np.subtract(*np.percentile(finite, [98, 2]))) if finite.size else 0.0
+    scale = scale or 1.0
+    tol, min_width = rel_tol * scale, (x_max - x_min) / (pixels * per_pixel)
+    cand, breaks = np.arange(len(xs) - 1), []
+    while cand.size:
+        xm = 0.5 * (xs[cand] + xs[cand + 1])
+        ym = np.asarray(f(xm), dtype=float)
+        yl, yr = ys[cand], ys[cand + 1]
+        fin = np.isfinite(yl) & np.isfinite(ym) & np.isfinite(yr)
+        # a finite/non-finite boundary is refined too, so the curve runs right up to the edge of its domain
+        bad = np.where(fin, np.abs(ym - 0.5 * (yl + yr)) > tol, np.isfinite(yl) | np.isfinite(ym) | np.isfinite(yr))
+        last = bad & (xs[cand + 1] - xs[cand] <= 2 * min_width)
+        pole = last & fin
+        if pole.any():
+            l, m, r = yl[pole], ym[pole], yr[pole]
+            dl, dr = np.abs(m - l), np.abs(r - m)
+            left = dl >= dr
+            a, b, big = np.where(left, l, m), np.where(left, m, r), np.maximum(dl, dr)
+            outside = (m < np.minimum(l, r) - tol) | (m > np.maximum(l, r) + tol)
+            # a step puts nearly all the change in one half; a pole overshoots and flips sign
+            jump = (big > 0.02 * scale) & ((big > 0.95 * (dl + dr)) | (outside & (np.sign(a) != np.sign(b))))
+            half = np.where(left, xs[cand][pole] + xm[pole], xm[pole] + xs[cand + 1][pole]) * 0.5
+            breaks.append(half[jump])
+        pos = cand + 1
+        xs, ys = np.insert(xs, pos, xm), np.insert(ys, pos, ym)
+        start = (cand + np.arange(cand.size))[bad & ~last] # index of each refined interval after the insert
+        cand = np.column_stack((start, start + 1)).ravel()
+    ys[~np.isfinite(ys)] = np.nan
+    if breaks:
+        bx = np.sort(np.concatenate(breaks))
+        pos = np.searchsorted(xs, bx)
+        xs, ys = np.insert(xs, pos, bx), np.insert(ys, pos, np.nan)
+    return xs, ys
+
+class TileCache:
+    """
+    Bounded LRU of sampled x-interval tiles, so re-plotting a view (pan back, zoom back out) reuses samples.
+    A view of width W uses tiles of width 2**floor(log2(W / per_view)) aligned to multiples of that width,
+    each sampled at pixels / per_view pixels: at least screen resolution at any zoom level.
+    """
+    def __init__(self, maxsize=512, per_view=4):
+        self.maxsize, self.per_view = maxsize, per_view
+        self._tiles = OrderedDict()
+        self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._tiles)
+
+    def clear(self):
+        self._tiles.clear()
+
+    def tile(self, key, f, level, index, pixels):
+        k = (key, level, index, pixels)
+        hit = self._tiles.get(k)
+        if hit is not None:
+            self.hits += 1
+            self._tiles.move_to_end(k)
+            return hit
+        self.misses += 1
+        hit = adaptive_sample(f, math.ldexp(index, level), math.ldexp(index + 1, level), pixels)
+        self._tiles[k] = hit
+        if len(self._tiles) > self.maxsize: self._tiles.popitem(last=False)
+        return hit
+
+    def sample(self, key, f, x_min, x_max, pixels=800):
+        """(x, y) covering [x_min, x_max] for the function identified by key (e.g. its source text)"""
+        if not x_min < x_max: return np.empty(0), np.empty(0)
+        level = math.floor(math.log2((x_max - x_min) / self.per_view))
+        width, tile_pixels = math.ldexp(1.0, level), max(16, -(-pixels // self.per_view))
+        first, last = math.floor(x_min / width), math.ceil(x_max / width)
+        parts = [self.tile(key, f, level, i, tile_pixels) for i in range(first, last)]
+        return np.concatenate([p[0] for p in parts]), np.concatenate([p[1] for p in parts])
\ No newline at end of file
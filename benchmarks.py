@@ -0,0 +1,222 @@
+# benchmarks.py
+"""
+Reproducible benchmarks for backend.Matrix and backend.GraphAlgo.
+
+    python benchmarks.py                              # all cases, results -> bench_results.json
+    python benchmarks.py --cases matrix_mul,mst_prim --max-size 1000
+    python benchmarks.py --compare old.json           # exit code 1 on regressions
+
+Every case runs over a geometric size ladder (10 ... 10^5) until a single run exceeds
+the time budget or the case's size cap. For each size we record the best time per
+operation and the peak traced memory, then fit the scaling exponent k in t ~ n^k.
+"""
+import argparse
+import json
+import math
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+from backend import Matrix, GraphAlgo, SparseMatrix, dijkstra_tree, compile_expression, adaptive_sample
+
+SIZES = [10, 32, 100, 316, 1000, 3162, 10000, 31623, 100000]
+
+# ==========================================
+# SEEDED GENERATORS
+# ==========================================
+def random_matrix(n, m=None, seed=0, kind="int", density=1.0):
+    """n x m nested list; kind 'int' (exact, small values) or 'float'"""
+    rng = random.Random(seed)
+    m = n if m is None else m
+    draw = (lambda: rng.randint(-9, 9)) if kind == "int" else rng.random
+    return [[draw() if rng.random() < density else 0 for _ in range(m)] for _ in range(n)]
+
+def random_edges(n, avg_degree=4, seed=0, max_weight=20):
+    """Undirected weighted edge list on n vertices: a random spanning tree plus random extra edges."""
+    rng = random.Random(seed)
+    edges = {}
+    for v in range(1, n):
+        edges[(rng.randrange(v), v)] = rng.randint(1, max_weight)
+    for _ in range(max(0, n * avg_degree // 2 - (n - 1))):
+        u, v = rng.randrange(n), rng.randrange(n)
+        if u != v: edges[(min(u, v), max(u, v))] = rng.randint(1, max_weight)
+    return [(u, v, w) for (u, v), w in edges.items()]
+
+def random_graph(n, avg_degree=4, seed=0, sparse=False):
+    """Symmetric adjacency matrix as a nested list, or a SparseMatrix when sparse=True"""
+    edges = random_edges(n, avg_degree, seed)
+    if sparse:
+        u, v, w = np.array(edges, dtype=np.int64).reshape(-1, 3).T
+        return SparseMatrix.from_coo(np.r_[u, v], np.r_[v, u], np.r_[w, w], (n, n))
+    adj = [[0] * n for _ in range(n)]
+    for u, v, w in edges:
+        adj[u][v] = adj[v][u] = w
+    return adj
+
+def reference_matmul(a, b):
+    """The original triple-loop Matrix.__mul__, kept as the correctness and speed baseline"""
+    other_t = [list(col) for col in zip(*b)]
+    res = []
+    for i in range(len(a)):
+        row = []
+        for j in range(len(other_t)):
+            e = 0
+            for k in range(len(a[0])):
+                e += a[i][k] * other_t[j][k]
+            row.append(e)
+        res.append(row)
+    return res
+
+# ==========================================
+# CASES
+# ==========================================
+# name -> (setup(n, seed) -> zero-argument callable, largest size worth trying)
+def _mul_case(kind):
+    def setup(n, seed):
+        a, b = random_matrix(n, seed=seed, kind=kind), random_matrix(n, seed=seed + 1, kind=kind)
+        ma, mb = Matrix(a), Matrix(b)
+        if n <= 100: # correctness against the original implementation
+            got, want = (ma * mb).data, reference_matmul(a, b)
+            if not np.allclose(got, want): raise AssertionError(f"matrix_mul mismatch at n={n}")
+        return lambda: ma * mb
+    return setup
+
+def _graph_case(method, args=lambda n: (), sparse=False):
+    def setup(n, seed):
+        fn, call_args = getattr(GraphAlgo(random_graph(n, seed=seed, sparse=sparse)), method), args(n)
+        return lambda: fn(*call_args)
+    return setup
+
+def _reference_case(n, seed):
+    a = random_matrix(n, seed=seed)
+    return lambda: reference_matmul(a, a)
+
+CASES = {
+    "matrix_mul": (_mul_case("int"), 1000),
+    "matrix_mul_float": (_mul_case("float"), 3162),
+    "matrix_mul_reference": (_reference_case, 316),
+    "matrix_det": (lambda n, seed: Matrix(random_matrix(n, seed=seed, kind="float")).det, 3162),
+    "matrix_rref_exact": (lambda n, seed: Matrix(random_matrix(n, seed=seed)).rref, 316),
+    "connectness": (_graph_case("connectness"), 3162),
+    "connectness_sparse": (_graph_case("connectness", sparse=True), 100000),
+    "connect_components": (_graph_case("connect_components"), 3162),
+    "find_shortest_path_weight": (_graph_case("find_shortest_path_weight", lambda n: (0, n - 1)), 3162),
+    "find_shortest_path_weight_sparse": (
+        _graph_case("find_shortest_path_weight", lambda n: (0, n - 1), sparse=True), 100000),
+    "dijkstra_tree_sparse": (lambda n, seed: lambda core=GraphAlgo(random_graph(n, seed=seed, sparse=True)).core: dijkstra_tree(core, 0), 100000),
+    "all_pairs_shortest_paths": (_graph_case("all_pairs_shortest_paths"), 1000),
+    "mst_prim": (_graph_case("mst_prim"), 3162),
+    "mst_prim_sparse": (_graph_case("mst_prim", sparse=True), 100000),
+    "mst_kruskal": (_graph_case("mst_kruskal"), 3162),
+    "mst_kruskal_sparse": (_graph_case("mst_kruskal", sparse=True), 100000),
+    "mst_boruvka_sparse": (_graph_case("minimum_spanning_forest", lambda n: ("boruvka",), sparse=True), 100000),
+    # n = plot width in pixels
+    "adaptive_sample_tan": (lambda n, seed: lambda f=compile_expression("np.tan(x)"): adaptive_sample(f, -10, 10, n), 31623),
+}
+
+# ==========================================
+# MEASUREMENT
+# ==========================================
+def time_call(fn, min_time=0.2, repeat=3):
+    """Best seconds per call over `repeat` rounds, each looping until it lasts min_time"""
+    start = time.perf_counter()
+    fn()
+    first = time.perf_counter() - start
+    number = max(1, int(min_time / first)) if first > 0 else 1000
+    best = first
+    for _ in range(repeat if first < min_time else 0):
+        start = time.perf_counter()
+        for _ in range(number): fn()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+def peak_memory(fn):
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def fit_exponent(sizes, seconds, floor=1e-4):
+    """Least-squares slope of log(t) against log(n), ignoring timings too small to trust"""
+    pts = [(math.log(n), math.log(t)) for n, t in zip(sizes, seconds) if t >= floor]
+    if len(pts) < 2: return None
+    xs, ys = zip(*pts)
+    return round(float(np.polyfit(xs, ys, 1)[0]), 3)
+
+def run_case(name, max_size=None, budget=2.0, seed=0, log=print):
+    setup, cap = CASES[name]
+    cap = min(cap, max_size) if max_size else cap
+    res = {"sizes": [], "seconds": [], "peak_bytes": []}
+    for n in SIZES:
+        if n > cap: break
+        fn = setup(n, seed)
+        secs = time_call(fn)
+        res["sizes"].append(n)
+        res["seconds"].append(secs)
+        res["peak_bytes"].append(peak_memory(fn) if secs < budget else None)
+        log(f"  {name:34s} n={n:<7d} {secs * 1e3:12.3f} ms")
+        if secs > budget: break
+    res["exponent"] = fit_exponent(res["sizes"], res["seconds"])
+    return res
+
+def _git_commit():
+    try: return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except Exception: return None
+
+def run_all(names, max_size=None, budget=2.0, seed=0, log=print):
+    return {
+        "meta": {"commit": _git_commit(), "seed": seed, "budget": budget, "timestamp": time.time(),
+                 "python": platform.python_version(), "numpy": np.__version__, "platform": platform.platform()},
+        "results": {name: run_case(name, max_size, budget, seed, log) for name in names},
+    }
+
+def compare(current, baseline, threshold=1.25):
+    """(case, n, ratio) for every size that got slower than threshold x the baseline"""
+    regressions = []
+    for name, res in current["results"].items():
+        old = baseline.get("results", {}).get(name)
+        if not old: continue
+        old_times = dict(zip(old["sizes"], old["seconds"]))
+        for n, secs in zip(res["sizes"], res["seconds"]):
+            if n in old_times and old_times[n] > 0 and secs / old_times[n] > threshold:
+                regressions.append((name, n, secs / old_times[n]))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cases", default=",".join(CASES), help="comma-separated case names")
+    parser.add_argument("--max-size", type=int, default=None)
+    parser.add_argument("--budget", type=float, default=2.0, help="stop growing a case past this many seconds per call")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="bench_results.json")
+    parser.add_argument("--compare", default=None, help="baseline JSON to check for regressions")
+    parser.add_argument("--threshold", type=float, default=1.25)
+    args = parser.parse_args(argv)
+
+    names = [c.strip() for c in args.cases.split(",") if c.strip()]
+    unknown = [c for c in names if c not in CASES]
+    if unknown: parser.error(f"unknown cases: {', '.join(unknown)}")
+
+    report = run_all(names, args.max_size, args.budget, args.seed)
+    for name, res in report["results"].items():
+        print(f"{name:36s} exponent ~ {res['exponent']}")
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Saved {args.out}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        for name, n, ratio in regressions:
+            print(f"REGRESSION {name} n={n}: {ratio:.2f}x slower")
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
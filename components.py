@@ -1,5 +1,9 @@
 # components.py
+import multiprocessing
+import queue
+import threading
 from PyQt6.QtWidgets import QWidget, QVBoxLayout
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
 import matplotlib
 matplotlib.use('QtAgg')
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg, NavigationToolbar2QT
@@ -28,4 +32,136 @@ class PlotWidget(QWidget):
         return self.canvas.axes
     
     def draw(self):
-        self.canvas.draw()
\ No newline at end of file
+        self.canvas.draw()
+
+    def draw_idle(self):
+        self.canvas.draw_idle()
+
+# --- Background tasks ---
+
+class TaskCancelled(Exception):
+    pass
+
+class CancelToken:
+    """Cooperative cancellation flag handed to task functions (works across processes in process mode)"""
+    def __init__(self, event=None):
+        self._event = event or threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def check(self):
+        if self._event.is_set(): raise TaskCancelled()
+
+class WorkerSignals(QObject):
+    progress = pyqtSignal(int, str) # percent (-1 = unknown), message
+    result = pyqtSignal(object)
+    error = pyqtSignal(str)
+    cancelled = pyqtSignal()
+    finished = pyqtSignal()         # always last, after result / error / cancelled
+
+def _process_entry(channel, fn, args, kwargs, event, cooperative):
+    """Runs in the child process; every message goes back through channel"""
+    try:
+        if cooperative:
+            kwargs = dict(kwargs, token=CancelToken(event),
+                          progress=lambda pct, msg="": channel.put(("progress", pct, msg)))
+        channel.put(("result", fn(*args, **kwargs)))
+    except TaskCancelled:
+        channel.put(("cancelled",))
+    except Exception as e:
+        channel.put(("error", f"{type(e).__name__}: {e}"))
+
+class Task(QRunnable):
+    """
+    Runs fn(*args, **kwargs) off the GUI thread and reports through self.signals.
+    cooperative=True also passes token= (CancelToken) and progress=(percent, message) to fn.
+    process=True runs fn in a separate process so CPU-bound work neither holds the GIL
+    nor survives cancel(), which terminates it; fn and its arguments must then be picklable.
+    """
+    POLL_S = 0.05
+
+    def __init__(self, fn, *args, process=False, cooperative=False, **kwargs):
+        super().__init__()
+        self.fn, self.args, self.kwargs = fn, args, kwargs
+        self.process, self.cooperative = process, cooperative
+        self.signals = WorkerSignals()
+        self._ctx = multiprocessing.get_context("spawn") if process else None
+        self.token = CancelToken(self._ctx.Event() if process else None)
+
+    def cancel(self):
+        self.token.cancel()
+
+    def run(self):
+        try:
+            if self.process: self._run_process()
+            else: self._run_thread()
+        except TaskCancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            self.signals.error.emit(f"{type(e).__name__}: {e}")
+        finally:
+            self.signals.finished.emit()
+
+    def _run_thread(self):
+        kwargs = self.kwargs
+        if self.cooperative:
+            kwargs = dict(kwargs, token=self.token, progress=lambda pct, msg="": self.signals.progress.emit(int(pct), msg))
+        res = self.fn(*self.args, **kwargs)
+        self.token.check() # finished after cancel(): drop the stale result
+        self.signals.result.emit(res)
+
+    def _run_process(self):
+        channel = self._ctx.Queue()
+        proc = self._ctx.Process(target=_process_entry, daemon=True,
+                                 args=(channel, self.fn, self.args, self.kwargs, self.token._event, self.cooperative))
+        proc.start()
+        try:
+            while True:
+                if self.token.cancelled:
+                    proc.terminate()
+                    raise TaskCancelled()
+                try: msg = channel.get(timeout=self.POLL_S)
+                except queue.Empty:
+                    if not proc.is_alive() and channel.empty(): raise RuntimeError("worker process exited unexpectedly")
+                    continue
+                if msg[0] == "progress": self.signals.progress.emit(int(msg[1]), msg[2])
+                elif msg[0] == "result":
+                    self.token.check()
+                    self.signals.result.emit(msg[1])
+                    return
+                elif msg[0] == "cancelled": raise TaskCancelled()
+                else: raise RuntimeError(msg[1])
+        finally:
+            proc.join(1)
+            if proc.is_alive(): proc.terminate()
+            channel.close()
+
+class TaskRunner(QObject):
+    """Submits Tasks to a QThreadPool and keeps them alive until they finish; shared by the tabs"""
+    def __init__(self, parent=None, pool=None):
+        super().__init__(parent)
+        self.pool = pool or QThreadPool.globalInstance()
+        self.tasks = set()
+
+    def submit(self, fn, *args, on_result=None, on_error=None, on_progress=None, on_cancelled=None,
+               on_finished=None, process=False, cooperative=False, **kwargs):
+        task = Task(fn, *args, process=process, cooperative=cooperative, **kwargs)
+        sig = task.signals
+        for signal, slot in ((sig.result, on_result), (sig.error, on_error), (sig.progress, on_progress),
+                             (sig.cancelled, on_cancelled), (sig.finished, on_finished)):
+            if slot: signal.connect(slot)
+        sig.finished.connect(lambda: self.tasks.discard(task))
+        self.tasks.add(task)
+        self.pool.start(task)
+        return task
+
+    def busy(self):
+        return bool(self.tasks)
+
+    def cancel_all(self):
+        for task in list(self.tasks): task.cancel()
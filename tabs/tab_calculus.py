@@ -1,8 +1,12 @@
 # tabs/tab_calculus.py
-import numpy as np
+import math
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
-                             QLineEdit, QLabel, QScrollArea, QFrame)
+                             QLineEdit, QLabel, QScrollArea, QFrame, QCheckBox)
+from PyQt6.QtCore import QTimer
 from components import PlotWidget
+from backend import compile_expression, ExpressionError, TileCache
+
+RESAMPLE_MS = 60 # quiet time after the last zoom/pan step before curves are re-evaluated
 
 class FunctionItem(QFrame):
     """Represents a single function input row."""
@@ -56,12 +60,19 @@ class CalculusTab(QWidget):
         btn_plot = QPushButton("Plot All")
         btn_plot.setObjectName("PrimaryBtn")
         btn_plot.clicked.connect(self.plot)
+        self.chk_live = QCheckBox("Re-sample on zoom/pan")
+        self.chk_live.setChecked(True)
         
         ctrl_layout.addWidget(QLabel("<b>Functions:</b>"))
         ctrl_layout.addWidget(scroll)
         ctrl_layout.addWidget(btn_add)
         ctrl_layout.addLayout(range_layout)
+        ctrl_layout.addWidget(self.chk_live)
         ctrl_layout.addWidget(btn_plot)
+        self.lbl_status = QLabel()
+        self.lbl_status.setWordWrap(True)
+        self.lbl_status.setStyleSheet("color: #c0392b;")
+        ctrl_layout.addWidget(self.lbl_status)
         
         # --- Right: Plot ---
         self.plotter = PlotWidget()
@@ -70,6 +81,12 @@ class CalculusTab(QWidget):
         layout.addWidget(self.plotter, 3)
         
         self.funcs = []
+        self.curves = [] # (Line2D, compiled expression, source text) of the current plot
+        self.tiles = TileCache()
+        self.resample_timer = QTimer(self)
+        self.resample_timer.setSingleShot(True)
+        self.resample_timer.setInterval(RESAMPLE_MS)
+        self.resample_timer.timeout.connect(self.resample)
         self.add_func() # Add initial input
 
     def add_func(self):
@@ -84,7 +101,8 @@ class CalculusTab(QWidget):
 
     def plot(self):
         ax = self.plotter.get_axes()
-        ax.clear()
+        ax.clear() # also drops the previous plot's xlim_changed callback
+        self.curves = []
         ax.grid(True, linestyle='--', alpha=0.3)
         ax.axhline(0, color='black', alpha=0.3)
         ax.axvline(0, color='black', alpha=0.3)
@@ -92,19 +110,44 @@ class CalculusTab(QWidget):
         try:
             x_min = float(self.xmin.text())
             x_max = float(self.xmax.text())
-            x = np.linspace(x_min, x_max, 500)
-            
-            for i, item in enumerate(self.funcs):
-                txt = item.input.text()
-                if not txt.strip(): continue
-                try:
-                    # Allow math/numpy functions
-                    y = eval(txt, {"x": x, "np": np, "abs": abs})
-                    ax.plot(x, y, label=f"f{i+1}: {txt}")
-                except Exception as e:
-                    print(f"Plot error: {e}")
-            
-            ax.legend()
-            self.plotter.draw()
+            if not (math.isfinite(x_min) and math.isfinite(x_max) and x_min < x_max): raise ValueError
         except ValueError:
-            pass
\ No newline at end of file
+            self.lbl_status.setText("Invalid X range")
+            self.plotter.draw()
+            return
+        
+        # Pinning the range means no autoscale xlim_changed, and the curves come from the same tiles
+        # a later zoom/pan (or Home) asks for, so each function is evaluated once per plot.
+        ax.set_xlim(x_min, x_max)
+        pixels = max(200, int(ax.bbox.width))
+        errors = []
+        for i, item in enumerate(self.funcs):
+            txt = item.input.text()
+            if not txt.strip(): continue
+            try:
+                # Parsed and validated once per distinct text, then reused from the cache
+                f = compile_expression(txt)
+                x, y = self.tiles.sample(txt, f, x_min, x_max, pixels)
+                line, = ax.plot(x, y, label=f"f{i+1}: {txt}")
+                self.curves.append((line, f, txt))
+            except ExpressionError as e: # one bad function never hides the others
+                errors.append(f"f{i+1}: {e}")
+        
+        self.lbl_status.setText("\n".join(errors))
+        if ax.get_legend_handles_labels()[0]: ax.legend()
+        ax.callbacks.connect('xlim_changed', self.view_changed)
+        self.plotter.draw()
+
+    def view_changed(self, ax):
+        """xlim_changed: restart the debounce timer so a drag re-samples once it pauses"""
+        if self.chk_live.isChecked() and self.curves: self.resample_timer.start()
+
+    def resample(self):
+        """Re-evaluate every curve over the visible x range at screen resolution, reusing cached tiles"""
+        ax = self.plotter.get_axes()
+        x_min, x_max = ax.get_xlim()
+        pixels = max(200, int(ax.bbox.width))
+        for line, f, txt in self.curves:
+            try: line.set_data(*self.tiles.sample(txt, f, x_min, x_max, pixels))
+            except ExpressionError: continue
+        self.plotter.draw_idle()
\ No newline at end of file
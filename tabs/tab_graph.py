@@ -1,33 +1,52 @@
 # tabs/tab_graph.py
 import math
+import time
+import numpy as np
+from collections import deque
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
                              QGraphicsScene, QGraphicsView, QGraphicsItem, 
-                             QGraphicsEllipseItem, QGraphicsLineItem, 
+                             QGraphicsEllipseItem, QGraphicsLineItem, QGraphicsPathItem,
                              QInputDialog, QButtonGroup, QRadioButton,
                              QTextEdit, QSplitter, QLabel, QCheckBox, 
-                             QMessageBox, QSpinBox, QGroupBox)
-from PyQt6.QtCore import Qt, QPointF, QLineF, QRectF
-from PyQt6.QtGui import QPen, QBrush, QColor, QPainter, QFont
-from backend import GraphAlgo
+                             QMessageBox, QSpinBox, QGroupBox, QProgressBar, QFileDialog)
+from PyQt6.QtCore import Qt, QPointF, QLineF, QRectF, QTimer, pyqtSignal
+from PyQt6.QtGui import QPen, QBrush, QColor, QPainter, QFont, QTransform, QPolygonF, QPainterPath
+from backend import GraphModel, ForceLayout, load_edge_list
+from components import TaskRunner
+
+def load_graph_file(path, directed, token, progress):
+    """Background loader: streams the file, reporting percent of bytes read"""
+    def report(done, total):
+        token.check()
+        progress(100 * done // max(total, 1), "Loading")
+    return load_edge_list(path, directed=directed, progress=report)
 
 # --- Visual Components ---
+# Below these zoom factors labels / arrows are not painted and edges are drawn as one batched path.
+LABEL_LOD = 0.6
+DETAIL_ZOOM = 0.35
+FRAME_MS = 16 # edge geometry is flushed at most once per frame (~60 fps)
+PROCESS_MIN_EDGES = 20000 # from this size algorithms run in a separate (terminable) process
 
 class NodeItem(QGraphicsEllipseItem):
+    default_brush = QBrush(QColor("#3b82f6")) # Blue
+    highlight_brush = QBrush(QColor("#ef4444")) # Red (Path)
+    select_brush = QBrush(QColor("#f59e0b")) # Orange (Selection)
+    _font = None # built on first paint (needs the QApplication)
+
     def __init__(self, x, y, id, radius=20):
         super().__init__(-radius, -radius, radius*2, radius*2)
         self.setPos(x, y)
         self.id = id
         self.radius = radius
-        
-        self.default_brush = QBrush(QColor("#3b82f6")) # Blue
-        self.highlight_brush = QBrush(QColor("#ef4444")) # Red (Path)
-        self.select_brush = QBrush(QColor("#f59e0b")) # Orange (Selection)
+        self.label = str(id)
         
         self.setBrush(self.default_brush)
         self.setPen(QPen(Qt.GlobalColor.white, 2))
         self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsMovable)
         self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable)
         self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemSendsGeometryChanges)
+        self.setCacheMode(QGraphicsItem.CacheMode.DeviceCoordinateCache)
         self.edges = []
 
     def reset_color(self):
@@ -39,55 +58,61 @@ class NodeItem(QGraphicsEllipseItem):
         self.update()
 
     def itemChange(self, change, value):
-        if change == QGraphicsItem.GraphicsItemChange.ItemPositionChange:
-            for edge in self.edges: edge.adjust()
+        if change == QGraphicsItem.GraphicsItemChange.ItemPositionHasChanged and self.scene():
+            self.scene().node_moved(self) # edges are re-laid out once per frame, not per event
         return super().itemChange(change, value)
 
     def paint(self, painter, option, widget):
         super().paint(painter, option, widget)
+        if option.levelOfDetailFromTransform(painter.worldTransform()) < LABEL_LOD: return
+        if NodeItem._font is None: NodeItem._font = QFont("Arial", 10, QFont.Weight.Bold)
         painter.setPen(Qt.GlobalColor.white)
-        painter.setFont(QFont("Arial", 10, QFont.Weight.Bold))
-        painter.drawText(self.boundingRect(), Qt.AlignmentFlag.AlignCenter, str(self.id))
+        painter.setFont(NodeItem._font)
+        painter.drawText(self.boundingRect(), Qt.AlignmentFlag.AlignCenter, self.label)
 
 class EdgeItem(QGraphicsLineItem):
+    default_pen = QPen(QColor("#9ca3af"), 2)
+    highlight_pen = QPen(QColor("#ef4444"), 4) # Red for path
+    mst_pen = QPen(QColor("#10b981"), 4)       # Green for MST
+    label_pen = QPen(QColor("#1f2937"))
+    label_brush = QBrush(QColor("#ffffff"))
+
     def __init__(self, start_node, end_node, weight=1, is_directed=False):
         super().__init__()
         self.start_node = start_node
         self.end_node = end_node
-        self.weight = weight
         self.is_directed = is_directed
-        
-        self.default_pen = QPen(QColor("#9ca3af"), 2)
-        self.highlight_pen = QPen(QColor("#ef4444"), 4) # Red for path
-        self.mst_pen = QPen(QColor("#10b981"), 4)       # Green for MST
+        self.highlighted = False
+        self.set_weight(weight)
         
         self.setPen(self.default_pen)
         self.setZValue(-1)
+        self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable)
         self.adjust()
 
+    def set_weight(self, weight):
+        self.weight = weight
+        self.label = str(weight)
+        self.update()
+
     def reset_color(self):
+        self.highlighted = False
         self.setPen(self.default_pen)
 
     def highlight(self, type="path"):
+        self.highlighted = True
         if type == "path": self.setPen(self.highlight_pen)
         elif type == "mst": self.setPen(self.mst_pen)
 
     def adjust(self):
+        """Recompute the line, label box and arrow head; paint() only draws them"""
+        self.prepareGeometryChange()
         line = QLineF(self.start_node.scenePos(), self.end_node.scenePos())
         self.setLine(line)
-
-    def paint(self, painter, option, widget):
-        super().paint(painter, option, widget)
-        # Weight Label
-        mid = self.line().center()
-        painter.setPen(QColor("#1f2937"))
-        painter.setBrush(QColor("#ffffff"))
-        painter.drawRect(QRectF(mid.x()-10, mid.y()-10, 20, 20))
-        painter.drawText(QRectF(mid.x()-10, mid.y()-10, 20, 20), 
-                         Qt.AlignmentFlag.AlignCenter, str(self.weight))
-        
+        mid = line.center()
+        self.label_rect = QRectF(mid.x()-10, mid.y()-10, 20, 20)
+        self.arrow = None
         if self.is_directed:
-            line = self.line()
             angle = math.atan2(-line.dy(), line.dx())
             node_radius = 20
             dest_p = line.p2()
@@ -98,27 +123,102 @@ class EdgeItem(QGraphicsLineItem):
                          arrow_tip_y + arrow_size * math.cos(angle + math.pi / 3))
             p2 = QPointF(arrow_tip_x + arrow_size * math.sin(angle + math.pi - math.pi / 3),
                          arrow_tip_y + arrow_size * math.cos(angle + math.pi - math.pi / 3))
+            self.arrow = QPolygonF([QPointF(arrow_tip_x, arrow_tip_y), p1, p2])
+        self._bounds = super().boundingRect().united(self.label_rect.adjusted(-1, -1, 1, 1))
+        if self.arrow is not None: self._bounds = self._bounds.united(self.arrow.boundingRect().adjusted(-1, -1, 1, 1))
+
+    def boundingRect(self):
+        return self._bounds
+
+    def paint(self, painter, option, widget):
+        super().paint(painter, option, widget)
+        if option.levelOfDetailFromTransform(painter.worldTransform()) < LABEL_LOD: return
+        # Weight Label
+        painter.setPen(self.label_pen)
+        painter.setBrush(self.label_brush)
+        painter.drawRect(self.label_rect)
+        painter.drawText(self.label_rect, Qt.AlignmentFlag.AlignCenter, self.label)
+        
+        if self.arrow is not None:
             painter.setBrush(self.pen().color()) # Match edge color
-            painter.drawPolygon([QPointF(arrow_tip_x, arrow_tip_y), p1, p2])
+            painter.drawPolygon(self.arrow)
+
+class GraphView(QGraphicsView):
+    """Wheel zoom around the cursor; switches the scene between detailed and batched drawing"""
+    def __init__(self, scene, parent=None):
+        super().__init__(scene, parent)
+        self.setRenderHint(QPainter.RenderHint.Antialiasing)
+        self.setTransformationAnchor(QGraphicsView.ViewportAnchor.AnchorUnderMouse)
+        self.setViewportUpdateMode(QGraphicsView.ViewportUpdateMode.SmartViewportUpdate)
+        self.setOptimizationFlag(QGraphicsView.OptimizationFlag.DontSavePainterState)
+        self.setDragMode(QGraphicsView.DragMode.ScrollHandDrag) # drag empty canvas to pan
+
+    def zoom(self):
+        return self.transform().m11()
+
+    def wheelEvent(self, event):
+        factor = 1.15 ** (event.angleDelta().y() / 120)
+        if not 0.02 < self.zoom() * factor < 20: return
+        self.scale(factor, factor)
+        self.update_detail()
+
+    def update_detail(self):
+        detailed = self.zoom() >= DETAIL_ZOOM
+        self.setRenderHint(QPainter.RenderHint.Antialiasing, detailed)
+        self.scene().set_detail(detailed)
+
+    def fit_all(self):
+        """Zoom to show every item (never magnifying past 1:1)"""
+        rect = self.scene().itemsBoundingRect()
+        if rect.isEmpty(): return
+        self.fitInView(rect.adjusted(-40, -40, 40, 40), Qt.AspectRatioMode.KeepAspectRatio)
+        if self.zoom() > 1: self.resetTransform()
+        self.centerOn(rect.center())
+        self.update_detail()
 
 # --- Logic & Layout ---
 
 class GraphScene(QGraphicsScene):
+    graph_changed = pyqtSignal() # emitted after every structural edit
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.mode = "move"
         self.node_counter = 0
         self.is_directed = False
         self.temp_source_node = None
+        self.model = GraphModel()
+        self.node_items = {} # node id -> NodeItem
+        self.edge_items = {} # model edge key (u_id, v_id) -> EdgeItem
+        self.detailed = True
+        self.batch_item = None # all edges as one path while zoomed out
+        # per-frame scheduler: moved nodes mark their edges dirty, one timer tick re-lays them all out
+        self._dirty_edges = set()
+        self._batch_dirty = False
+        self._bulk_move = False
+        self._frame_timer = QTimer(self)
+        self._frame_timer.setSingleShot(True)
+        self._frame_timer.setInterval(FRAME_MS)
+        self._frame_timer.timeout.connect(self.flush_frame)
+        self.frame_times = deque(maxlen=240) # (ms spent, edges updated) per flushed frame
+        self.setBspTreeDepth(10) # fixed: automatic depth tuning rebuilds the whole index while edges move
+        self.graph_changed.connect(self.mark_batch_dirty)
+
+    def suspend_index(self):
+        """Bulk loads run without the BSP index: inserting, then re-placing, thousands of fresh items degrades it"""
+        self.setItemIndexMethod(QGraphicsScene.ItemIndexMethod.NoIndex)
+
+    def restore_index(self):
+        if self.itemIndexMethod() == QGraphicsScene.ItemIndexMethod.BspTreeIndex: return
+        self.setItemIndexMethod(QGraphicsScene.ItemIndexMethod.BspTreeIndex)
+        self.setBspTreeDepth(10)
 
     def mousePressEvent(self, event):
         pos = event.scenePos()
         if self.mode == "node":
-            node = NodeItem(pos.x(), pos.y(), self.node_counter)
-            self.addItem(node)
-            self.node_counter += 1
+            self.add_node(pos.x(), pos.y())
         elif self.mode == "edge":
-            item = self.itemAt(pos, QGraphicsView().transform())
+            item = self.itemAt(pos, QTransform())
             if isinstance(item, NodeItem):
                 if self.temp_source_node is None:
                     self.temp_source_node = item
@@ -134,13 +234,223 @@ class GraphScene(QGraphicsScene):
                     self.temp_source_node = None
         super().mousePressEvent(event)
 
+    def keyPressEvent(self, event):
+        if event.key() in (Qt.Key.Key_Delete, Qt.Key.Key_Backspace) and self.selectedItems():
+            self.delete_selected()
+            return
+        step = {Qt.Key.Key_Left: (-10, 0), Qt.Key.Key_Right: (10, 0), Qt.Key.Key_Up: (0, -10), Qt.Key.Key_Down: (0, 10)}
+        nodes = [item for item in self.selectedItems() if isinstance(item, NodeItem)]
+        if event.key() in step and nodes:
+            self.move_nodes(nodes, *step[event.key()])
+            return
+        super().keyPressEvent(event)
+
+    # --- Editing (keeps self.model in step with the items) ---
+    def add_node(self, x, y):
+        node = NodeItem(x, y, self.node_counter)
+        self.addItem(node)
+        self.node_items[node.id] = node
+        self.model.add_node(node.id)
+        self.node_counter += 1
+        self.graph_changed.emit()
+        return node
+
     def create_edge(self, u, v):
-        weight, ok = QInputDialog.getInt(None, "Edge Weight", "Enter weight:", 1)
-        if ok:
-            edge = EdgeItem(u, v, weight, self.is_directed)
-            self.addItem(edge)
-            u.edges.append(edge)
-            v.edges.append(edge)
+        key = self.model.edge_key(u.id, v.id)
+        current = self.model.edges[key] if key else 1
+        weight, ok = QInputDialog.getInt(None, "Edge Weight", "Enter weight:", current)
+        if ok: self.add_edge(u, v, weight)
+
+    def add_edge(self, u, v, weight=1):
+        """Adds u -> v, or re-weights it when the model already has that edge"""
+        key, created = self.model.add_edge(u.id, v.id, weight)
+        if not created: # re-weight the existing edge instead of stacking a duplicate
+            self.edge_items[key].set_weight(weight)
+            self.graph_changed.emit()
+            return
+        edge = EdgeItem(u, v, weight, self.is_directed)
+        edge.setVisible(self.detailed)
+        self.addItem(edge)
+        self.edge_items[key] = edge
+        u.edges.append(edge)
+        v.edges.append(edge)
+        self.graph_changed.emit()
+
+    def remove_edge(self, edge):
+        key = (edge.start_node.id, edge.end_node.id)
+        if self.edge_items.get(key) is not edge: return
+        self.model.remove_edge(*key)
+        del self.edge_items[key]
+        self._dirty_edges.discard(edge)
+        edge.start_node.edges.remove(edge)
+        edge.end_node.edges.remove(edge)
+        self.removeItem(edge)
+        self.graph_changed.emit()
+
+    def remove_node(self, node):
+        if self.temp_source_node is node: self.temp_source_node = None
+        for edge in list(node.edges): self.remove_edge(edge)
+        self.model.remove_node(node.id)
+        del self.node_items[node.id]
+        self.removeItem(node)
+        self.graph_changed.emit()
+
+    def delete_selected(self):
+        items = self.selectedItems()
+        for item in items:
+            if isinstance(item, EdgeItem): self.remove_edge(item)
+        for item in items:
+            if isinstance(item, NodeItem): self.remove_node(item)
+
+    def set_directed(self, directed):
+        self.is_directed = directed
+        self.model.set_directed(directed)
+
+    def clear_graph(self):
+        self.clear()
+        self._dirty_edges.clear()
+        self.batch_item = None
+        self.node_items.clear()
+        self.edge_items.clear()
+        self.model.clear()
+        self.temp_source_node = None
+        self.node_counter = 0
+        detailed, self.detailed = self.detailed, True # clear() deleted the batch path: rebuild it when zoomed out
+        self.set_detail(detailed)
+        self.graph_changed.emit()
+
+    # --- Level of detail ---
+    def set_detail(self, detailed):
+        """Detailed: every EdgeItem paints itself. Otherwise only highlighted edges do, over one batched path."""
+        if detailed == self.detailed: return
+        self.detailed = detailed
+        for edge in self.edge_items.values(): edge.setVisible(detailed or edge.highlighted)
+        if detailed:
+            if self.batch_item: self.batch_item.setVisible(False)
+        else:
+            if self.batch_item is None:
+                self.batch_item = QGraphicsPathItem()
+                self.batch_item.setPen(EdgeItem.default_pen)
+                self.batch_item.setZValue(-2)
+                self.addItem(self.batch_item)
+            self.rebuild_batch()
+            self.batch_item.setVisible(True)
+
+    # --- Per-frame geometry updates ---
+    def node_moved(self, node):
+        if self._bulk_move: return
+        self._dirty_edges.update(node.edges)
+        self.schedule_frame()
+
+    def mark_batch_dirty(self):
+        if self.detailed: return
+        self._batch_dirty = True
+        self.schedule_frame()
+
+    def schedule_frame(self):
+        if not self._frame_timer.isActive(): self._frame_timer.start()
+
+    def move_nodes(self, nodes, dx, dy):
+        """Move many nodes, then re-lay out the union of their edges in a single pass"""
+        self._bulk_move = True
+        try:
+            for node in nodes: node.moveBy(dx, dy)
+        finally:
+            self._bulk_move = False
+        for node in nodes: self._dirty_edges.update(node.edges)
+        self.flush_frame()
+
+    def set_positions(self, ids, pos):
+        """Place nodes (by id) at rows of an (n, 2) array in one pass; ids no longer present are skipped"""
+        nodes = []
+        self._bulk_move = True
+        try:
+            for node_id, (x, y) in zip(ids, pos.tolist()):
+                node = self.node_items.get(node_id)
+                if node is None: continue
+                node.setPos(x, y)
+                nodes.append(node)
+        finally:
+            self._bulk_move = False
+        for node in nodes: self._dirty_edges.update(node.edges)
+        self.flush_frame()
+        self.restore_index() # the first placement after a bulk load is done; index the final geometry once
+
+    def positions(self):
+        """(ids, (n, 2) array) of the current node positions in matrix order"""
+        ids = list(self.model.ids)
+        return ids, np.array([[self.node_items[i].x(), self.node_items[i].y()] for i in ids], dtype=float).reshape(-1, 2)
+
+    def load_core(self, core, labels=None):
+        """Replace the canvas with a GraphCore (node i gets id i), placed at ForceLayout's random starting positions"""
+        self.clear_graph()
+        # Items stacked at one point pile into a single BSP leaf and every later move scans it (quadratic),
+        # so nodes are created already spread out, exactly where a layout of this core would start,
+        # and the index stays off until the first set_positions.
+        self.suspend_index()
+        pos = ForceLayout.from_core(core).pos.tolist()
+        nodes = [self.add_node(x, y) for x, y in pos]
+        if labels is not None:
+            for node, label in zip(nodes, labels.tolist()): node.label = str(label)
+        src, dst, w = core.edge_arrays()
+        keep = src != dst
+        if not self.is_directed and core.is_symmetric(): keep &= src < dst # each undirected edge is stored twice
+        for u, v, weight in zip(src[keep].tolist(), dst[keep].tolist(), w[keep].tolist()):
+            self.add_edge(nodes[u], nodes[v], weight)
+        if core.n < 2: self.restore_index() # nothing to lay out
+        return nodes
+
+    def flush_frame(self):
+        self._frame_timer.stop()
+        start = time.perf_counter()
+        dirty, self._dirty_edges = self._dirty_edges, set()
+        for edge in dirty: edge.adjust()
+        if not self.detailed and (dirty or self._batch_dirty): self.rebuild_batch()
+        self._batch_dirty = False
+        if dirty: self.frame_times.append(((time.perf_counter() - start) * 1000, len(dirty)))
+
+    def frame_stats(self):
+        """Summary of recent flushed frames: count, mean / p95 / max ms and mean edges per frame"""
+        if not self.frame_times: return {"frames": 0}
+        ms = sorted(t for t, _ in self.frame_times)
+        return {"frames": len(ms), "mean_ms": sum(ms) / len(ms), "p95_ms": ms[int(0.95 * (len(ms) - 1))],
+                "max_ms": ms[-1], "edges_per_frame": sum(k for _, k in self.frame_times) / len(ms)}
+
+    def rebuild_batch(self):
+        if self.detailed or self.batch_item is None: return
+        path = QPainterPath()
+        for edge in self.edge_items.values():
+            line = edge.line()
+            path.moveTo(line.p1())
+            path.lineTo(line.p2())
+        self.batch_item.setPath(path)
+
+    # --- Highlighting (matrix indices from the model) ---
+    def reset_visuals(self):
+        for node in self.node_items.values(): node.reset_color()
+        for edge in self.edge_items.values():
+            edge.reset_color()
+            edge.setVisible(self.detailed)
+
+    def edge_between(self, i, j):
+        """EdgeItem joining matrix indices i and j, or None"""
+        return self.edge_items.get(self.model.edge_key(self.model.ids[i], self.model.ids[j]))
+
+    def highlight_path(self, path):
+        ids = self.model.ids
+        for i in path: self.node_items[ids[i]].highlight("path")
+        for i, j in zip(path, path[1:]):
+            edge = self.edge_between(i, j)
+            if edge:
+                edge.highlight("path")
+                edge.setVisible(True)
+
+    def highlight_edges(self, pairs, type="mst"):
+        for i, j in pairs:
+            edge = self.edge_between(i, j)
+            if edge:
+                edge.highlight(type)
+                edge.setVisible(True)
 
 class GraphTab(QWidget):
     def __init__(self):
@@ -155,8 +465,9 @@ class GraphTab(QWidget):
         gb_tools = QGroupBox("Drawing Tools")
         vbox_tools = QVBoxLayout()
         self.scene = GraphScene()
-        self.view = QGraphicsView(self.scene)
-        self.view.setRenderHint(QPainter.RenderHint.Antialiasing)
+        self.scene.graph_changed.connect(self.schedule_live_update)
+        self._live_pending = False
+        self.view = GraphView(self.scene)
         
         self.rb_move = QRadioButton("Move / Select"); self.rb_move.setChecked(True)
         self.rb_node = QRadioButton("Add Node")
@@ -171,10 +482,18 @@ class GraphTab(QWidget):
         btn_clear = QPushButton("Clear Canvas")
         btn_clear.clicked.connect(self.clear_all)
         
+        btn_import = QPushButton("Import Edge List...")
+        btn_import.clicked.connect(self.import_graph)
+        
+        btn_layout = QPushButton("Auto Layout")
+        btn_layout.clicked.connect(self.run_layout)
+        
         vbox_tools.addWidget(self.rb_move)
         vbox_tools.addWidget(self.rb_node)
         vbox_tools.addWidget(self.rb_edge)
         vbox_tools.addWidget(self.chk_directed)
+        vbox_tools.addWidget(btn_import)
+        vbox_tools.addWidget(btn_layout)
         vbox_tools.addWidget(btn_clear)
         gb_tools.setLayout(vbox_tools)
         
@@ -204,12 +523,26 @@ class GraphTab(QWidget):
         btn_mat = QPushButton("Show Adj Matrix")
         btn_mat.clicked.connect(self.show_matrix)
         
+        self.lbl_live = QLabel()
+        self.lbl_live.setWordWrap(True)
+        self.update_live_stats()
+        
+        vbox_algo.addWidget(self.lbl_live)
         vbox_algo.addLayout(hbox_path)
         vbox_algo.addWidget(btn_path)
         vbox_algo.addWidget(btn_mst)
         vbox_algo.addWidget(btn_conn)
         vbox_algo.addWidget(btn_bip)
         vbox_algo.addWidget(btn_mat)
+        
+        # Background runs: busy bar + cancel
+        self.runner = TaskRunner(self)
+        self.task = None
+        self.progress = QProgressBar(); self.progress.setRange(0, 0); self.progress.hide()
+        self.btn_cancel = QPushButton("Cancel"); self.btn_cancel.hide()
+        self.btn_cancel.clicked.connect(self.cancel_task)
+        vbox_algo.addWidget(self.progress)
+        vbox_algo.addWidget(self.btn_cancel)
         gb_algo.setLayout(vbox_algo)
         
         ctrl_layout.addWidget(gb_tools)
@@ -237,31 +570,113 @@ class GraphTab(QWidget):
         elif self.rb_edge.isChecked(): self.scene.mode = "edge"
 
     def toggle_directed(self):
-        self.scene.is_directed = self.chk_directed.isChecked()
+        self.scene.set_directed(self.chk_directed.isChecked())
+
+    def schedule_live_update(self):
+        # coalesce bursts of edits (e.g. deleting a node with many edges) into one refresh
+        if self._live_pending: return
+        self._live_pending = True
+        QTimer.singleShot(0, self.update_live_stats)
+
+    def update_live_stats(self):
+        self._live_pending = False
+        model = self.scene.model
+        if not len(model):
+            self.lbl_live.setText("Live: empty graph")
+            return
+        dc = model.connectivity
+        self.lbl_live.setText(f"Live: {len(model)} nodes, {len(model.edges)} edges\n"
+                              f"Components: {dc.component_count} | Bipartite: {'Yes' if dc.is_bipartite else 'No'}")
 
     def clear_all(self):
-        self.scene.clear()
-        self.scene.node_counter = 0
+        self.cancel_task()
+        self.scene.clear_graph()
         self.log.clear()
 
+    # --- Import & Layout ---
+    def import_graph(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Import Edge List", "",
+                                              "Edge lists (*.csv *.tsv *.txt *.edges *.bin);;All files (*)")
+        if not path: return
+        def loaded(res):
+            core, labels = res
+            self.scene.load_core(core, labels)
+            self.log.append(f"Imported {core.n} nodes, {len(self.scene.model.edges)} edges from {path}")
+            self.run_layout()
+        self.start_task("Import", load_graph_file, path, self.scene.is_directed, on_result=loaded,
+                        cooperative=True, check_version=False)
+
+    def run_layout(self):
+        """Force-directed layout in the background; positions are pushed to the canvas every few iterations"""
+        model = self.scene.model
+        if len(model) < 2: return
+        ids, pos = self.scene.positions()
+        layout = ForceLayout(len(ids), *self._edge_indices(), pos=pos)
+        push = lambda *_: self.scene.set_positions(ids, layout.snapshot)
+        def done(_):
+            push()
+            self.view.fit_all()
+        every = 5 if len(ids) <= 2000 else 20 # pushing 10k+ nodes to the canvas costs more than an iteration
+        self.start_task("Layout", layout.run, 200, every, on_result=done, on_progress=push, cooperative=True, check_version=False)
+
+    def _edge_indices(self):
+        model = self.scene.model
+        pairs = [(model.index[u], model.index[v]) for u, v in model.edges]
+        return (np.array([p[0] for p in pairs], dtype=np.int64), np.array([p[1] for p in pairs], dtype=np.int64))
+
     # --- Matrix Extraction ---
     def get_graph_data(self):
-        nodes = [item for item in self.scene.items() if isinstance(item, NodeItem)]
-        nodes.sort(key=lambda x: x.id)
-        if not nodes: return None, None
-        
-        id_map = {node.id: i for i, node in enumerate(nodes)}
-        n = len(nodes)
-        adj = [[0]*n for _ in range(n)]
-        
-        edges = [item for item in self.scene.items() if isinstance(item, EdgeItem)]
-        for edge in edges:
-            if edge.start_node.id in id_map and edge.end_node.id in id_map:
-                u, v = id_map[edge.start_node.id], id_map[edge.end_node.id]
-                adj[u][v] = edge.weight
-                if not self.scene.is_directed:
-                    adj[v][u] = edge.weight
-        return adj, id_map
+        model = self.scene.model
+        if not len(model): return None, None
+        return model.adjacency(), model.index
+
+    # --- Background execution ---
+    def start_task(self, title, fn, *args, on_result, on_progress=None, cooperative=False, check_version=True,
+                   in_process=False):
+        """
+        Run fn(*args) off the GUI thread. With check_version, on_result only gets the value if the graph is unchanged.
+        Cooperative tasks run in a thread (they report progress); others in a process once the graph is large,
+        unless in_process asks for a thread so state fn caches on its object (e.g. shortest-path trees) is kept.
+        """
+        if self.task is not None:
+            self.log.append("Another computation is still running.")
+            return
+        model = self.scene.model
+        version = model.version
+        current = [] # the submitted Task, so late signals from an older task are ignored
+        def deliver(res):
+            self.task_finished(current[0]) # before on_result, which may start a follow-up task
+            if check_version and model.version != version: self.log.append(f"{title}: graph changed while running, result discarded.")
+            else: on_result(res)
+        def progress(pct, msg):
+            self.show_progress(pct, msg)
+            if on_progress: on_progress(pct, msg)
+        self.log.append(f"{title}: running...")
+        self.progress.show(); self.btn_cancel.show()
+        process = not (cooperative or in_process) and len(model.edges) >= PROCESS_MIN_EDGES
+        self.task = self.runner.submit(fn, *args, process=process, cooperative=cooperative,
+                                       on_result=deliver, on_error=lambda e: self.log.append(f"{title} failed: {e}"),
+                                       on_progress=progress,
+                                       on_cancelled=lambda: self.log.append(f"{title}: cancelled."),
+                                       on_finished=lambda: self.task_finished(current[0]))
+        current.append(self.task)
+
+    def show_progress(self, pct, msg):
+        if pct < 0: self.progress.setRange(0, 0)
+        else:
+            self.progress.setRange(0, 100)
+            self.progress.setValue(pct)
+        if msg: self.progress.setFormat(msg)
+
+    def cancel_task(self):
+        if self.task: self.task.cancel()
+
+    def task_finished(self, task):
+        if self.task is not task: return
+        self.task = None
+        self.scene.restore_index() # an import whose layout was cancelled before its first push
+        self.progress.hide(); self.btn_cancel.hide()
+        self.progress.setRange(0, 0)
 
     # --- Algorithm Wrappers ---
 
@@ -272,88 +687,65 @@ class GraphTab(QWidget):
             self.log.append(str(adj))
 
     def reset_visuals(self):
-        for item in self.scene.items():
-            if isinstance(item, NodeItem): item.reset_color()
-            if isinstance(item, EdgeItem): item.reset_color()
+        self.scene.reset_visuals()
 
     def check_connectivity(self):
-        adj, _ = self.get_graph_data()
-        if not adj: return
-        algo = GraphAlgo(adj)
-        is_conn = algo.connectness()
-        comps = algo.connect_components()
-        msg = f"Connected: {is_conn}\nComponents: {comps}"
+        model = self.scene.model
+        if not len(model): return
+        components = model.connectivity.components() # maintained live, no recomputation
+        if not model.directed:
+            self.show_connectivity(f"Connected: {len(components) == 1}\nComponents: {components}")
+            return
+        def done(strong):
+            strong = [[model.ids[i] for i in c] for c in strong]
+            self.show_connectivity(f"Connected: {len(strong) == 1}\nComponents: {components}"
+                                   f"\nWeakly Connected: {len(components) == 1}\nStrong Components: {strong}")
+        self.start_task("Connectivity", model.algo().strong_components, on_result=done)
+
+    def show_connectivity(self, msg):
         QMessageBox.information(self, "Connectivity", msg)
         self.log.append(msg)
 
     def check_bipartite(self):
-        adj, _ = self.get_graph_data()
-        if not adj: return
-        algo = GraphAlgo(adj)
-        is_bip = algo.is_bipartite_BFS()
+        model = self.scene.model
+        if not len(model): return
+        is_bip = model.algo().is_bipartite_BFS() if model.directed else model.connectivity.is_bipartite
         msg = f"Is Bipartite: {is_bip}"
         QMessageBox.information(self, "Bipartite Check", msg)
         self.log.append(msg)
 
     def run_dijkstra(self):
         self.reset_visuals()
-        adj, id_map = self.get_graph_data()
-        if not adj: return
+        model = self.scene.model
+        if not len(model): return
         
-        algo = GraphAlgo(adj)
         start_id = self.sp_start.value()
         end_id = self.sp_end.value()
         
-        if start_id not in id_map or end_id not in id_map:
+        if start_id not in model.index or end_id not in model.index:
             self.log.append("Error: Start or End ID does not exist.")
             return
 
-        u, v = id_map[start_id], id_map[end_id]
-        path_indices = algo.find_shortest_path_weight(u, v)
-        
-        if path_indices:
-            self.log.append(f"Shortest Path: {path_indices}")
-            # Highlight Path
-            nodes = [item for item in self.scene.items() if isinstance(item, NodeItem)]
-            nodes_by_idx = sorted(nodes, key=lambda x: x.id) # Assuming consecutive for now
-            
-            # Map back matrix index to NodeItem
-            # Since we re-indexed based on sort, nodes_by_idx[i] corresponds to matrix index i
-            path_nodes = [nodes_by_idx[i] for i in path_indices]
-            
-            for i in range(len(path_nodes) - 1):
-                n1 = path_nodes[i]
-                n2 = path_nodes[i+1]
-                n1.highlight("path")
-                n2.highlight("path")
-                # Find edge between them
-                for edge in n1.edges:
-                    if (edge.start_node == n1 and edge.end_node == n2) or \
-                       (edge.start_node == n2 and edge.end_node == n1):
-                        edge.highlight("path")
-        else:
-            self.log.append("No path found.")
+        u, v = model.index[start_id], model.index[end_id]
+        def done(path_indices):
+            if path_indices:
+                self.log.append(f"Shortest Path: {[model.ids[i] for i in path_indices]}")
+                self.scene.highlight_path(path_indices)
+            else:
+                self.log.append("No path found.")
+        self.start_task("Shortest Path", model.algo().find_shortest_path_weight, u, v, on_result=done, in_process=True)
 
     def run_mst(self):
         self.reset_visuals()
-        adj, _ = self.get_graph_data()
-        if not adj: return
+        model = self.scene.model
+        if not len(model): return
         if self.scene.is_directed:
             QMessageBox.warning(self, "Error", "MST is for Undirected graphs only.")
             return
 
-        algo = GraphAlgo(adj)
-        mst_edges_idx = algo.mst_prim() # List of tuples (u, v) indices
-        
-        nodes = [item for item in self.scene.items() if isinstance(item, NodeItem)]
-        nodes_by_idx = sorted(nodes, key=lambda x: x.id)
-        
-        self.log.append(f"MST Edges: {mst_edges_idx}")
-        
-        for u_idx, v_idx in mst_edges_idx:
-            n1 = nodes_by_idx[u_idx]
-            n2 = nodes_by_idx[v_idx]
-            for edge in n1.edges:
-                if (edge.start_node == n1 and edge.end_node == n2) or \
-                   (edge.start_node == n2 and edge.end_node == n1):
-                    edge.highlight("mst")
\ No newline at end of file
+        def done(res):
+            mst_edges_idx, total = res # List of tuples (u, v) indices
+            self.log.append(f"MST Edges: {[(model.ids[u], model.ids[v]) for u, v in mst_edges_idx]}")
+            self.log.append(f"Total Weight: {total}")
+            self.scene.highlight_edges(mst_edges_idx, "mst")
+        self.start_task("MST", model.algo().minimum_spanning_forest, "prim", on_result=done)
\ No newline at end of file
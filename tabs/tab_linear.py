@@ -1,7 +1,8 @@
 # tabs/tab_linear.py
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
                              QTableWidget, QTableWidgetItem, QSpinBox, 
-                             QLabel, QTextEdit, QSplitter)
+                             QLabel, QTextEdit, QSplitter, QCheckBox)
+from fractions import Fraction
 from PyQt6.QtCore import Qt
 from backend import Matrix
 
@@ -19,15 +20,19 @@ class LinearAlgebraTab(QWidget):
         self.rows = QSpinBox(); self.rows.setRange(1, 10); self.rows.setValue(3)
         self.cols = QSpinBox(); self.cols.setRange(1, 10); self.cols.setValue(3)
         btn_gen = QPushButton("Reset Grid"); btn_gen.clicked.connect(self.create_grid)
+        self.chk_exact = QCheckBox("Exact (fractions)")
         
         ctrl_layout.addWidget(QLabel("Rows:"))
         ctrl_layout.addWidget(self.rows)
         ctrl_layout.addWidget(QLabel("Cols:"))
         ctrl_layout.addWidget(self.cols)
         ctrl_layout.addWidget(btn_gen)
+        ctrl_layout.addWidget(self.chk_exact)
         ctrl_layout.addStretch()
         
         self.table = QTableWidget()
+        self._matrix = None # parsed grid, reused so Determinant and Inverse share its cached LU factorization
+        self.table.itemChanged.connect(self.invalidate_matrix)
         self.create_grid()
         
         # Operation Buttons
@@ -62,8 +67,12 @@ class LinearAlgebraTab(QWidget):
             for j in range(c):
                 self.table.setItem(i, j, QTableWidgetItem("0"))
 
+    def invalidate_matrix(self, *_):
+        self._matrix = None
+
     def get_matrix(self):
         """Parses the QTableWidget into a Matrix object."""
+        if self._matrix is not None: return self._matrix
         try:
             data = []
             for i in range(self.table.rowCount()):
@@ -73,14 +82,23 @@ class LinearAlgebraTab(QWidget):
                     val = float(item.text()) if item and item.text() else 0.0
                     row.append(val)
                 data.append(row)
-            return Matrix(data)
+            self._matrix = Matrix(data)
+            return self._matrix
         except ValueError:
             self.log.append("Error: Invalid numeric input in grid.")
             return None
 
+    @staticmethod
+    def is_exact(m):
+        """Only int / Fraction results are printed verbatim; float results (inverse, transpose) stay rounded"""
+        return m.storage == "list" and all(isinstance(x, (int, Fraction)) for row in m.data for x in row)
+
     def print_res(self, title, res):
         self.log.append(f"<b>{title}:</b>")
-        if isinstance(res, Matrix):
+        if isinstance(res, Matrix) and self.chk_exact.isChecked() and self.is_exact(res):
+            for row in res.data:
+                self.log.append("[" + ", ".join(str(x) for x in row) + "]")
+        elif isinstance(res, Matrix):
             for row in res.to_float():
                 self.log.append(str([round(x, 4) for x in row]))
         else:
@@ -90,16 +108,16 @@ class LinearAlgebraTab(QWidget):
     # Operations
     def do_det(self): 
         m = self.get_matrix()
-        if m: self.print_res("Determinant", m.det())
+        if m: self.print_res("Determinant", m.det(exact=self.chk_exact.isChecked()))
     def do_inv(self):
         m = self.get_matrix()
         if m: self.print_res("Inverse", m.inverse() or "Singular Matrix (No Inverse)")
     def do_rank(self):
         m = self.get_matrix()
-        if m: self.print_res("Rank", m.rank())
+        if m: self.print_res("Rank", m.rank(exact=self.chk_exact.isChecked()))
     def do_rref(self):
         m = self.get_matrix()
-        if m: self.print_res("RREF", m.rref())
+        if m: self.print_res("RREF", m.rref(exact=self.chk_exact.isChecked()))
     def do_T(self):
         m = self.get_matrix()
         if m: self.print_res("Transpose", m.T())
\ No newline at end of file
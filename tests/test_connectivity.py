@@ -0,0 +1,86 @@
+# tests/test_connectivity.py
+import random
+import pytest
+from backend import DynamicConnectivity, GraphModel
+
+def reference(ids, edges):
+    """(components, bipartite) by BFS 2-colouring over the current edge multiset"""
+    adj = {x: [] for x in ids}
+    for u, v in edges:
+        adj[u].append(v)
+        adj[v].append(u)
+    color, comps, bipartite = {}, [], True
+    for s in sorted(ids):
+        if s in color: continue
+        color[s], queue, comp = 0, [s], []
+        while queue:
+            x = queue.pop()
+            comp.append(x)
+            for y in adj[x]:
+                if y not in color:
+                    color[y] = 1 - color[x]
+                    queue.append(y)
+                elif color[y] == color[x]: bipartite = False
+        comps.append(sorted(comp))
+    return comps, bipartite
+
+def check(dc, ids, edges):
+    comps, bipartite = reference(ids, edges)
+    assert dc.components() == comps and dc.component_count == len(comps) and dc.is_bipartite == bipartite
+    label = {x: i for i, comp in enumerate(comps) for x in comp}
+    assert all(dc.connected(u, v) == (label[u] == label[v]) for u in ids for v in ids)
+
+@pytest.mark.parametrize("seed", range(8))
+def test_matches_recomputation_under_random_edits(seed):
+    rng = random.Random(seed)
+    dc, ids, edges = DynamicConnectivity(), set(), []
+    check(dc, ids, edges) # empty
+    for step in range(400):
+        op = rng.random()
+        if op < 0.2 or not ids:
+            x = rng.randrange(40)
+            dc.add_node(x)
+            ids.add(x)
+        elif op < 0.7:
+            u, v = rng.choice(sorted(ids)), rng.choice(sorted(ids)) # self-loops and parallel edges allowed
+            dc.add_edge(u, v)
+            edges.append((u, v))
+        elif op < 0.9 and edges:
+            u, v = edges.pop(rng.randrange(len(edges)))
+            if rng.random() < 0.5: u, v = v, u # either orientation names the same undirected edge
+            dc.remove_edge(u, v)
+        else:
+            x = rng.choice(sorted(ids))
+            dc.remove_node(x)
+            ids.discard(x)
+            edges = [e for e in edges if x not in e]
+        if step % 5 == 0 or len(ids) == 1: check(dc, ids, edges)
+    check(dc, ids, edges)
+
+def test_odd_cycle_and_parallel_edges():
+    dc = DynamicConnectivity()
+    for x in range(3): dc.add_node(x)
+    dc.add_edge(0, 1); dc.add_edge(1, 2)
+    assert dc.is_bipartite and dc.component_count == 1
+    dc.add_edge(2, 0)
+    assert not dc.is_bipartite
+    dc.add_edge(0, 1)
+    dc.remove_edge(1, 0) # one copy of a parallel edge is still there
+    assert dc.connected(0, 1) and not dc.is_bipartite
+    dc.remove_edge(0, 2)
+    assert dc.is_bipartite and dc.component_count == 1
+    dc.add_edge(2, 2)
+    assert not dc.is_bipartite
+
+def test_model_ignores_zero_weight_edges():
+    model = GraphModel(directed=True)
+    for x in range(4): model.add_node(x)
+    model.add_edge(0, 1, 0); model.add_edge(2, 3, 5); model.add_edge(3, 2, 1)
+    assert model.connectivity.components() == [[0], [1], [2, 3]]
+    model.add_edge(0, 1, 2)
+    assert model.connectivity.components() == [[0, 1], [2, 3]]
+    model.add_edge(0, 1, 0)
+    model.remove_edge(2, 3)
+    assert model.connectivity.components() == [[0], [1], [2, 3]] and model.connectivity.is_bipartite
+    model.remove_node(3)
+    assert model.connectivity.components() == [[0], [1], [2]]
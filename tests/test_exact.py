@@ -0,0 +1,72 @@
+# tests/test_exact.py
+import random
+from fractions import Fraction
+import pytest
+from backend import exact_rref, exact_det, exact_rank, exact_nullspace, _RANK_PRIME
+
+def reference_rref(rows):
+    """Plain Gauss-Jordan over Fractions"""
+    m = [[Fraction(x) for x in row] for row in rows]
+    pivots, r = [], 0
+    for c in range(len(m[0]) if m else 0):
+        p = next((i for i in range(r, len(m)) if m[i][c]), None)
+        if p is None: continue
+        m[r], m[p] = m[p], m[r]
+        m[r] = [x / m[r][c] for x in m[r]]
+        for i in range(len(m)):
+            if i != r and m[i][c]: m[i] = [x - m[i][c] * y for x, y in zip(m[i], m[r])]
+        pivots.append(c)
+        r += 1
+    return m, pivots
+
+def reference_det(rows):
+    """Cofactor expansion along the first row"""
+    if not rows: return 1
+    return sum((-1) ** j * x * reference_det([r[:j] + r[j + 1:] for r in rows[1:]]) for j, x in enumerate(rows[0]) if x)
+
+def low_rank(n, m, k, seed):
+    rng = random.Random(seed)
+    a = [[rng.randint(-5, 5) for _ in range(k)] for _ in range(n)]
+    b = [[rng.randint(-5, 5) for _ in range(m)] for _ in range(k)]
+    return [[sum(x * y for x, y in zip(row, col)) for col in zip(*b)] for row in a]
+
+F = Fraction
+HILBERT = [[F(1, i + j + 1) for j in range(4)] for i in range(4)]
+
+@pytest.mark.parametrize("rows,rref,pivots", [
+    ([[1, 2, 3], [4, 5, 6], [7, 8, 10]], [[1, 0, 0], [0, 1, 0], [0, 0, 1]], [0, 1, 2]),
+    ([[1, 2, 3], [2, 4, 6], [1, 1, 1]], [[1, 0, -1], [0, 1, 2], [0, 0, 0]], [0, 1]),
+    ([[1, 2, 1, 0], [2, 4, 0, 2]], [[1, 2, 0, 1], [0, 0, 1, -1]], [0, 2]),
+    ([[1, 2], [3, 4], [5, 6]], [[1, 0], [0, 1], [0, 0]], [0, 1]),
+    ([[0, 0], [0, 0]], [[0, 0], [0, 0]], []),
+    ([[0.5, 1.5], [1, 3]], [[1, 3], [0, 0]], [0]),
+    ([[_RANK_PRIME, 0], [0, 1]], [[1, 0], [0, 1]], [0, 1])]) # singular mod p, regular over Q
+def test_known_rref(rows, rref, pivots):
+    assert exact_rref(rows) == (rref, pivots)
+
+@pytest.mark.parametrize("rows,det", [
+    ([[1, 2], [3, 4]], -2), ([[0, 1], [1, 0]], -1), ([[1, 2, 3], [2, 4, 6], [1, 1, 1]], 0),
+    ([[0.5, 1], [1.5, 2]], F(-1, 2)), (HILBERT, F(1, 6048000)), ([[_RANK_PRIME, 0], [0, 1]], _RANK_PRIME), ([], 1)])
+def test_known_det(rows, det):
+    assert exact_det(rows) == det
+
+@pytest.mark.parametrize("rows,rank", [
+    ([[1, 2], [2, 4]], 1), ([[0, 0, 0]], 0), ([[1, 2, 1, 0], [2, 4, 0, 2]], 2), (HILBERT, 4), ([], 0),
+    ([[_RANK_PRIME, 0], [0, 1]], 2), (low_rank(6, 9, 3, 0), 3), (low_rank(9, 4, 2, 1), 2)])
+def test_known_rank(rows, rank):
+    assert exact_rank(rows) == rank
+
+def test_known_nullspace():
+    assert exact_nullspace([[1, 2, 3], [2, 4, 6]]) == [[-2, 1, 0], [-3, 0, 1]]
+    assert exact_nullspace([[1, 2], [3, 4]]) == []
+
+@pytest.mark.parametrize("n,m,k", [(5, 5, 5), (5, 5, 3), (4, 7, 4), (4, 7, 2), (8, 3, 3), (8, 3, 1), (6, 6, 0)])
+@pytest.mark.parametrize("seed", range(3))
+def test_matches_gauss_jordan(n, m, k, seed):
+    rows = low_rank(n, m, k, seed) if k else [[0] * m for _ in range(n)]
+    rref, pivots = reference_rref(rows)
+    assert exact_rref(rows) == (rref, pivots) and exact_rank(rows) == len(pivots)
+    basis = exact_nullspace(rows)
+    assert len(basis) == m - len(pivots)
+    assert all(sum(a * x for a, x in zip(row, vec)) == 0 for vec in basis for row in rows)
+    if n == m: assert exact_det(rows) == reference_det(rows)
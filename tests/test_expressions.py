@@ -0,0 +1,29 @@
+# tests/test_expressions.py
+import numpy as np
+import pytest
+from backend import compile_expression, ExpressionError
+
+X = np.linspace(-2, 2, 9)
+
+@pytest.mark.parametrize("src,want", [
+    ("x**2", X ** 2), ("np.sin(x) + 2*np.pi", np.sin(X) + 2 * np.pi), ("3", np.full_like(X, 3)),
+    ("np.where(x > 0, x, -x)", np.abs(X)), ("7//2 + x", 3 + X), ("2**10 * x", 1024 * X),
+    ("np.round(x / 3, 2)", np.round(X / 3, 2)), ("np.round(x, 1 + 1)", X), ("np.roll(x, 1)", np.roll(X, 1)),
+    ("np.mod(x, 3)", np.mod(X, 3)), ("x**3", X ** 3)])
+def test_evaluates_like_numpy(src, want):
+    assert np.allclose(compile_expression(src)(X), want)
+
+@pytest.mark.parametrize("src,code", [
+    ("np.sin(x", "20-1"), ("__import__('os')", "20-2"), ("x.real", "20-2"), ("x if x else 1", "20-3"),
+    ("9**9**9", "20-5"), ("(10**64)**6 + x", "20-5"), ("1/0 + x", "20-4"), ("np.where(x > 0)", "20-6"),
+    ("-" * 100000 + "x", "20-1")])
+def test_errors_are_expression_errors(src, code):
+    with pytest.raises(ExpressionError, match=code): compile_expression(src)(X)
+
+def test_integer_parameters_use_float_powers():
+    f = compile_expression("a**b + 0*x", ("a", "b"))
+    assert np.all(np.isinf(f(X, a=9, b=10**9)))
+
+def test_parameter_sweep_broadcasts():
+    y = compile_expression("a*x", ("a",))(X, a=np.array([1.0, 2.0])[:, None])
+    assert y.shape == (2, len(X)) and np.allclose(y[1], 2 * X)
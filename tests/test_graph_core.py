@@ -0,0 +1,64 @@
+# tests/test_graph_core.py
+import itertools
+import random
+import numpy as np
+import pytest
+from backend import GraphAlgo, GraphCore, SparseMatrix
+
+def random_graph(n, m, seed, directed):
+    """Edge list with duplicates and self-loops allowed, plus its dense adjacency (last duplicate wins)"""
+    rng = random.Random(seed)
+    edges = [(rng.randrange(n), rng.randrange(n), rng.randint(1, 9)) for _ in range(m)] if n else []
+    adj = np.zeros((n, n), dtype=np.int64)
+    for u, v, w in edges:
+        adj[u, v] = w
+        if not directed: adj[v, u] = w
+    return edges, adj
+
+def reference_reach(adj):
+    """Boolean closure by repeated squaring; every vertex reaches itself"""
+    reach = (adj != 0) | np.eye(len(adj), dtype=bool)
+    for _ in range(max(1, len(adj)).bit_length()):
+        reach = reach | (reach.astype(np.int64) @ reach.astype(np.int64) > 0)
+    return reach
+
+def groups(reach):
+    return sorted({tuple(np.flatnonzero(row & reach[:, v]).tolist()) for v, row in enumerate(reach)})
+
+def reference_bipartite(adj):
+    n = len(adj)
+    pairs = list(zip(*np.nonzero(adj | adj.T)))
+    return any(all(c[u] != c[v] for u, v in pairs) for c in itertools.product((0, 1), repeat=n))
+
+CASES = [(0, 0), (1, 0), (1, 1), (2, 1), (6, 4), (8, 10), (8, 30), (10, 6)]
+
+@pytest.mark.parametrize("n,m", CASES)
+@pytest.mark.parametrize("directed", [False, True])
+@pytest.mark.parametrize("seed", range(3))
+def test_algorithms_match_reference(n, m, directed, seed):
+    edges, adj = random_graph(n, m, seed, directed)
+    algo = GraphAlgo.from_edges(n, edges, directed)
+    reach = reference_reach(adj)
+    assert sorted(map(tuple, algo.weak_components())) == groups(reference_reach(adj | adj.T))
+    assert sorted(map(tuple, algo.strong_components())) == groups(reach)
+    assert all(algo.reachable(u, v) == reach[u, v] for u in range(n) for v in range(n))
+    assert algo.is_bipartite_BFS() == reference_bipartite(adj)
+    assert algo.connectness() == (n > 0 and bool(reach.all()))
+    if not directed and len({frozenset(e[:2]) for e in edges}) == len(edges): assert not algo.is_directed()
+
+@pytest.mark.parametrize("n,m", CASES)
+def test_cores_agree_across_inputs(n, m):
+    _, adj = random_graph(n, m, 7, True)
+    cores = [GraphCore.from_dense(adj.tolist()), GraphCore.from_sparse(SparseMatrix.from_dense(adj.reshape(n, n))),
+             GraphCore.from_edges(n, [(u, v, adj[u, v]) for u, v in zip(*np.nonzero(adj))], directed=True)]
+    for core in cores:
+        assert core.n == n and core.edge_count == np.count_nonzero(adj)
+        for u in range(n):
+            targets, weights = core.neighbors(u)
+            assert targets == np.flatnonzero(adj[u]).tolist() and weights == adj[u, targets].tolist()
+        src, dst, w = core.reverse().edge_arrays()
+        assert np.array_equal(adj.T[src, dst], w) and core.is_symmetric() == np.array_equal(adj, adj.T)
+
+def test_duplicate_edges_are_kept():
+    core = GraphCore.from_edges(3, [(0, 1, 2), (0, 1, 5), (1, 2, 1)], directed=True)
+    assert core.neighbors(0) == ([1, 1], [2, 5]) and core.reverse().neighbors(1) == ([0, 0], [2, 5])
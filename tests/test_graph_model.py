@@ -0,0 +1,73 @@
+# tests/test_graph_model.py
+import random
+import numpy as np
+import pytest
+from backend import GraphCore, GraphModel
+
+def rebuild(ids, edges, directed):
+    """What the canvas used to do on every query: index the sorted ids and fill a dense matrix from scratch"""
+    index = {x: i for i, x in enumerate(sorted(ids))}
+    adj = [[0] * len(ids) for _ in ids]
+    for (u, v), w in edges.items():
+        adj[index[u]][index[v]] = w
+        if not directed: adj[index[v]][index[u]] = w
+    return index, adj
+
+def core_edges(core):
+    return sorted(zip(*(a.tolist() for a in core.edge_arrays())))
+
+def random_edits(model, steps, seed):
+    """Apply random edits to model and to a plain (ids, edges) mirror; yields after every edit"""
+    rng = random.Random(seed)
+    ids, edges = set(), {}
+    for _ in range(steps):
+        op = rng.random()
+        if op < 0.25 or len(ids) < 2:
+            x = rng.randrange(100)
+            model.add_node(x)
+            ids.add(x)
+        elif op < 0.7:
+            u, v = rng.sample(sorted(ids), 2)
+            w = rng.choice([0, 1, 2, 5])
+            key = (u, v) if (u, v) in edges or model.directed or (v, u) not in edges else (v, u)
+            assert model.add_edge(u, v, w) == (key, key not in edges)
+            edges[key] = w
+        elif op < 0.85 and edges:
+            key = rng.choice(sorted(edges))
+            model.remove_edge(*key)
+            del edges[key]
+        elif op < 0.95:
+            x = rng.choice(sorted(ids))
+            gone = [k for k in edges if x in k]
+            assert sorted(model.remove_node(x)) == sorted(gone)
+            ids.discard(x)
+            for k in gone: del edges[k]
+        elif not any((v, u) in edges for u, v in edges): # switching never merges two stored edges
+            model.set_directed(not model.directed)
+        yield ids, edges
+
+@pytest.mark.parametrize("directed", [False, True])
+@pytest.mark.parametrize("seed", range(5))
+def test_model_matches_rebuild(directed, seed):
+    model = GraphModel(directed)
+    assert len(model) == 0 and model.adjacency() == [] and model.algo().vertices_count == 0
+    for ids, edges in random_edits(model, 300, seed):
+        index, adj = rebuild(ids, edges, model.directed)
+        assert model.ids == sorted(ids) and model.index == index and model.edges == edges
+        assert model.adjacency() == adj
+        want = GraphCore.from_dense(np.array(adj).reshape(len(ids), len(ids)))
+        assert core_edges(model.algo().core) == core_edges(want)
+
+def test_algo_is_reused_until_the_next_edit():
+    model = GraphModel()
+    for x in (3, 1, 2): model.add_node(x)
+    model.add_edge(1, 2, 4)
+    algo, version = model.algo(), model.version
+    assert model.algo() is algo and model.edge_key(2, 1) == (1, 2)
+    assert model.add_edge(2, 1, 7) == ((1, 2), False) and model.version > version and model.algo() is not algo
+    model.add_node(1) # already present: not an edit
+    assert model.index == {1: 0, 2: 1, 3: 2} and model.edges == {(1, 2): 7}
+    model.set_directed(True)
+    assert model.edge_key(2, 1) is None and model.algo().is_directed()
+    model.clear()
+    assert len(model) == 0 and model.edges == {} and model.algo().vertices_count == 0
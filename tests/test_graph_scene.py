@@ -0,0 +1,52 @@
+# tests/test_graph_scene.py
+import os
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+import pytest
+pytest.importorskip("PyQt6")
+from PyQt6.QtWidgets import QApplication
+from backend import GraphCore, load_edge_list, save_edge_list
+from tabs.tab_graph import GraphScene
+
+app = QApplication.instance() or QApplication([])
+
+def batched(scene):
+    return scene.batch_item is not None and scene.batch_item.isVisible() and not scene.batch_item.path().isEmpty()
+
+def test_zoomed_out_edges_survive_clear_and_import():
+    scene = GraphScene()
+    scene.set_detail(False)
+    a, b = scene.add_node(0, 0), scene.add_node(100, 0)
+    scene.add_edge(a, b)
+    scene.flush_frame()
+    assert batched(scene)
+    scene.clear_graph()
+    assert scene.batch_item is not None and not scene.detailed
+    scene.load_core(GraphCore.from_edges(3, [(0, 1, 1), (1, 2, 1)]))
+    scene.flush_frame()
+    assert batched(scene) and not any(e.isVisible() for e in scene.edge_items.values())
+    scene.set_detail(True)
+    assert all(e.isVisible() for e in scene.edge_items.values())
+
+def canvas_pairs(scene):
+    return {(scene.node_items[u].label, scene.node_items[v].label) for u, v in scene.edge_items}
+
+@pytest.mark.parametrize("canvas_directed", [False, True])
+def test_imported_edges_reach_the_canvas(tmp_path, canvas_directed):
+    path = tmp_path / "g.txt"
+    path.write_text("a b 1\nb c 2\nc a 3\nd d 1\n")
+    scene = GraphScene()
+    scene.set_directed(canvas_directed)
+    scene.load_core(*load_edge_list(str(path), directed=canvas_directed))
+    want = {("a", "b"), ("b", "c"), ("c", "a")}
+    if canvas_directed: assert canvas_pairs(scene) == want
+    else: assert {frozenset(p) for p in canvas_pairs(scene)} == {frozenset(p) for p in want}
+    assert len(scene.node_items) == 4 and len(scene.edge_items) == 3 # the self-loop is not drawn
+
+def test_directed_file_onto_undirected_canvas_keeps_both_directions(tmp_path):
+    path = str(tmp_path / "d.bin")
+    save_edge_list(path, GraphCore.from_edges(4, [(0, 1, 1), (2, 1, 3), (3, 2, 2), (2, 3, 5)], directed=True))
+    scene = GraphScene()
+    scene.load_core(*load_edge_list(path, directed=False))
+    pairs = {frozenset(p) for p in canvas_pairs(scene)}
+    assert pairs == {frozenset(("0", "1")), frozenset(("1", "2")), frozenset(("2", "3"))}
+    assert scene.model.connectivity.component_count == 1
@@ -0,0 +1,24 @@
+# tests/test_layout.py
+import numpy as np
+import pytest
+from backend import ForceLayout
+
+rng = np.random.default_rng(0)
+INPUTS = {
+    "uniform": rng.random((3000, 2)) * 3000,
+    "clustered": np.concatenate([rng.normal(c, 5, (600, 2)) for c in rng.random((5, 2)) * 3000]),
+    "outlier": np.concatenate([rng.normal(0, 1, (2999, 2)), [[1e6, 1e6]]]),
+    "coincident": np.concatenate([np.zeros((1500, 2)), rng.random((1500, 2)) * 100])}
+
+@pytest.mark.parametrize("name", INPUTS)
+def test_tree_repulsion_matches_exact(name):
+    pos = INPUTS[name]
+    lay = ForceLayout(len(pos), [], [], pos=pos)
+    exact, tree = lay._repulsion_exact(pos), lay._repulsion_tree(pos)
+    err = np.linalg.norm(tree - exact, axis=1) / np.maximum(np.linalg.norm(exact, axis=1), 1e-12)
+    assert np.median(err) < 0.01 and np.percentile(err, 99) < 0.1
+
+def test_step_spreads_a_collapsed_graph():
+    lay = ForceLayout(2000, np.arange(1999), np.arange(1, 2000), pos=np.zeros((2000, 2)) + rng.random((2000, 2)))
+    lay.step(3)
+    assert np.all(np.isfinite(lay.pos)) and np.ptp(lay.pos, 0).min() > 10
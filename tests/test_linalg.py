@@ -0,0 +1,44 @@
+# tests/test_linalg.py
+import numpy as np
+import pytest
+import backend
+from backend import Matrix, LUFactorization, QRFactorization
+
+@pytest.fixture(params=["scipy", "numpy"])
+def lapack(request, monkeypatch):
+    """Run each test with the scipy LU and with the numpy-only fallback"""
+    if request.param == "numpy":
+        monkeypatch.setattr(backend, "_lu_factor", None)
+        monkeypatch.setattr(backend, "_solve_triangular", None)
+    elif backend._lu_factor is None:
+        pytest.skip("scipy not installed")
+    return request.param
+
+def test_factorizations_match_numpy(lapack):
+    a = np.random.default_rng(0).random((7, 7))
+    b = np.random.default_rng(1).random((7, 3))
+    lu, qr = LUFactorization(a), QRFactorization(a)
+    assert np.isclose(lu.det(), np.linalg.det(a)) and np.isclose(qr.det(), np.linalg.det(a))
+    assert np.allclose(lu.solve(b), np.linalg.solve(a, b)) and np.allclose(qr.solve(b), np.linalg.solve(a, b))
+    assert np.allclose(lu.inverse(), np.linalg.inv(a))
+    assert lu.rank() == 7
+
+def test_singular_solve_raises(lapack):
+    lu = LUFactorization([[1, 2], [2, 4]])
+    assert lu.is_singular()
+    with pytest.raises(ValueError, match="15-2"): lu.solve([1, 1])
+
+@pytest.mark.parametrize("storage", ["list", "numpy"])
+def test_edits_refresh_cached_factors(lapack, storage):
+    m = Matrix([[2.0, 0.0], [0.0, 3.0]], storage=storage)
+    assert np.allclose(m.solve([2, 3]), [1, 1]) and m.det() == pytest.approx(6)
+    lu = m.lu()
+    assert m.lu() is lu and np.allclose(m.inverse().to_numpy(), np.diag([0.5, 1 / 3]))
+    m[0, 0] = 4.0
+    assert m.lu() is not lu and np.allclose(m.solve([2, 3]), [0.5, 1]) and m.det() == pytest.approx(12)
+    if storage == "list": m.data[1][1] = 1.0
+    else: m.data[1, 1] = 1.0
+    m.invalidate()
+    assert np.allclose(m.solve([2, 3]), [0.5, 3]) and m.det() == pytest.approx(4)
+    m.data = [[1.0, 2.0], [2.0, 4.0]] if storage == "list" else np.array([[1.0, 2.0], [2.0, 4.0]])
+    assert m.det() == 0 and m.inverse() is None
@@ -0,0 +1,70 @@
+# tests/test_loader.py
+import numpy as np
+import pytest
+from backend import GraphCore, load_edge_list, save_edge_list
+
+def reference_load(lines, directed):
+    """Line-by-line parse: (sorted labels, {(i, j): [weights]}) with both directions for undirected files"""
+    rows = [l.replace(",", " ").replace("\t", " ").split() for l in lines if l.strip() and l.lstrip()[0] not in "#%"]
+    if rows and len(rows[0]) > 2 and not rows[0][2].lstrip("-").replace(".", "").isdigit(): rows = rows[1:] # header
+    ids = [r[:2] for r in rows]
+    numeric = all(x.lstrip("-").isdigit() for pair in ids for x in pair)
+    labels = sorted({int(x) if numeric else x for pair in ids for x in pair})
+    index = {x: i for i, x in enumerate(labels)}
+    edges = {}
+    for r in rows:
+        u, v = (index[int(x) if numeric else x] for x in r[:2])
+        w = float(r[2]) if len(r) > 2 else 1
+        edges.setdefault((u, v), []).append(w)
+        if not directed and u != v: edges.setdefault((v, u), []).append(w)
+    return labels, edges
+
+def core_edges(core):
+    edges = {}
+    for u, v, w in zip(*(a.tolist() for a in core.edge_arrays())): edges.setdefault((u, v), []).append(w)
+    return {k: sorted(v) for k, v in edges.items()}
+
+TEXTS = {
+    "plain.txt": ["1 2", "2 3", "3 1", "7 7", "1 2"], # self-loop and duplicate edge
+    "weighted.csv": ["# comment", "src,dst,weight", "10,20,1.5", "20,30,-2", "", "40,50,3"], # header, two components
+    "names.tsv": ["alice\tbob\t2", "% comment", "bob\tcarol\t4", "carol\talice\t1"],
+    "single.txt": ["5 5"],
+    "empty.txt": ["# nothing here"]}
+
+@pytest.mark.parametrize("name", TEXTS)
+@pytest.mark.parametrize("directed", [False, True])
+@pytest.mark.parametrize("chunk", [5, 1 << 20]) # tiny chunks split lines across reads
+def test_text_matches_line_parser(tmp_path, name, directed, chunk):
+    path = tmp_path / name
+    path.write_text("\n".join(TEXTS[name]) + "\n")
+    seen = []
+    core, labels = load_edge_list(str(path), directed=directed, chunk_size=chunk, progress=lambda d, t: seen.append((d, t)))
+    want_labels, want_edges = reference_load(TEXTS[name], directed)
+    assert labels.tolist() == want_labels and core.n == len(want_labels)
+    assert core_edges(core) == {k: sorted(v) for k, v in want_edges.items()}
+    assert seen[-1][0] == seen[-1][1] == path.stat().st_size
+
+@pytest.mark.parametrize("n,edges", [(4, [(0, 1, 2), (1, 2, 1), (3, 0, 5)]), (5, [(0, 1, 1), (2, 3, 1)]),
+                                     (3, []), (1, []), (0, []), (3, [(0, 1, 1), (0, 1, 1), (2, 2, 4)])])
+@pytest.mark.parametrize("directed", [False, True])
+@pytest.mark.parametrize("chunk", [16, 1 << 20])
+def test_binary_round_trip(tmp_path, n, edges, directed, chunk):
+    core = GraphCore.from_edges(n, edges, directed)
+    path = str(tmp_path / "g.bin")
+    save_edge_list(path, core, directed=directed)
+    loaded, labels = load_edge_list(path, chunk_size=chunk)
+    assert loaded.n == n and labels.tolist() == list(range(n))
+    assert core_edges(loaded) == core_edges(core) and loaded.is_symmetric() == core.is_symmetric()
+
+def test_directed_binary_stays_directed_when_loaded_undirected(tmp_path):
+    path = str(tmp_path / "d.bin")
+    save_edge_list(path, GraphCore.from_edges(3, [(0, 1, 1), (2, 1, 3)], directed=True))
+    core, _ = load_edge_list(path, directed=False)
+    assert core_edges(core) == {(0, 1): [1], (2, 1): [3]} and not core.is_symmetric()
+
+def test_bad_input_is_reported(tmp_path):
+    bad = tmp_path / "bad.txt"
+    bad.write_text("1 2 3\n4 5\n")
+    with pytest.raises(ValueError, match="19-2"): load_edge_list(str(bad))
+    with pytest.raises(ValueError, match="19-1"): load_edge_list(str(bad), fmt="xml")
+    with pytest.raises(ValueError, match="19-3"): load_edge_list(str(bad), fmt="binary")
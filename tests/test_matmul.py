@@ -0,0 +1,64 @@
+# tests/test_matmul.py
+import random
+
+import numpy as np
+import pytest
+from backend import Matrix, _MUL_BLOCK
+
+# (n, m, p) deliberately off the tile size so partial tiles on every axis are exercised
+SHAPES = [(1, 1, 1), (3, 5, 2), (_MUL_BLOCK - 1, _MUL_BLOCK + 1, 2 * _MUL_BLOCK + 3),
+          (_MUL_BLOCK + 1, 2 * _MUL_BLOCK + 1, _MUL_BLOCK - 1), (70, 3, 67)]
+
+def rows(n, m, seed, kind="int", density=1.0):
+    rng = random.Random(seed)
+    draw = (lambda: rng.randint(-9, 9)) if kind == "int" else (lambda: rng.uniform(-1, 1))
+    return [[draw() if rng.random() < density else 0 for _ in range(m)] for _ in range(n)]
+
+def check(left, right, a, b):
+    got = (left * right).to_numpy()
+    want = np.matmul(np.array(a, dtype=np.result_type(np.array(a), np.array(b))).reshape(left.dim),
+                     np.array(b).reshape(right.dim))
+    assert got.shape == want.shape
+    assert np.allclose(got, want)
+
+@pytest.mark.parametrize("n,m,p", SHAPES)
+@pytest.mark.parametrize("kinds", [("int", "int"), ("float", "float"), ("int", "float"), ("float", "int")])
+def test_list_storage_matches_numpy(n, m, p, kinds):
+    a, b = rows(n, m, 1, kinds[0]), rows(m, p, 2, kinds[1])
+    check(Matrix(a), Matrix(b), a, b)
+
+@pytest.mark.parametrize("n,m,p", SHAPES)
+def test_sparse_exact_kernel_matches_numpy(n, m, p):
+    a, b = rows(n, m, 3, density=0.1), rows(m, p, 4)
+    check(Matrix(a), Matrix(b), a, b)
+
+@pytest.mark.parametrize("n,m,p", SHAPES)
+def test_exact_product_stays_integer(n, m, p):
+    a, b = rows(n, m, 5), rows(m, p, 6)
+    res = Matrix(a) * Matrix(b)
+    assert all(isinstance(x, int) for row in res.data for x in row)
+    assert res.data == np.matmul(np.array(a, dtype=object), np.array(b, dtype=object)).tolist()
+
+@pytest.mark.parametrize("n,m,p", SHAPES)
+def test_mixed_storage_and_views_match_numpy(n, m, p):
+    a, b = rows(n + 2, m, 7, "float"), rows(p, m, 8)
+    left = Matrix(a, storage="numpy").view(rows=slice(1, n + 1))
+    right = Matrix(b).T(copy=False)
+    want = np.array(a)[1:n + 1] @ np.array(b).T
+    assert np.allclose((left * right).to_numpy(), want)
+    assert np.allclose(Matrix.matmul(right.T(copy=True), left.T(copy=False)).to_numpy(), want.T)
+
+def test_out_receives_product():
+    a, b = rows(_MUL_BLOCK + 3, 7, 9, "float"), rows(7, 5, 10)
+    out = Matrix(np.zeros((_MUL_BLOCK + 3, 5)))
+    assert Matrix(a).matmul(Matrix(b), out=out) is out
+    assert np.allclose(out.data, np.array(a) @ np.array(b))
+
+def test_integer_power_does_not_wrap():
+    fib = [0, 1]
+    while len(fib) <= 1000: fib.append(fib[-1] + fib[-2])
+    m = Matrix(np.array([[1, 1], [1, 0]]))
+    assert (m ** 100).data[0, 1] == fib[100]
+    mod = 10**10 + 19
+    res = m.power(1000, mod=mod)
+    assert res.data[0, 1] == fib[1000] % mod and res.data.dtype == np.int64
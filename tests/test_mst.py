@@ -0,0 +1,55 @@
+# tests/test_mst.py
+import random
+import pytest
+import backend
+from backend import GraphAlgo
+
+def random_edges(n, m, seed):
+    """Weights in [-2, 9]: zero and negative weights are not edges for the MST engines"""
+    rng = random.Random(seed)
+    return [(rng.randrange(n), rng.randrange(n), rng.randint(-2, 9)) for _ in range(m)] if n else []
+
+def reference_forest_weight(n, edges):
+    """Naive Kruskal: relabel whole components on every merge"""
+    label = list(range(n))
+    total = 0
+    for w, u, v in sorted((w, u, v) for u, v, w in edges if w > 0 and u != v):
+        if label[u] == label[v]: continue
+        old = label[v]
+        label = [label[u] if x == old else x for x in label]
+        total += w
+    return total, len(set(label))
+
+def check_forest(n, edges, forest):
+    """Forest edges exist, form no cycle, and leave as many trees as the graph has components"""
+    pairs = {frozenset((u, v)) for u, v, w in edges if w > 0 and u != v}
+    label = list(range(n))
+    for u, v in forest:
+        assert frozenset((u, v)) in pairs and label[u] != label[v]
+        old = label[v]
+        label = [label[u] if x == old else x for x in label]
+    return len(set(label))
+
+CASES = [(0, 0), (1, 0), (1, 2), (2, 1), (7, 4), (10, 25), (12, 60), (30, 35)]
+
+@pytest.mark.parametrize("method", ["kruskal", "prim", "boruvka"])
+@pytest.mark.parametrize("n,m", CASES)
+@pytest.mark.parametrize("directed", [False, True])
+@pytest.mark.parametrize("seed", range(3))
+def test_forest_matches_reference(method, n, m, directed, seed):
+    edges = random_edges(n, m, seed)
+    edges += [(v, u, w + 1) for u, v, w in edges[:3]] # reversed, heavier duplicates
+    forest, total = GraphAlgo.from_edges(n, edges, directed).minimum_spanning_forest(method)
+    want_total, trees = reference_forest_weight(n, edges)
+    assert total == want_total and len(forest) == n - trees
+    assert check_forest(n, edges, forest) == trees
+
+@pytest.mark.parametrize("seed", range(3))
+def test_engines_pick_the_same_forest(seed, monkeypatch):
+    monkeypatch.setattr(backend, "_BORUVKA_CHUNK", 16) # exercise the threaded cheapest-edge search
+    algo = GraphAlgo.from_edges(40, random_edges(40, 150, seed))
+    kruskal = algo.minimum_spanning_forest("kruskal")
+    assert algo.minimum_spanning_forest("boruvka", workers=3) == kruskal # ties break on (weight, u, v)
+    forest, total = algo.minimum_spanning_forest("prim")
+    assert total == kruskal[1] and len(forest) == len(kruskal[0])
+    with pytest.raises(ValueError, match="18-3"): algo.minimum_spanning_forest("reverse-delete")
@@ -0,0 +1,104 @@
+# tests/test_shortest_paths.py
+import random
+import numpy as np
+import pytest
+import backend
+from backend import GraphAlgo
+
+INF = float("inf")
+
+def random_edges(n, m, seed, low=1, directed=True):
+    rng = random.Random(seed)
+    pairs = {(rng.randrange(n), rng.randrange(n)) for _ in range(m)}
+    if not directed: pairs = {(min(p), max(p)) for p in pairs}
+    return [(u, v, rng.randint(low, 9)) for u, v in sorted(pairs) if u != v]
+
+def reference_distances(n, edges, directed, source):
+    """Bellman-Ford relaxation over the positive edges (what Dijkstra considers)"""
+    arcs = [(u, v, w) for u, v, w in edges if w > 0] + ([] if directed else [(v, u, w) for u, v, w in edges if w > 0])
+    dist = [INF] * n
+    dist[source] = 0
+    for _ in range(n):
+        for u, v, w in arcs: dist[v] = min(dist[v], dist[u] + w)
+    return dist
+
+def path_weight(edges, directed, path):
+    weight = {(u, v): w for u, v, w in edges}
+    if not directed: weight.update({(v, u): w for u, v, w in edges})
+    return sum(weight[a, b] for a, b in zip(path, path[1:]))
+
+@pytest.mark.parametrize("directed", [False, True])
+@pytest.mark.parametrize("seed", range(3))
+def test_repeated_queries_match_reference(directed, seed):
+    n = 30
+    edges = random_edges(n, 60, seed, directed=directed)
+    algo = GraphAlgo.from_edges(n, edges, directed)
+    for source in (0, 7):
+        want = reference_distances(n, edges, directed, source)
+        for target in range(n): # the first query is bidirectional, the rest walk the cached tree
+            path = algo.find_shortest_path_weight(source, target)
+            if want[target] == INF: assert path is None
+            else: assert path[0] == source and path[-1] == target and path_weight(edges, directed, path) == want[target]
+
+def test_second_query_from_a_source_fills_the_tree_cache(monkeypatch):
+    algo = GraphAlgo.from_edges(5, [(0, 1, 1), (1, 2, 1), (2, 3, 1), (3, 4, 1)])
+    calls = []
+    tree = backend.dijkstra_tree
+    monkeypatch.setattr(backend, "dijkstra_tree", lambda core, s: calls.append(s) or tree(core, s))
+    assert algo.find_shortest_path_weight(0, 4) == [0, 1, 2, 3, 4] and calls == []
+    assert algo.find_shortest_path_weight(0, 2) == [0, 1, 2] and calls == [0]
+    assert algo.find_shortest_path_weight(0, 3) == [0, 1, 2, 3] and calls == [0]
+    assert (algo.version, 0) in algo._sp_cache
+    algo.update([[0, 1], [1, 0]]) # a new graph version starts with an empty cache
+    assert algo.find_shortest_path_weight(0, 1) == [0, 1] and calls == [0]
+
+def reference_apsp(n, edges, directed):
+    """Bellman-Ford from every source over all edges, negative ones included"""
+    arcs = edges + ([] if directed else [(v, u, w) for u, v, w in edges])
+    res = np.full((n, n), INF)
+    for s in range(n):
+        res[s, s] = 0
+        for _ in range(n):
+            for u, v, w in arcs: res[s, v] = min(res[s, v], res[s, u] + w)
+        if any(res[s, u] + w < res[s, v] for u, v, w in arcs): raise ValueError("negative cycle")
+    return res
+
+def potential_edges(n, m, seed):
+    """Directed edges with negative weights but no negative cycle: w + p[u] - p[v] for positive w"""
+    rng = random.Random(seed)
+    p = [rng.randint(0, 20) for _ in range(n)]
+    return [(u, v, w + p[u] - p[v]) for u, v, w in random_edges(n, m, seed)]
+
+APSP_CASES = [(0, 0), (1, 0), (2, 1), (9, 5), (12, 40), (20, 30)]
+
+@pytest.mark.parametrize("method", ["floyd", "johnson", "auto"])
+@pytest.mark.parametrize("n,m", APSP_CASES)
+@pytest.mark.parametrize("directed", [False, True])
+def test_all_pairs_match_bellman_ford(method, n, m, directed):
+    edges = random_edges(n, m, n + m, directed=directed) if n else []
+    edges += edges[:2] # duplicate edges: the lighter copy counts (here both are equal)
+    want = reference_apsp(n, edges, directed)
+    assert np.array_equal(GraphAlgo.from_edges(n, edges, directed).all_pairs_shortest_paths(method), want)
+
+@pytest.mark.parametrize("method", ["floyd", "johnson"])
+@pytest.mark.parametrize("n,m", APSP_CASES[3:])
+def test_negative_weights(method, n, m):
+    edges = potential_edges(n, m, n)
+    u, v, w = edges[0]
+    edges.append((u, v, w + 5)) # a heavier duplicate is ignored
+    assert any(w < 0 for _, _, w in edges)
+    got = GraphAlgo.from_edges(n, edges, True).all_pairs_shortest_paths(method)
+    assert np.allclose(got, reference_apsp(n, edges, True))
+
+@pytest.mark.parametrize("method", ["floyd", "johnson"])
+def test_negative_cycle_is_reported(method):
+    algo = GraphAlgo.from_edges(3, [(0, 1, 1), (1, 2, -3), (2, 0, 1)], directed=True)
+    with pytest.raises(ValueError, match="18-1"): algo.all_pairs_shortest_paths(method)
+    with pytest.raises(ValueError, match="18-2"): algo.all_pairs_shortest_paths("dijkstra")
+
+def test_process_pool_rows_match(monkeypatch):
+    n = 140
+    edges = potential_edges(n, 600, 3)
+    monkeypatch.setattr(backend, "_APSP_PARALLEL_MIN", 1)
+    got = GraphAlgo.from_edges(n, edges, True).all_pairs_shortest_paths("johnson", workers=2)
+    assert np.allclose(got, backend.floyd_warshall(backend.GraphCore.from_edges(n, edges, True)))
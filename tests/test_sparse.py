@@ -0,0 +1,46 @@
+# tests/test_sparse.py
+import numpy as np
+import pytest
+from backend import Matrix, SparseMatrix
+
+def dense(n, m, seed, density=0.3):
+    rng = np.random.default_rng(seed)
+    return np.where(rng.random((n, m)) < density, rng.integers(-5, 6, (n, m)), 0)
+
+SHAPES = [(1, 1), (4, 7), (7, 4), (12, 12)]
+
+@pytest.mark.parametrize("n,m", SHAPES)
+@pytest.mark.parametrize("density", [0.0, 0.3, 1.0])
+def test_round_trip_and_lookup(n, m, density):
+    a = dense(n, m, 0, density)
+    s = SparseMatrix.from_dense(a)
+    assert s.nnz == np.count_nonzero(a) and s.dim == (n, m)
+    assert np.array_equal(s.to_dense("numpy").data, a) and s.to_dense().data == a.tolist()
+    assert all(s[i, j] == a[i, j] for i in range(n) for j in range(m))
+    assert np.array_equal(s.T().to_dense("numpy").data, a.T)
+
+def test_from_coo_sums_duplicates_and_drops_zeros():
+    s = SparseMatrix.from_coo([0, 0, 1, 1, 2], [1, 1, 0, 0, 2], [2, 3, 4, -4, 0], (3, 3))
+    assert s.nnz == 1 and s[0, 1] == 5 and s[1, 0] == 0
+    with pytest.raises(ValueError, match="13-3"): SparseMatrix.from_coo([3], [0], [1], (3, 3))
+    empty = SparseMatrix.from_coo([], [], [], (2, 3))
+    assert empty.nnz == 0 and np.array_equal(empty.to_dense("numpy").data, np.zeros((2, 3)))
+
+@pytest.mark.parametrize("n,m", SHAPES)
+def test_add_matches_dense(n, m):
+    a, b = dense(n, m, 1), dense(n, m, 2)
+    sa, sb = SparseMatrix.from_dense(a), SparseMatrix.from_dense(b)
+    assert np.array_equal((sa + sb).to_dense("numpy").data, a + b)
+    assert np.array_equal((sa + SparseMatrix.from_dense(-a)).to_dense("numpy").data, np.zeros_like(a))
+    assert np.array_equal((sa + Matrix(b.tolist())).to_numpy(), a + b)
+    with pytest.raises(ValueError, match="12-3"): sa + SparseMatrix.from_dense(dense(n + 1, m, 3))
+
+@pytest.mark.parametrize("n,m,p", [(1, 1, 1), (4, 7, 3), (7, 4, 7), (12, 12, 12)])
+def test_mul_matches_dense(n, m, p):
+    a, b = dense(n, m, 4), dense(m, p, 5)
+    sa, sb = SparseMatrix.from_dense(a), SparseMatrix.from_dense(b)
+    assert np.array_equal((sa * sb).to_dense("numpy").data, a @ b)
+    assert np.array_equal((sa * Matrix(b.tolist())).to_numpy(), a @ b)
+    assert np.array_equal((Matrix(a.tolist()) * sb).to_numpy(), a @ b)
+    assert (sa * SparseMatrix.from_coo([], [], [], (m, p))).nnz == 0
+    with pytest.raises(TypeError, match="4-3"): sa * SparseMatrix.from_dense(dense(m + 1, p, 6))